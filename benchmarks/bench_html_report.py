@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+HTML报告生成基准测试
+使用合成结果测量 generate_html_report 的流式写入耗时
+
+用法:
+    python benchmarks/bench_html_report.py [--rows N]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import contextlib
+import io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from professional_code_auditor_v2 import AuditResult, FileRecord, ProfessionalCodeAuditor  # noqa: E402
+
+
+class SyntheticAuditor(ProfessionalCodeAuditor):
+    """按需生成合成结果的审计器，避免结果本身占用内存；报告阶段与内存中的结果一样渲染警告文本"""
+
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+        self.target_dir = "/synthetic/repo"
+        self.scan_mode = "offline"
+        for result in self.synthetic_results():
+            self.summary.add(result)
+
+    def synthetic_results(self):
+        kinds = [FileRecord.CODES[key] for key in (".py", ".json", ".sh", ".md", "Dockerfile")]
+        for idx in range(self.rows):
+            findings = [(0, 1, ((idx % 50 + 1, 1, 'password = "***REDACTED***"'),))] if idx % 17 == 0 else []
+            yield AuditResult(
+                f"pkg{idx % 100}/module_{idx}.py",
+                kinds[idx % len(kinds)],
+                "pass",
+                95 - (idx % 40),
+                (),
+                (),
+                findings,
+                "offline",
+            )
+
+    def iter_results(self):
+        rules = self.rule_engine.descriptions
+        for result in self.synthetic_results():
+            yield result.to_dict(rules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML报告生成基准测试")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="结果行数")
+    args = parser.parse_args()
+
+    auditor = SyntheticAuditor(args.rows)
+    work_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(work_dir)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            report_file = auditor.generate_html_report()
+        elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(report_file) / 1024 / 1024
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir)
+
+    print(f"📄 {args.rows} 行, {size_mb:.1f} MB")
+    print(f"  耗时: {elapsed:.2f}s ({args.rows / elapsed:,.0f} 行/秒)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+记录内存占用基准测试
+对比原字典形式的文件描述/分析结果与 FileRecord / AuditResult 的单条内存占用
+
+用法:
+    python benchmarks/bench_records.py [--count N]
+"""
+
+import os
+import sys
+import time
+import datetime
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from professional_code_auditor_v2 import AuditResult, Config, FileRecord  # noqa: E402
+
+ROOT = "/srv/checkout/monorepo"
+
+
+def sample_paths(count):
+    """生成确定性的相对路径与扩展名"""
+    exts = [".py", ".js", ".json", ".yml", ".md", ".sh", ".go"]
+    for idx in range(count):
+        ext = exts[idx % len(exts)]
+        yield f"services/svc_{idx % 97}/pkg_{idx % 13}/module_{idx}{ext}", f"module_{idx}{ext}", ext
+
+
+def legacy_files(count):
+    """原实现：每个文件复制一份 FILE_TYPES 描述并保存四个路径字段"""
+    files = []
+    for idx, (path, name, ext) in enumerate(sample_paths(count)):
+        info = {
+            "path": path,
+            "full_path": os.path.join(ROOT, path),
+            "extension": ext,
+            "filename": name,
+            "size": 1000 + idx,
+            "mtime_ns": 1_700_000_000_000_000_000 + idx,
+            "inode": 10_000_000 + idx,
+        }
+        info.update(Config.FILE_TYPES[ext])
+        files.append(info)
+    return files
+
+
+def record_files(count):
+    return [
+        FileRecord(ROOT, path, FileRecord.CODES[ext], 1000 + idx, 1_700_000_000_000_000_000 + idx, 10_000_000 + idx)
+        for idx, (path, _, ext) in enumerate(sample_paths(count))
+    ]
+
+
+def legacy_results(files):
+    """原实现：每条结果一个 11 键字典及 ISO 时间戳字符串"""
+    return [
+        {
+            "file": info["path"],
+            "type": info["type"],
+            "analyzer": info.get("analyzer", "Unknown"),
+            "status": "pass",
+            "score": 95,
+            "issues": [],
+            "warnings": [],
+            "mode": "offline",
+            "timestamp": datetime.datetime.now().isoformat(),
+            "output": "✅ 检查通过，未发现问题",
+            "binary_warning": info.get("is_binary", False),
+        }
+        for info in files
+    ]
+
+
+def record_results(files):
+    return [AuditResult(record.path, record.kind, "pass", 95, (), (), (), "offline", time.time()) for record in files]
+
+
+def measure(build, *args):
+    """返回构建结果占用的内存（字节）及结果"""
+    tracemalloc.start()
+    value = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="记录内存占用基准测试")
+    parser.add_argument("--count", type=int, default=200_000, help="记录数")
+    args = parser.parse_args()
+
+    legacy_file_bytes, files = measure(legacy_files, args.count)
+    legacy_result_bytes, _ = measure(legacy_results, files)
+    del files
+    record_file_bytes, records = measure(record_files, args.count)
+    record_result_bytes, _ = measure(record_results, records)
+
+    print(f"📄 {args.count} 条记录（单条字节数）")
+    print(f"  文件描述: 字典 {legacy_file_bytes / args.count:7.0f}  FileRecord  {record_file_bytes / args.count:7.0f}")
+    print(f"  分析结果: 字典 {legacy_result_bytes / args.count:7.0f}  AuditResult {record_result_bytes / args.count:7.0f}")
+    print(f"  缩减: {legacy_file_bytes / record_file_bytes:.1f}x / {legacy_result_bytes / record_result_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
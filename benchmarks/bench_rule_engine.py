@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+安全规则引擎基准测试
+对比逐条 re.findall 循环与 SecurityRuleEngine 单次扫描的吞吐量（文件/秒）
+
+用法:
+    python benchmarks/bench_rule_engine.py [目录] [--repeat N]
+未指定目录时使用内置的合成样本。
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from professional_code_auditor_v2 import Config, SecurityRuleEngine  # noqa: E402
+
+
+def legacy_scan(content):
+    """原实现：逐条规则全文扫描"""
+    return [
+        (rule_id, len(matches))
+        for rule_id, (pattern, _) in enumerate(Config.SECURITY_PATTERNS)
+        for matches in [re.findall(pattern, content, re.IGNORECASE)]
+        if matches
+    ]
+
+
+def synthetic_corpus(file_count=500, lines_per_file=200, seed=42):
+    """生成确定性的合成源码样本"""
+    rng = random.Random(seed)
+    words = "def return import self value data for in print config tokens passport secretary access result async".split()
+    secrets = [
+        'password = "hunter2"',
+        'database_password = "p@ss"',
+        "api_key = 'abcdef123456'",
+        'access_token = "xyz"',
+        "headers = {'Authorization': 'Bearer abc.def'}",
+    ]
+    corpus = []
+    for _ in range(file_count):
+        lines = []
+        for _ in range(lines_per_file):
+            line = " ".join(rng.choice(words) for _ in range(8))
+            if rng.random() < 0.01:
+                line += " " + rng.choice(secrets)
+            lines.append(line)
+        corpus.append("\n".join(lines))
+    return corpus
+
+
+def load_corpus(directory):
+    """读取目录下所有需要安全扫描的文本文件"""
+    corpus = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in Config.SKIP_DIRECTORIES]
+        for name in files:
+            _, ext = os.path.splitext(name)
+            file_type = Config.FILE_TYPES.get(name) or Config.FILE_TYPES.get(ext.lower())
+            if not file_type or not file_type["security_scan"]:
+                continue
+            try:
+                with open(os.path.join(root, name), "r", encoding="utf-8", errors="ignore") as f:
+                    corpus.append(f.read())
+            except OSError:
+                continue
+    return corpus
+
+
+def prefilter_skips(engine, content):
+    """关键词预过滤后是否无需执行任何正则（每条规则都缺少至少一个必需字面量）"""
+    haystack = content.lower()
+    return not any(all(literal in haystack for literal in literals) for _, literals in engine.anchors)
+
+
+def measure(func, corpus, repeat):
+    """返回最佳一轮的耗时"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in corpus:
+            func(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="安全规则引擎基准测试")
+    parser.add_argument("directory", nargs="?", help="样本目录（默认使用合成样本）")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最佳值")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.directory) if args.directory else synthetic_corpus()
+    if not corpus:
+        print("❌ 未找到样本文件")
+        return
+
+    engine = SecurityRuleEngine()
+    mismatches = sum(1 for content in corpus if legacy_scan(content) != engine.count(content))
+    if mismatches:
+        print(f"❌ 结果不一致: {mismatches} 个文件")
+        sys.exit(1)
+
+    total_bytes = sum(len(content) for content in corpus)
+    legacy_time = measure(legacy_scan, corpus, args.repeat)
+    engine_time = measure(engine.count, corpus, args.repeat)
+
+    print(f"📂 样本: {len(corpus)} 个文件, {total_bytes / 1024 / 1024:.1f} MB")
+    print(f"  逐条 re.findall : {len(corpus) / legacy_time:10.1f} 文件/秒 ({legacy_time:.3f}s)")
+    print(f"  SecurityRuleEngine: {len(corpus) / engine_time:10.1f} 文件/秒 ({engine_time:.3f}s)")
+    print(f"  加速比: {legacy_time / engine_time:.2f}x")
+    if engine.prefilter:
+        skipped = sum(1 for content in corpus if prefilter_skips(engine, content))
+        print(f"  关键词预过滤: {skipped}/{len(corpus)} 个文件 ({skipped / len(corpus):.1%}) 无需执行正则")
+
+
+if __name__ == "__main__":
+    main()
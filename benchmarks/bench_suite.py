@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+基准测试套件
+在确定性合成仓库上运行微基准与宏基准，结果写入 JSON；compare 子命令对比基线并标记性能回退。
+
+用法:
+    python benchmarks/bench_suite.py run [--files N] [--repeat N] [--only 名称] [--output results.json]
+    python benchmarks/bench_suite.py compare baseline.json results.json [--threshold 0.10]
+compare 存在回退时退出码为 1，可直接用于 CI。
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import datetime
+import argparse
+import tempfile
+import statistics
+import contextlib
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+
+from professional_code_auditor_v2 import Config, PrivacyProtector, ProfessionalCodeAuditor  # noqa: E402
+from analyzers import enhanced_analyzer  # noqa: E402
+from synthetic_repo import generate_repo, parse_mix  # noqa: E402
+
+# 名称 -> (类型, 准备函数)；准备函数返回 (被测函数, 每轮处理量, 单位)
+BENCHMARKS = {}
+
+
+def benchmark(name, kind):
+    """注册基准：kind 为 micro（单个函数）或 macro（完整流程）"""
+
+    def register(setup):
+        BENCHMARKS[name] = (kind, setup)
+        return setup
+
+    return register
+
+
+class Workspace:
+    """基准共享的合成仓库及其中的文本样本"""
+
+    def __init__(self, root, sample_limit):
+        self.root = root
+        self.settings = Config.load_settings()
+        auditor = self.auditor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.files = auditor.scan_directory()
+        # 微基准使用的样本：不超过 sample_limit 个文本文件的内容
+        self.samples = []
+        for file_info in self.files[:sample_limit]:
+            with open(file_info["full_path"], "r", encoding="utf-8", errors="ignore") as f:
+                self.samples.append((file_info, f.read()))
+        self.python_samples = [(info, content) for info, content in self.samples if info["extension"] == ".py"]
+
+    def auditor(self, **kwargs):
+        auditor = ProfessionalCodeAuditor(settings=self.settings, **kwargs)
+        auditor.target_dir = self.root
+        auditor.scan_mode = "offline"
+        return auditor
+
+
+@benchmark("scan_directory", "macro")
+def bench_scan_directory(ws):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            ws.auditor().scan_directory()
+
+    return run, len(ws.files), "files"
+
+
+@benchmark("find_code_files", "macro")
+def bench_find_code_files(ws):
+    def run():
+        # find_code_files 以当前目录为根进行 glob
+        cwd = os.getcwd()
+        os.chdir(ws.root)
+        try:
+            return enhanced_analyzer.find_code_files()
+        finally:
+            os.chdir(cwd)
+
+    return run, len(run()), "files"
+
+
+@benchmark("run_analysis", "macro")
+def bench_run_analysis(ws):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            ws.auditor().run_analysis()
+
+    return run, len(ws.files), "files"
+
+
+@benchmark("generate_html_report", "macro")
+def bench_generate_html_report(ws):
+    output_dir = os.path.join(os.path.dirname(ws.root), "reports")
+    os.makedirs(output_dir, exist_ok=True)
+    auditor = ws.auditor(output_dir=output_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        auditor.run_analysis()
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            os.remove(auditor.generate_html_report())
+
+    return run, auditor.summary.total, "rows"
+
+
+@benchmark("analyze_file", "micro")
+def bench_analyze_file(ws):
+    auditor = ws.auditor()
+
+    def run():
+        for file_info, content in ws.samples:
+            auditor.analyze_file(file_info, content)
+
+    return run, len(ws.samples), "files"
+
+
+@benchmark("sanitize_content", "micro")
+def bench_sanitize_content(ws):
+    def run():
+        for _, content in ws.samples:
+            PrivacyProtector.sanitize_content(content)
+
+    return run, sum(len(content) for _, content in ws.samples) / 1024 / 1024, "MB"
+
+
+@benchmark("analyze_python_code", "micro")
+def bench_analyze_python_code(ws):
+    def run():
+        for file_info, content in ws.python_samples:
+            enhanced_analyzer.analyze_python_code(file_info["full_path"], content)
+
+    return run, len(ws.python_samples), "files"
+
+
+def measure(func, repeat):
+    """运行 repeat 轮，返回各轮耗时"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args):
+    work_dir = tempfile.mkdtemp(prefix="codeauditor-bench-")
+    repo_params = {
+        "files": args.files,
+        "median_kb": args.median_kb,
+        "mix": parse_mix(args.mix),
+        "secret_density": args.secret_density,
+        "binary_ratio": args.binary_ratio,
+        "seed": args.seed,
+    }
+    try:
+        manifest = generate_repo(os.path.join(work_dir, "repo"), **repo_params)
+        ws = Workspace(os.path.join(work_dir, "repo"), args.sample_files)
+        print(f"📂 合成仓库: {manifest['files']} 个文件, {manifest['bytes'] / 1024 / 1024:.1f} MB")
+
+        results = {}
+        for name, (kind, setup) in BENCHMARKS.items():
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            func, units, unit = setup(ws)
+            func()  # 预热
+            times = measure(func, args.repeat)
+            best = min(times)
+            results[name] = {
+                "kind": kind,
+                "best_seconds": round(best, 6),
+                "median_seconds": round(statistics.median(times), 6),
+                "units": units,
+                "unit": unit,
+                "throughput": round(units / best, 3) if best > 0 else None,
+            }
+            print(f"  [{kind}] {name:<22} {best:9.4f}s  {units / best:14,.1f} {unit}/秒")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "repo": dict(repo_params, mix=args.mix, bytes=manifest["bytes"]),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"💾 结果已写入 {args.output}")
+    return 0
+
+
+def compare(args):
+    """按最佳耗时对比：当前 / 基线 - 1 超过阈值即为回退"""
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+
+    if baseline["meta"].get("repo") != current["meta"].get("repo"):
+        print("⚠️  合成仓库参数不同，对比结果仅供参考")
+
+    regressions = []
+    print(f"{'基准':<24}{'基线(s)':>12}{'当前(s)':>12}{'变化':>10}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<24}{'-':>12}{result['best_seconds']:>12.4f}{'新增':>10}")
+            continue
+        change = result["best_seconds"] / base["best_seconds"] - 1 if base["best_seconds"] else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  ❌ 回退"
+        elif change < -args.threshold:
+            flag = "  ✅ 提升"
+        print(f"{name:<24}{base['best_seconds']:>12.4f}{result['best_seconds']:>12.4f}{change:>+10.1%}{flag}")
+    for name in sorted(baseline["results"].keys() - current["results"].keys()):
+        print(f"{name:<24}{baseline['results'][name]['best_seconds']:>12.4f}{'-':>12}{'缺失':>10}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} 项基准回退超过 {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ 无超过 {args.threshold:.0%} 的回退")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基准测试套件")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="运行基准并写入 JSON 结果")
+    run_parser.add_argument("--files", type=int, default=2000, help="合成仓库文件数")
+    run_parser.add_argument("--median-kb", type=float, default=4.0, help="文件大小中位数（KB）")
+    run_parser.add_argument("--mix", help="语言构成，如 source=6,config=2,.py=10")
+    run_parser.add_argument("--secret-density", type=float, default=0.002, help="每行出现敏感信息的概率")
+    run_parser.add_argument("--binary-ratio", type=float, default=0.02, help="二进制文件占比")
+    run_parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    run_parser.add_argument("--sample-files", type=int, default=500, help="微基准使用的样本文件数")
+    run_parser.add_argument("--repeat", type=int, default=5, help="每项重复次数")
+    run_parser.add_argument("--only", action="append", help="只运行名称包含该字符串的基准，可重复指定")
+    run_parser.add_argument("--output", default="bench_results.json", help="结果文件 (默认: bench_results.json)")
+
+    compare_parser = subparsers.add_parser("compare", help="对比基线与当前结果")
+    compare_parser.add_argument("baseline", help="基线结果 JSON")
+    compare_parser.add_argument("current", help="当前结果 JSON")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="判定回退的耗时增幅 (默认: 0.10)")
+
+    args = parser.parse_args()
+    sys.exit(run_suite(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+    main()
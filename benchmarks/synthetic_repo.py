@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+确定性合成代码仓库生成器
+按给定的文件数、大小分布（对数正态）、语言构成（取自 Config.FILE_TYPES）、敏感信息密度及二进制文件比例
+生成目录树；相同参数与随机种子总是生成完全相同的内容。
+
+用法:
+    python benchmarks/synthetic_repo.py 目录 [--files N] [--median-kb N] [--secret-density P] [--binary-ratio P]
+                                          [--mix source=6,config=2,.py=10] [--seed N]
+"""
+
+import os
+import sys
+import math
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from professional_code_auditor_v2 import Config  # noqa: E402
+
+# 各文件类型的默认权重，同类型内的扩展名/特殊文件名平均分配
+DEFAULT_TYPE_WEIGHTS = {"source": 6.0, "config": 2.0, "script": 1.0, "document": 1.0, "docker": 0.3}
+
+# 按文件类型区分的正文行模板，{n} 替换为序号
+LINE_TEMPLATES = {
+    "source": [
+        "    value_{n} = compute(data, {n})",
+        "    if value_{n} > limit:",
+        "        return render(value_{n})",
+        "    items.append(value_{n})",
+        "    # TODO: refactor step {n}",
+        "    result = transform(result, {n})",
+    ],
+    "config": ["key_{n}: value_{n}", "timeout_{n}: {n}", "enabled_{n}: true", "# section {n}"],
+    "script": ['echo "step {n}"', "VALUE_{n}=$((VALUE + {n}))", 'if [ -f "file_{n}" ]; then rm "file_{n}"; fi'],
+    "document": ["Paragraph {n} describes the module in plain words.", "- item {n}", "## Section {n}"],
+    "docker": ["RUN echo step {n}", "ENV VALUE_{n}={n}", "COPY file_{n} /app/"],
+}
+
+SECRET_LINES = [
+    'password = "hunter{n}"',
+    "api_key = 'abcdef{n}123456'",
+    'access_token = "tok{n}xyz"',
+    'secret_key = "s3cr3t{n}"',
+    'database_password = "db{n}pass"',
+    "headers = {{'Authorization': 'Bearer abc{n}.def'}}",
+    'aws_secret_key = "AKIA{n}EXAMPLE"',
+]
+
+
+def parse_mix(text):
+    """解析语言构成参数：逗号分隔的 名称=权重，名称可为文件类型（source）或 FILE_TYPES 键（.py / Dockerfile）"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def kind_weights(mix=None):
+    """返回 [(FILE_TYPES 键, 权重), ...]：先按类型权重平均分配，再用显式指定的键覆盖"""
+    mix = mix or {}
+    type_weights = {key: mix.get(key, value) for key, value in DEFAULT_TYPE_WEIGHTS.items()}
+    by_type = {}
+    for key, info in Config.FILE_TYPES.items():
+        by_type.setdefault(info["type"], []).append(key)
+    weights = {}
+    for file_type, keys in by_type.items():
+        for key in keys:
+            weights[key] = type_weights.get(file_type, 0.0) / len(keys)
+    for key, weight in mix.items():
+        if key in Config.FILE_TYPES:
+            weights[key] = weight
+    return [(key, weight) for key, weight in weights.items() if weight > 0]
+
+
+def python_source(rng, size, secret_density):
+    """生成语法正确的 Python 源码（供 AST 分析基准使用）"""
+    parts = ['"""Synthetic module."""', "import os", "from collections import defaultdict", ""]
+    total = sum(len(part) + 1 for part in parts)
+    n = 0
+    while total < size:
+        block = [f"class Widget{n}:", f'    """Widget {n}."""', "", f"    def method_{n}(self, data, limit=10):"]
+        for _ in range(rng.randint(3, 12)):
+            if rng.random() < secret_density:
+                block.append("        " + rng.choice(SECRET_LINES).format(n=n))
+            else:
+                block.append(f"        value_{n} = len(data) + {n}")
+            n += 1
+        block.extend(
+            ["        return limit", "", f"def helper_{n}(items):", "    return [item for item in items if item]", ""]
+        )
+        parts.extend(block)
+        total += sum(len(line) + 1 for line in block)
+    return "\n".join(parts) + "\n"
+
+
+def text_content(rng, file_type, size, secret_density):
+    """按类型模板生成文本内容"""
+    templates = LINE_TEMPLATES[file_type]
+    lines = []
+    total = 0
+    n = 0
+    while total < size:
+        if rng.random() < secret_density:
+            line = rng.choice(SECRET_LINES).format(n=n)
+        else:
+            line = rng.choice(templates).format(n=n)
+        lines.append(line)
+        total += len(line) + 1
+        n += 1
+    return "\n".join(lines) + "\n"
+
+
+def file_size(rng, median_kb, sigma, max_kb):
+    """对数正态分布的文件大小（字节）"""
+    return max(16, min(int(max_kb * 1024), int(rng.lognormvariate(math.log(median_kb * 1024), sigma))))
+
+
+def generate_repo(
+    root,
+    files=2000,
+    median_kb=4.0,
+    sigma=1.0,
+    max_kb=512.0,
+    mix=None,
+    secret_density=0.002,
+    binary_ratio=0.02,
+    files_per_dir=40,
+    fanout=6,
+    seed=42,
+):
+    """在 root 下生成合成仓库，返回清单统计
+
+    secret_density 为每行替换为敏感信息的概率，binary_ratio 为二进制文件占比。
+    """
+    rng = random.Random(seed)
+    kinds, weights = zip(*kind_weights(mix))
+    binary_exts = sorted(Config.BINARY_EXTENSIONS)
+    manifest = {"files": 0, "bytes": 0, "binary": 0, "by_type": {}}
+
+    # 广度优先分配目录：每个目录放 files_per_dir 个文件，再向下扩展 fanout 个子目录
+    dirs = [root]
+    os.makedirs(root, exist_ok=True)
+    dir_idx = 0
+    for idx in range(files):
+        if idx and idx % files_per_dir == 0:
+            dir_idx += 1
+            while dir_idx >= len(dirs):
+                parent = dirs[(len(dirs) - 1) // fanout]
+                child = os.path.join(parent, f"pkg_{len(dirs)}")
+                os.makedirs(child, exist_ok=True)
+                dirs.append(child)
+        directory = dirs[dir_idx]
+        size = file_size(rng, median_kb, sigma, max_kb)
+
+        if rng.random() < binary_ratio:
+            path = os.path.join(directory, f"blob_{idx}{rng.choice(binary_exts)}")
+            data = b"\x00\x01" + rng.randbytes(size - 2)
+            manifest["binary"] += 1
+        else:
+            kind = rng.choices(kinds, weights)[0]
+            file_type = Config.FILE_TYPES[kind]["type"]
+            if kind.startswith("."):
+                path = os.path.join(directory, f"file_{idx}{kind}")
+            else:
+                # 特殊文件名（如 Dockerfile）需保持原名，各自放在独立子目录中
+                path = os.path.join(directory, f"svc_{idx}", kind)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            if kind == ".py":
+                text = python_source(rng, size, secret_density)
+            else:
+                text = text_content(rng, file_type, size, secret_density)
+            data = text.encode("utf-8")
+            manifest["by_type"][file_type] = manifest["by_type"].get(file_type, 0) + 1
+
+        with open(path, "wb") as f:
+            f.write(data)
+        manifest["files"] += 1
+        manifest["bytes"] += len(data)
+    manifest["directories"] = len(dirs)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="确定性合成代码仓库生成器")
+    parser.add_argument("directory", help="输出目录")
+    parser.add_argument("--files", type=int, default=2000, help="文件数")
+    parser.add_argument("--median-kb", type=float, default=4.0, help="文件大小中位数（KB）")
+    parser.add_argument("--sigma", type=float, default=1.0, help="文件大小对数正态分布的 sigma")
+    parser.add_argument("--max-kb", type=float, default=512.0, help="单文件大小上限（KB）")
+    parser.add_argument("--mix", help="语言构成，如 source=6,config=2,.py=10")
+    parser.add_argument("--secret-density", type=float, default=0.002, help="每行出现敏感信息的概率")
+    parser.add_argument("--binary-ratio", type=float, default=0.02, help="二进制文件占比")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    manifest = generate_repo(
+        args.directory,
+        files=args.files,
+        median_kb=args.median_kb,
+        sigma=args.sigma,
+        max_kb=args.max_kb,
+        mix=parse_mix(args.mix),
+        secret_density=args.secret_density,
+        binary_ratio=args.binary_ratio,
+        seed=args.seed,
+    )
+    print(
+        f"📂 已生成 {manifest['files']} 个文件 ({manifest['bytes'] / 1024 / 1024:.1f} MB, "
+        f"{manifest['directories']} 个目录, {manifest['binary']} 个二进制文件): {manifest['by_type']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ Professional Code Auditor v2.0 - 增强版
 
 import os
 import sys
+import shutil
+import tempfile
 import datetime
 import time
 import json
@@ -20,7 +22,39 @@ import urllib.error
 import urllib.parse
 import hashlib
 import base64
-from typing import Dict, List, Tuple, Optional
+import bisect
+import operator
+import collections
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import threading
+import copy
+import mmap
+import argparse
+import asyncio
+import contextlib
+import gzip
+import html
+import http.client
+import sqlite3
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - pyyaml 为可选依赖
+    yaml = None
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover - prometheus-client 为可选依赖
+    prometheus_client = None
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows 无 resource 模块
+    resource = None
 
 
 # ==================== 配置文件 ====================
@@ -367,6 +401,80 @@ class Config:
         (r'mongodb[_-]?password\s*=\s*[\'"][^\'"]+[\'"]', "MongoDB密码"),
     ]
 
+    # 报告中各文件类型的标签颜色
+    REPORT_TYPE_COLORS = {
+        "source": "#3498db",
+        "config": "#9b59b6",
+        "docker": "#1abc9c",
+        "script": "#27ae60",
+        "document": "#7f8c8d",
+        "binary": "#e67e22",
+    }
+
+    # analysis 配置默认值（可由 config.yaml 覆盖）
+    ANALYSIS_DEFAULTS = {
+        "max_file_size_kb": 1024,
+        # 超过大小限制的文件处理方式: mmap（分窗口扫描）或 skip（跳过并记录原因）
+        "large_file_strategy": "mmap",
+        "timeout_seconds": 10,
+        # 单进程（workers=1）时是否同样在子进程中强制时间预算；设为 False 时在当前进程中直接分析、不强制预算
+        "strict_timeout": True,
+        # 忽略模式（.gitignore 语法），相对扫描根目录匹配
+        "ignored_dirs": [],
+        # 是否读取各级目录中的 .gitignore / .auditignore
+        "use_ignore_files": True,
+        # 是否进入符号链接目录（按 (st_dev, st_ino) 去重，避免循环）
+        "follow_symlinks": False,
+        # concurrency: 同时进行的在线请求数（0 表示逐个同步请求）；timeout_seconds: 单个请求超时
+        # batch_max_kb / batch_max_files: 小文件合并为批量请求的上限（0 表示不合并）；gzip: 压缩请求体
+        "cloud_api": {
+            "url": "",
+            "retry_times": 3,
+            "concurrency": 16,
+            "timeout_seconds": 10,
+            "batch_max_kb": 256,
+            "batch_max_files": 64,
+            "gzip": True,
+        },
+    }
+
+    # 大文件分窗口扫描的窗口大小与重叠长度（字节）
+    MMAP_WINDOW_SIZE = 4 * 1024 * 1024
+    MMAP_WINDOW_OVERLAP = 64 * 1024
+
+    @staticmethod
+    def load_settings(path: Optional[str] = None) -> Dict:
+        """加载 config.yaml 中的 analysis 配置，缺省项使用默认值"""
+        settings = copy.deepcopy(Config.ANALYSIS_DEFAULTS)
+        if path:
+            candidates = [path]
+        else:
+            candidates = [
+                os.path.join(os.getcwd(), "config.yaml"),
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml"),
+            ]
+
+        for candidate in candidates:
+            if not os.path.isfile(candidate):
+                continue
+            if yaml is None:
+                # 提示写入标准错误，批处理模式的标准输出只包含JSON摘要
+                print(f"{Colors.YELLOW}⚠️  未安装 pyyaml，忽略配置文件: {candidate}{Colors.ENDC}", file=sys.stderr)
+                break
+            with open(candidate, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            for key, value in (data.get("analysis") or {}).items():
+                if isinstance(value, dict) and isinstance(settings.get(key), dict):
+                    settings[key].update(value)
+                else:
+                    settings[key] = value
+            break
+
+        # 未设置的环境变量（如 ${API_URL}）视为未配置在线服务地址
+        url = os.path.expandvars(settings["cloud_api"].get("url") or "")
+        settings["cloud_api"]["url"] = "" if "$" in url else url
+        return settings
+
     # 在线漏洞库URL（免费）
     ONLINE_VULN_DB_URL = "https://vulndb.example.com / api/v1 / scan"
     # AI分析API端点（模拟）
@@ -423,36 +531,1156 @@ class Colors:
     UNDERLINE = "\033[4m"
 
 
+# ==================== 安全规则引擎 ====================
+class SecurityRuleEngine:
+    """安全规则引擎：将全部规则编译为单一匹配器，一次扫描完成检测
+
+    忽略大小写且每条规则都以 ASCII 字面量开头时启用关键词预过滤：内容转小写后先用子串查找
+    检查每条规则必需的全部字面量（如 api + key、authorization + bearer），缺少任一字面量的规则整体跳过；
+    其余规则只在其前缀字面量出现的位置执行确认匹配。多数源码文件因此无需执行任何正则。
+    """
+
+    # 忽略大小写时可匹配 ASCII 字母、但转小写后不是对应字母（或长度改变）的字符，出现时不能用小写内容定位
+    CASEFOLD_SPECIALS = ("\u0130", "\u0131", "\u017f", "\u212a")
+
+    def __init__(self, patterns: Optional[List[Tuple[str, str]]] = None, flags: int = re.IGNORECASE):
+        self.patterns = list(Config.SECURITY_PATTERNS if patterns is None else patterns)
+        self.flags = flags
+        self.descriptions = [description for _, description in self.patterns]
+        # 单条规则，用于命中后的归属确认
+        self.rules = [re.compile(pattern, flags) for pattern, _ in self.patterns]
+        # 按规则前缀首字母分桶，命中时只确认可能的规则
+        self.buckets: Dict[str, List[int]] = {}
+        self.fallback: List[int] = []
+
+        entries = []
+        # 关键词预过滤：每条规则的 (前缀字面量, 全部必需字面量)
+        self.anchors: List[Tuple[str, Tuple[str, ...]]] = []
+        for rule_id, (pattern, _) in enumerate(self.patterns):
+            head, rest = self._split_literal_head(pattern)
+            self.anchors.append((head, tuple(dict.fromkeys([head] + self._required_literals(pattern)))))
+            if head:
+                entries.append((head, rest))
+                self.buckets.setdefault(head[0], []).append(rule_id)
+            else:
+                self.fallback.append(rule_id)
+
+        alternatives = [self._build_trie(entries)] if entries else []
+        alternatives.extend(f"(?:{self.patterns[rule_id][0]})" for rule_id in self.fallback)
+        self.matcher = re.compile("|".join(alternatives) or "(?!)", flags)
+        self.prefilter = bool(
+            self.patterns and not self.fallback and flags & re.IGNORECASE and all(head.isascii() for head, _ in self.anchors)
+        )
+        self._bytes_compiled: Optional[Tuple] = None
+        self.version = hashlib.sha256(json.dumps([self.patterns, flags], ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _split_literal_head(pattern: str) -> Tuple[str, str]:
+        """拆分规则的字面量前缀（忽略大小写），无法拆分时返回空前缀"""
+        # 顶层存在分支时前缀不适用于所有分支
+        depth = 0
+        in_class = False
+        escaped = False
+        for ch in pattern:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif in_class:
+                in_class = ch != "]"
+            elif ch == "[":
+                in_class = True
+            elif ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            elif ch == "|" and depth == 0:
+                return "", pattern
+
+        idx = 0
+        while idx < len(pattern) and (pattern[idx].isalnum() or pattern[idx] == "_"):
+            if idx + 1 < len(pattern) and pattern[idx + 1] in "?*+{":
+                break
+            idx += 1
+        return pattern[:idx].lower(), pattern[idx:]
+
+    @staticmethod
+    def _required_literals(pattern: str) -> List[str]:
+        """提取规则匹配时必定出现的字面量片段（小写），顶层存在分支时返回空列表
+
+        只收集顶层连续的字母数字片段；分组、字符类、转义序列及带可选量词的字符都会截断片段。
+        """
+        literals = []
+        current = ""
+        idx = 0
+        while idx < len(pattern):
+            ch = pattern[idx]
+            following = pattern[idx + 1] if idx + 1 < len(pattern) else ""
+            if ch.isalnum() or ch == "_":
+                if following in ("?", "*", "{"):
+                    # 可出现零次的字符不是必需的
+                    literals.append(current)
+                    current = ""
+                else:
+                    current += ch
+                idx += 1
+                continue
+            literals.append(current)
+            current = ""
+            if ch == "|":
+                return []
+            if ch == "\\":
+                # 转义序列连同其参数（\x41、\u0041、\N{...}、反向引用编号）一并跳过
+                escape = following
+                idx += 2
+                if escape in ("x", "u", "U"):
+                    idx += {"x": 2, "u": 4, "U": 8}[escape]
+                elif escape == "N":
+                    idx = pattern.find("}", idx) + 1 or len(pattern)
+                elif escape.isdigit():
+                    while idx < len(pattern) and pattern[idx].isdigit():
+                        idx += 1
+            elif ch == "{":
+                # 量词 {m,n}
+                idx = pattern.find("}", idx) + 1 or len(pattern)
+            elif ch in "([":
+                # 跳过整个分组或字符类（分组内的分支不影响顶层必需片段）
+                depth = 0
+                in_class = False
+                while idx < len(pattern):
+                    c = pattern[idx]
+                    if c == "\\":
+                        idx += 1
+                    elif in_class:
+                        in_class = c != "]"
+                    elif c == "[":
+                        in_class = True
+                        # 紧跟 [ 或 [^ 的 ] 是字符类成员
+                        if pattern.startswith("]", idx + 1) or pattern.startswith("^]", idx + 1):
+                            idx = pattern.index("]", idx + 1)
+                    elif c == "(":
+                        depth += 1
+                    elif c == ")":
+                        depth -= 1
+                    idx += 1
+                    if depth == 0 and not in_class:
+                        break
+            else:
+                idx += 1
+        literals.append(current)
+        return [literal.lower() for literal in literals if literal]
+
+    @staticmethod
+    def _build_trie(entries: List[Tuple[str, str]]) -> str:
+        """将前缀相同的规则合并为前缀树形式的正则"""
+        trie: Dict = {}
+        for head, rest in entries:
+            node = trie
+            for ch in head:
+                node = node.setdefault(ch, {})
+            node.setdefault("", []).append(rest)
+
+        def emit(node: Dict) -> str:
+            alternatives = [re.escape(ch) + emit(child) for ch, child in node.items() if ch]
+            alternatives.extend(f"(?:{rest})" if rest else "" for rest in node.get("", []))
+            if len(alternatives) == 1:
+                return alternatives[0]
+            return "(?:" + "|".join(alternatives) + ")"
+
+        return emit(trie)
+
+    def _bytes_patterns(self) -> Tuple:
+        """字节串版本的匹配器与规则（首次使用时编译）"""
+        if self._bytes_compiled is None:
+            self._bytes_compiled = (
+                re.compile(self.matcher.pattern.encode("utf-8"), self.flags),
+                [re.compile(rule.pattern.encode("utf-8"), self.flags) for rule in self.rules],
+                (
+                    [
+                        (head.encode("ascii"), tuple(literal.encode("ascii") for literal in literals))
+                        for head, literals in self.anchors
+                    ]
+                    if self.prefilter
+                    else None
+                ),
+            )
+        return self._bytes_compiled
+
+    def scan(
+        self,
+        content,
+        limit: Optional[int] = None,
+        base: int = 0,
+        next_allowed: Optional[List[int]] = None,
+        rule_times: Optional[List[float]] = None,
+    ) -> List[Tuple[int, List[Tuple[int, int]]]]:
+        """扫描内容，返回 [(规则编号, [(起始, 结束), ...]), ...]，按规则编号排序
+
+        每条规则的命中结果与 re.findall 一致（同一规则内不重叠，不同规则间可重叠）。
+        content 可以是 str 或 bytes；limit 限制命中起点（之后的内容仅用于补全跨界匹配），
+        base 为返回位置的偏移量，next_allowed 用于分窗口扫描时延续各规则的不重叠状态。
+        提供 rule_times 时按规则累加逐条确认匹配的耗时（秒），用于性能剖析。
+        """
+        if isinstance(content, str):
+            matcher, rules = self.matcher, self.rules
+            anchors = self.anchors if self.prefilter else None
+            # 转小写会改变位置或漏掉特殊大小写字符时，使用忽略大小写的匹配器
+            if anchors is not None and not content.isascii():
+                if any(ch in content for ch in self.CASEFOLD_SPECIALS):
+                    anchors = None
+        else:
+            matcher, rules, anchors = self._bytes_patterns()
+        if next_allowed is None:
+            next_allowed = [0] * len(rules)
+        if anchors is not None:
+            return self._scan_anchored(content, rules, anchors, limit, base, next_allowed, rule_times)
+
+        spans: Dict[int, List[Tuple[int, int]]] = {}
+        pos = 0
+        while True:
+            match = matcher.search(content, pos)
+            if match is None:
+                break
+            start = match.start()
+            if limit is not None and start >= limit:
+                break
+            first = content[start : start + 1]
+            if not isinstance(first, str):
+                first = first.decode("latin-1")
+            candidates = self.buckets.get(first.lower())
+            if candidates is None:
+                # 特殊大小写字符（如 U+212A）无法按首字母分桶，逐条确认
+                candidates = range(len(rules))
+            elif self.fallback:
+                candidates = candidates + self.fallback
+            for rule_id in candidates:
+                if start + base < next_allowed[rule_id]:
+                    continue
+                if rule_times is None:
+                    rule_match = rules[rule_id].match(content, start)
+                else:
+                    match_start = time.perf_counter()
+                    rule_match = rules[rule_id].match(content, start)
+                    rule_times[rule_id] += time.perf_counter() - match_start
+                if rule_match:
+                    spans.setdefault(rule_id, []).append((start + base, rule_match.end() + base))
+                    next_allowed[rule_id] = max(rule_match.end(), start + 1) + base
+            pos = start + 1
+
+        return sorted(spans.items())
+
+    @staticmethod
+    def _scan_anchored(content, rules, anchors, limit, base, next_allowed, rule_times):
+        """关键词预过滤扫描：必需字面量不全的规则跳过，其余规则只在前缀字面量出现处确认"""
+        haystack = content.lower()
+        present: Dict = {}
+        spans = []
+        for rule_id, (head, literals) in enumerate(anchors):
+            missing = False
+            for literal in literals:
+                found = present.get(literal)
+                if found is None:
+                    found = present[literal] = literal in haystack
+                if not found:
+                    missing = True
+                    break
+            if missing:
+                continue
+
+            rule = rules[rule_id]
+            hits = []
+            find = haystack.find
+            start = find(head)
+            while start != -1 and (limit is None or start < limit):
+                if start + base >= next_allowed[rule_id]:
+                    if rule_times is None:
+                        rule_match = rule.match(content, start)
+                    else:
+                        match_start = time.perf_counter()
+                        rule_match = rule.match(content, start)
+                        rule_times[rule_id] += time.perf_counter() - match_start
+                    if rule_match:
+                        hits.append((start + base, rule_match.end() + base))
+                        next_allowed[rule_id] = max(rule_match.end(), start + 1) + base
+                start = find(head, start + 1)
+            if hits:
+                spans.append((rule_id, hits))
+        return spans
+
+    def scan_buffer(
+        self, buffer, window: int, overlap: int, rule_times: Optional[List[float]] = None
+    ) -> List[Tuple[int, List[Tuple[int, int]]]]:
+        """按重叠窗口扫描大块字节数据（如mmap），每次只复制一个窗口到内存
+
+        跨窗口的匹配只要长度不超过 overlap 即可完整识别。
+        """
+        spans: Dict[int, List[Tuple[int, int]]] = {}
+        next_allowed = [0] * len(self.rules)
+        for win_start in range(0, len(buffer), window):
+            chunk = buffer[win_start : win_start + window + overlap]
+            for rule_id, hits in self.scan(
+                chunk, limit=window, base=win_start, next_allowed=next_allowed, rule_times=rule_times
+            ):
+                spans.setdefault(rule_id, []).extend(hits)
+        return sorted(spans.items())
+
+    def count(self, content: str) -> List[Tuple[int, int]]:
+        """统计各规则命中次数，返回 [(规则编号, 次数), ...]"""
+        return [(rule_id, len(hits)) for rule_id, hits in self.scan(content)]
+
+
+# ==================== 位置索引 ====================
+class LineIndex:
+    """换行符偏移索引
+
+    每个文件只构建一次行首偏移表，之后按二分查找将命中偏移量转换为行列号（均从1开始），
+    无需为每个命中重新切分内容。str 内容的列按字符计，bytes 内容按字节计。
+    masks 为需要在代码片段中遮盖的区域 [(起点, 终点), ...]（升序且互不重叠）。
+    """
+
+    SNIPPET_CHARS = 120
+    MASK = "***REDACTED***"
+
+    def __init__(self, content, masks: List[Tuple[int, int]] = ()):
+        self.content = content
+        self.masks = masks
+        self.newline = "\n" if isinstance(content, str) else b"\n"
+        # 各行行首偏移：第 k 行（从0计）之前各行（不含换行符）的长度之和加 k，切分、累加与相加均在C代码中完成
+        lengths = [0]
+        lengths.extend(itertools.accumulate(map(len, content.split(self.newline))))
+        lengths.pop()
+        self.starts = list(map(operator.add, lengths, itertools.count()))
+
+    def line_start(self, line: int) -> int:
+        """第 line 行（从1计）的行首偏移"""
+        return self.starts[line - 1]
+
+    def locate(self, offset: int) -> Tuple[int, int, str]:
+        """返回 (行, 列, 代码片段)"""
+        line = bisect.bisect_right(self.starts, offset)
+        line_start = self.starts[line - 1]
+        return line, offset - line_start + 1, self.snippet(self.content, line_start, offset, self.newline, self.masks)
+
+    @classmethod
+    def snippet(cls, content, line_start: int, offset: int, newline="\n", masks: List[Tuple[int, int]] = ()) -> str:
+        """命中所在行的片段；超长行（如压缩代码）只截取命中附近的 SNIPPET_CHARS 个字符，落入 masks 的部分替换为 MASK"""
+        begin = max(line_start, offset - cls.SNIPPET_CHARS // 3)
+        end = content.find(newline, offset, begin + cls.SNIPPET_CHARS)
+        if end == -1:
+            end = min(len(content), begin + cls.SNIPPET_CHARS)
+
+        mask = cls.MASK if isinstance(content, str) else cls.MASK.encode("ascii")
+        parts = []
+        pos = begin
+        # 从起点不晚于片段起点的最后一个遮盖区域开始检查
+        idx = max(0, bisect.bisect_right(masks, (begin,)) - 1)
+        while idx < len(masks) and masks[idx][0] < end:
+            mask_start, mask_end = masks[idx]
+            idx += 1
+            if mask_end <= pos:
+                continue
+            parts.append(content[pos : max(pos, mask_start)])
+            parts.append(mask)
+            pos = min(mask_end, end)
+        parts.append(content[pos:end])
+        text = parts[0][:0].join(parts)
+        if not isinstance(text, str):
+            text = text.decode("utf-8", errors="replace")
+        return text.strip()
+
+    @classmethod
+    def locate_sorted(cls, buffer, offsets: List[int], chunk: int = 1024 * 1024, masks: List[Tuple[int, int]] = ()):
+        """按升序偏移量逐个产出 (行, 列, 代码片段)，适用于 mmap 等大块字节数据
+
+        不构建完整的偏移表，只按块统计两个命中之间的换行符数，内存占用与文件大小无关。
+        """
+        line, line_start, pos = 1, 0, 0
+        for offset in offsets:
+            while pos < offset:
+                end = min(offset, pos + chunk)
+                piece = buffer[pos:end]
+                count = piece.count(b"\n")
+                if count:
+                    line += count
+                    line_start = pos + piece.rfind(b"\n") + 1
+                pos = end
+            yield line, offset - line_start + 1, cls.snippet(buffer, line_start, offset, b"\n", masks)
+
+
+# ==================== 紧凑记录 ====================
+class FileKind(NamedTuple):
+    """文件类型描述：相同描述全局只保存一份，记录中以编号引用"""
+
+    type: str
+    analyzer: str
+    color: str
+    security_scan: bool
+
+
+class FileRecord:
+    """待分析文件的紧凑描述
+
+    只保存相对根目录的路径、类型编号及文件状态；根目录字符串由同一次扫描的全部记录共享，
+    完整路径、文件名、扩展名及类型信息按需计算。支持 record["type"] 形式的只读访问，与原字典描述兼容。
+    类型编号表在导入时按 Config.FILE_TYPES 的顺序确定，各进程一致。
+    """
+
+    __slots__ = ("root", "path", "kind", "size", "mtime_ns", "inode")
+
+    KINDS: List[FileKind] = []
+    # Config.FILE_TYPES 的键（扩展名或特殊文件名） -> 类型编号
+    CODES: Dict[str, int] = {}
+    BINARY = 0
+
+    def __init__(
+        self,
+        root: str,
+        path: str,
+        kind: int,
+        size: Optional[int] = None,
+        mtime_ns: Optional[int] = None,
+        inode: Optional[int] = None,
+    ):
+        self.root = root
+        self.path = path
+        self.kind = kind
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.inode = inode
+
+    @classmethod
+    def intern_kinds(cls):
+        """按 Config.FILE_TYPES 构建类型编号表"""
+        codes: Dict[FileKind, int] = {}
+        cls.KINDS = []
+        for key, info in list(Config.FILE_TYPES.items()) + [
+            ("", {"type": "binary", "analyzer": "Binary", "color": "#FF6B6B"})
+        ]:
+            kind = FileKind(info["type"], info["analyzer"], info["color"], info.get("security_scan", True))
+            if kind not in codes:
+                codes[kind] = len(cls.KINDS)
+                cls.KINDS.append(kind)
+            cls.CODES[key] = codes[kind]
+        cls.BINARY = cls.CODES.pop("")
+
+    def __reduce__(self):
+        return FileRecord, (self.root, self.path, self.kind, self.size, self.mtime_ns, self.inode)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    @property
+    def full_path(self) -> str:
+        return os.path.join(self.root, self.path)
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.path)[1].lower()
+
+    @property
+    def type(self) -> str:
+        return self.KINDS[self.kind].type
+
+    @property
+    def analyzer(self) -> str:
+        return self.KINDS[self.kind].analyzer
+
+    @property
+    def color(self) -> str:
+        return self.KINDS[self.kind].color
+
+    @property
+    def security_scan(self) -> bool:
+        return self.KINDS[self.kind].security_scan
+
+    @property
+    def is_binary(self) -> bool:
+        return self.kind == self.BINARY
+
+
+FileRecord.intern_kinds()
+
+
+class AuditResult:
+    """单个文件的紧凑分析结果
+
+    类型与分析器以 FileRecord 的类型编号保存，时间戳为 time.time() 数值，问题与警告为元组（空元组全局共享）。
+    安全规则命中以 (规则编号, 命中次数, 位置) 保存在 findings 中，位置为按出现顺序排列的 (行, 列, 片段)；
+    规则编号对应 SecurityRuleEngine.descriptions，警告文本、发现位置及输出摘要只在报告阶段渲染。
+    warnings 只保存在线服务返回的自由文本警告。
+    支持 result["score"] 形式的只读访问；to_dict 输出与原结果字典相同的格式（时间戳为 ISO 字符串）。
+    """
+
+    __slots__ = ("file", "kind", "status", "score", "issues", "warnings", "findings", "mode", "timestamp")
+
+    def __init__(
+        self,
+        file: str,
+        kind: int,
+        status: str,
+        score: int,
+        issues=(),
+        warnings=(),
+        findings=(),
+        mode: str = "",
+        timestamp: float = 0.0,
+    ):
+        self.file = file
+        self.kind = kind
+        self.status = status
+        self.score = score
+        self.issues = tuple(issues)
+        self.warnings = tuple(warnings)
+        self.findings = tuple(findings)
+        self.mode = mode
+        self.timestamp = timestamp
+
+    def __reduce__(self):
+        return AuditResult, tuple(getattr(self, name) for name in self.__slots__)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    @property
+    def type(self) -> str:
+        return FileRecord.KINDS[self.kind].type
+
+    @property
+    def analyzer(self) -> str:
+        return FileRecord.KINDS[self.kind].analyzer
+
+    @property
+    def binary_warning(self) -> bool:
+        return self.kind == FileRecord.BINARY
+
+    @property
+    def warning_count(self) -> int:
+        """安全警告条数：命中的规则数加在线服务警告数"""
+        return len(self.findings) + len(self.warnings)
+
+    def warning_texts(self, rules: List[str]) -> List[str]:
+        """渲染安全警告文本，rules 为规则编号 -> 描述"""
+        if not self.findings:
+            return list(self.warnings)
+        return [f"发现{rules[rule_id]}: {count}处" for rule_id, count, _ in self.findings] + list(self.warnings)
+
+    def locations(self, rules: List[str]) -> List[Dict]:
+        """渲染按位置排序的发现列表 [{rule, line, column, snippet}, ...]"""
+        if not self.findings:
+            return []
+        located = sorted(
+            (line, column, rule_id, snippet) for rule_id, _, positions in self.findings for line, column, snippet in positions
+        )
+        return [
+            {"rule": rules[rule_id], "line": line, "column": column, "snippet": snippet}
+            for line, column, rule_id, snippet in located
+        ]
+
+    @staticmethod
+    def format_output(issues: List[str], warnings: List[str]) -> str:
+        """格式化输出摘要"""
+        parts = []
+
+        if warnings:
+            parts.append(f"🔐 安全警告: {', '.join(warnings)}")
+
+        if issues:
+            parts.append(f"📝 发现: {', '.join(issues[:2])}")
+
+        if not parts:
+            parts.append("✅ 检查通过，未发现问题")
+
+        return " | ".join(parts)
+
+    def to_dict(self, rules: List[str]) -> Dict:
+        """原结果字典格式（用于 JSONL 输出及报告），rules 为规则编号 -> 描述"""
+        warnings = self.warning_texts(rules)
+        if self.binary_warning:
+            output = "⚠️ 检测到二进制文件: " + ", ".join(self.issues)
+        else:
+            output = self.format_output(self.issues, warnings)
+        return {
+            "file": self.file,
+            "type": self.type,
+            "analyzer": self.analyzer,
+            "status": self.status,
+            "score": self.score,
+            "issues": list(self.issues),
+            "warnings": warnings,
+            "mode": self.mode,
+            "timestamp": datetime.datetime.fromtimestamp(self.timestamp).isoformat(),
+            "output": output,
+            "binary_warning": self.binary_warning,
+            "locations": self.locations(rules),
+        }
+
+
+# ==================== 目录遍历 ====================
+class FileEntry(NamedTuple):
+    """目录遍历产生的紧凑文件描述"""
+
+    path: str  # 相对根目录的路径
+    name: str
+    ext: str  # 小写扩展名（与 os.path.splitext 规则一致）
+    size: int
+    mtime_ns: int
+    inode: int
+    # 硬链接或符号链接文件（跟随符号链接目录时为所有文件）的 (st_dev, st_ino)，用于去重；其余为 None
+    link_key: Optional[Tuple[int, int]]
+
+
+class IgnoreRules:
+    """单个忽略文件（.gitignore 语法）编译后的规则集
+
+    无否定规则时所有模式合并为一个正则，一次匹配即可判定；
+    含否定规则时按 gitignore 语义逆序匹配，最后出现的规则优先。
+    """
+
+    def __init__(self, lines):
+        # (正则, 是否否定, 是否仅匹配目录)
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            rule = self._parse(line)
+            if rule is not None:
+                self.rules.append(rule)
+
+        self.has_negation = any(negated for _, negated, _ in self.rules)
+        self.any_regex = self._combine([regex for regex, _, _ in self.rules])
+        self.file_regex = self._combine([regex for regex, _, dir_only in self.rules if not dir_only])
+
+    @staticmethod
+    def _combine(regexes) -> Optional[re.Pattern]:
+        if not regexes:
+            return None
+        return re.compile("|".join(f"(?:{regex.pattern})" for regex in regexes))
+
+    @staticmethod
+    def _parse(line: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        """解析一行忽略规则，空行与注释返回 None"""
+        line = line.rstrip("\n\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            return None
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        # 含有中间斜杠的模式相对忽略文件所在目录匹配，否则匹配任意层级
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            return None
+
+        body = IgnoreRules._translate(line)
+        if not anchored:
+            body = "(?:.*/)?" + body
+        return re.compile(body + r"\Z"), negated, dir_only
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """将 gitignore 通配模式转换为正则"""
+        parts = []
+        i, n = 0, len(pattern)
+        while i < n:
+            ch = pattern[i]
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                if at_start and pattern.startswith("**/", i):
+                    parts.append("(?:.*/)?")
+                    i += 3
+                    continue
+                if at_start and i + 2 == n:
+                    parts.append(".*")
+                    i += 2
+                    continue
+                parts.append("[^/]*")
+                i += 2
+            elif ch == "*":
+                parts.append("[^/]*")
+                i += 1
+            elif ch == "?":
+                parts.append("[^/]")
+                i += 1
+            elif ch == "[":
+                end = pattern.find("]", i + 2)
+                if end == -1:
+                    parts.append(re.escape(ch))
+                    i += 1
+                    continue
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+            elif ch == "\\" and i + 1 < n:
+                parts.append(re.escape(pattern[i + 1]))
+                i += 2
+            else:
+                parts.append(re.escape(ch))
+                i += 1
+        return "".join(parts)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """判定相对路径：True 忽略，False 明确保留，None 无规则匹配"""
+        if not self.has_negation:
+            regex = self.any_regex if is_dir else self.file_regex
+            return True if regex is not None and regex.match(path) else None
+
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negated
+        return None
+
+
+class IgnoreMatcher:
+    """分层的忽略规则匹配器
+
+    每层为 (所在目录的相对路径前缀, IgnoreRules)，深层目录的规则优先；
+    进入含忽略文件的子目录时通过 descend 派生新的匹配器，父层规则共享不复制。
+    """
+
+    IGNORE_FILES = (".gitignore", ".auditignore")
+
+    def __init__(self, layers: Tuple = (), ignore_files: Tuple[str, ...] = IGNORE_FILES):
+        self.layers = layers
+        self.ignore_files = ignore_files
+
+    @classmethod
+    def from_globs(cls, globs, ignore_files: Tuple[str, ...] = IGNORE_FILES) -> "IgnoreMatcher":
+        """由配置中的忽略模式构建根层匹配器"""
+        rules = IgnoreRules(globs or [])
+        return cls((("", rules),) if rules.rules else (), ignore_files)
+
+    def descend(self, rel_dir: str, abs_dir: str, names) -> "IgnoreMatcher":
+        """读取目录中的忽略文件，返回适用于该目录内容的匹配器"""
+        layers = self.layers
+        prefix = rel_dir.replace(os.sep, "/") + "/" if rel_dir else ""
+        for name in self.ignore_files:
+            if name not in names:
+                continue
+            try:
+                with open(os.path.join(abs_dir, name), "r", encoding="utf-8", errors="ignore") as f:
+                    rules = IgnoreRules(f)
+            except OSError:
+                continue
+            if rules.rules:
+                layers = layers + ((prefix, rules),)
+        return self if layers is self.layers else IgnoreMatcher(layers, self.ignore_files)
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """判断相对根目录的路径是否被忽略"""
+        if not self.layers:
+            return False
+        path = rel_path.replace(os.sep, "/")
+        for prefix, rules in reversed(self.layers):
+            if prefix and not path.startswith(prefix):
+                continue
+            verdict = rules.match(path[len(prefix) :], is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+
+class DirectoryWalker:
+    """基于 os.scandir 的目录遍历器
+
+    复用 DirEntry 的文件状态信息，可使用线程池并发读取子目录；
+    按 (st_dev, st_ino) 对符号链接目录循环及硬链接文件去重。
+    指向根目录内会被遍历到的文件的符号链接与目标重复，只保留目标；跟随符号链接目录时所有文件均按 (st_dev, st_ino) 去重。
+    输出顺序与 os.walk(topdown=True) 一致，与线程数无关。
+    提供 ignore 匹配器时读取各级 .gitignore / .auditignore，被忽略的目录在进入前剪枝。
+    """
+
+    def __init__(
+        self,
+        root: str,
+        skip_dirs=frozenset(),
+        threads: int = 1,
+        follow_symlinks: bool = False,
+        ignore: Optional[IgnoreMatcher] = None,
+    ):
+        self.root = root
+        self._real_root = os.path.realpath(root)
+        self.skip_dirs = skip_dirs
+        self.ignore = ignore
+        self.ignored = 0
+        self.threads = max(1, threads)
+        self.follow_symlinks = follow_symlinks
+        self.duplicates = 0
+        self._seen_dirs = set()
+        self._seen_files = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split_ext(name: str) -> str:
+        """获取小写扩展名，忽略文件名开头的点（如 .env 无扩展名）"""
+        dot = name.rfind(".")
+        if dot <= 0:
+            return ""
+        # 点之前全部为点时不视为扩展名
+        for ch in name[:dot]:
+            if ch != ".":
+                return name[dot:].lower()
+        return ""
+
+    def _scan_dir(self, rel_dir: str, ignore: Optional[IgnoreMatcher]) -> Tuple[List[FileEntry], List[Tuple], int]:
+        """读取单个目录，返回文件描述、待遍历的子目录（相对路径, 匹配器）及被忽略的条目数；无法读取的目录视为空目录"""
+        files: List[FileEntry] = []
+        subdirs: List[Tuple] = []
+        prefix = rel_dir + os.sep if rel_dir else ""
+        abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+
+        try:
+            with os.scandir(abs_dir) as iterator:
+                entries = list(iterator)
+        except OSError:
+            return files, subdirs, 0
+
+        if ignore is not None:
+            ignore = ignore.descend(rel_dir, abs_dir, {entry.name for entry in entries})
+        ignored = 0
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                    if entry.name in self.skip_dirs:
+                        continue
+                    if ignore is not None and ignore.is_ignored(prefix + entry.name, True):
+                        ignored += 1
+                        continue
+                    if self.follow_symlinks:
+                        st = entry.stat()
+                        with self._lock:
+                            if (st.st_dev, st.st_ino) in self._seen_dirs:
+                                continue
+                            self._seen_dirs.add((st.st_dev, st.st_ino))
+                    subdirs.append((prefix + entry.name, ignore))
+                elif entry.is_file():
+                    if ignore is not None and ignore.is_ignored(prefix + entry.name, False):
+                        ignored += 1
+                        continue
+                    st = entry.stat()
+                    if entry.is_symlink() and not self.follow_symlinks and self._walks_target(entry.path):
+                        with self._lock:
+                            self.duplicates += 1
+                        continue
+                    linked = self.follow_symlinks or st.st_nlink > 1 or entry.is_symlink()
+                    files.append(
+                        FileEntry(
+                            prefix + entry.name,
+                            entry.name,
+                            self.split_ext(entry.name),
+                            st.st_size,
+                            st.st_mtime_ns,
+                            st.st_ino,
+                            (st.st_dev, st.st_ino) if linked else None,
+                        )
+                    )
+            except OSError:
+                continue
+        return files, subdirs, ignored
+
+    def _walks_target(self, path: str) -> bool:
+        """符号链接文件的目标是否位于根目录内、且不会被跳过目录或忽略规则排除（即遍历本身会产出目标）"""
+        rel_path = os.path.relpath(os.path.realpath(path), self._real_root)
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            return False
+
+        parts = rel_path.split(os.sep)
+        ignore = self.ignore
+        rel_dir = ""
+        for depth, name in enumerate(parts):
+            is_dir = depth < len(parts) - 1
+            if ignore is not None:
+                abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+                names = {
+                    ignore_file for ignore_file in ignore.ignore_files if os.path.isfile(os.path.join(abs_dir, ignore_file))
+                }
+                ignore = ignore.descend(rel_dir, abs_dir, names)
+            rel_dir = os.path.join(rel_dir, name) if rel_dir else name
+            if is_dir and name in self.skip_dirs:
+                return False
+            if ignore is not None and ignore.is_ignored(rel_dir, is_dir):
+                return False
+        return True
+
+    def __iter__(self):
+        if self.follow_symlinks:
+            try:
+                st = os.stat(self.root)
+            except OSError:
+                return
+            self._seen_dirs.add((st.st_dev, st.st_ino))
+
+        for entry in self._iter_entries():
+            # 去重在单线程中按遍历顺序进行，保证结果确定
+            if entry.link_key is not None:
+                if entry.link_key in self._seen_files:
+                    with self._lock:
+                        self.duplicates += 1
+                    continue
+                self._seen_files.add(entry.link_key)
+            yield entry
+
+    def _iter_entries(self):
+        """按 os.walk 顺序产出文件描述"""
+        if self.threads == 1:
+            stack = [("", self.ignore)]
+            while stack:
+                files, subdirs, ignored = self._scan_dir(*stack.pop())
+                self.ignored += ignored
+                yield from files
+                stack.extend(reversed(subdirs))
+            return
+
+        # 每个目录读取完成后立即提交其子目录，消费端按深度优先顺序等待结果
+        pool = ThreadPoolExecutor(max_workers=self.threads)
+
+        def task(rel_dir: str, ignore: Optional[IgnoreMatcher]):
+            files, subdirs, ignored = self._scan_dir(rel_dir, ignore)
+            return files, [pool.submit(task, *subdir) for subdir in subdirs], ignored
+
+        try:
+            stack = [pool.submit(task, "", self.ignore)]
+            while stack:
+                files, children, ignored = stack.pop().result()
+                self.ignored += ignored
+                yield from files
+                stack.extend(reversed(children))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ==================== 二进制检测 ====================
+class BinaryDetector:
+    """基于文件头内容的二进制检测（只读取前几KB）"""
+
+    # 读取的样本大小
+    SAMPLE_SIZE = 8192
+    # 非文本字符占比超过该阈值时判定为二进制
+    NON_TEXT_RATIO = 0.3
+    # 常见二进制格式的文件头
+    MAGIC_NUMBERS = (
+        b"\x7fELF",  # ELF
+        b"\xcf\xfa\xed\xfe",  # Mach-O 64
+        b"\xce\xfa\xed\xfe",  # Mach-O 32
+        b"\xca\xfe\xba\xbe",  # Java class / Mach-O fat
+        b"PK\x03\x04",  # zip / jar / whl / apk
+        b"\x1f\x8b",  # gzip
+        b"\xfd7zXZ\x00",  # xz
+        b"7z\xbc\xaf\x27\x1c",  # 7z
+        b"Rar!\x1a\x07",  # rar
+        b"\x89PNG\r\n\x1a\n",  # png
+        b"\xff\xd8\xff",  # jpeg
+        b"GIF87a",
+        b"GIF89a",
+        b"%PDF-",
+        b"SQLite format 3\x00",
+        b"\x00asm",  # wasm
+    )
+    # 文本BOM（UTF-16/32 文本含NUL字节，不按二进制处理）
+    TEXT_BOMS = (b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")
+    # 文本字节：可打印字符、常见控制字符及非ASCII字节（后者由UTF-8解码校验）
+    TEXT_BYTES = b"\t\n\r\f\b\x1b" + bytes(range(0x20, 0x100))
+
+    @staticmethod
+    def is_binary_sample(sample: bytes) -> bool:
+        """判断样本数据是否为二进制内容"""
+        if not sample:
+            return False
+        if sample.startswith(BinaryDetector.TEXT_BOMS):
+            return False
+        if sample.startswith(BinaryDetector.MAGIC_NUMBERS):
+            return True
+        if b"\x00" in sample:
+            return True
+
+        # 控制字符数 + UTF-8非法序列数（样本末尾被截断的字符忽略不计）
+        control = len(sample.translate(None, BinaryDetector.TEXT_BYTES))
+        text = sample.decode("utf-8", errors="replace")
+        invalid = text.count("\ufffd") - text[-3:].count("\ufffd")
+        return (control + invalid) / len(text) > BinaryDetector.NON_TEXT_RATIO
+
+    @staticmethod
+    def is_binary(filepath: str) -> bool:
+        """读取文件头判断是否为二进制文件，无法读取时按文本处理"""
+        try:
+            with open(filepath, "rb") as f:
+                sample = f.read(BinaryDetector.SAMPLE_SIZE)
+        except OSError:
+            return False
+        return BinaryDetector.is_binary_sample(sample)
+
+
 # ==================== 隐私保护工具 ====================
+class RedactionEngine:
+    """敏感信息清理引擎
+
+    规则由 SecurityRuleEngine 编译为单一匹配器，一次扫描得到各规则的全部命中；
+    相互重叠的命中合并为一个区域，以最先出现的规则的替换文本整体替换，
+    保证任何规则能匹配到的内容都不会因其他规则先行替换而残留。
+    redact_stream 以窗口方式处理分块输入，内存中仅保留一个窗口及重叠部分。
+    """
+
+    def __init__(self, rules: List[Tuple[str, str]], flags: int = re.IGNORECASE, overlap: int = Config.MMAP_WINDOW_OVERLAP):
+        self.overlap = overlap
+        self.engine = SecurityRuleEngine(rules, flags)
+        self.replacements = [replacement for _, replacement in rules]
+
+    def _regions(self, content: str):
+        """产出合并后的待替换区域 (起点, 终点, 替换文本)"""
+        hits = sorted((start, rule_id, end) for rule_id, spans in self.engine.scan(content) for start, end in spans)
+        start = end = -1
+        replacement = ""
+        for hit_start, rule_id, hit_end in hits:
+            if hit_start < end:
+                end = max(end, hit_end)
+                continue
+            if end > start:
+                yield start, end, replacement
+            start, end, replacement = hit_start, hit_end, self.replacements[rule_id]
+        if end > start:
+            yield start, end, replacement
+
+    def redact(self, content: str) -> str:
+        """清理完整内容"""
+        parts = []
+        pos = 0
+        for start, end, replacement in self._regions(content):
+            parts.append(content[pos:start])
+            parts.append(replacement)
+            pos = end
+        if not parts:
+            return content
+        parts.append(content[pos:])
+        return "".join(parts)
+
+    def redact_stream(self, chunks):
+        """清理分块输入，逐块产出清理后的文本
+
+        越过窗口末尾重叠区边界的区域连同其起点留待下一块数据到达后处理，
+        因此长度不超过 overlap 的敏感内容不会因分块边界而漏掉，输出与 redact 一致。
+        """
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) <= self.overlap:
+                continue
+            output, buffer = self._redact_window(buffer)
+            if output:
+                yield output
+        if buffer:
+            yield self.redact(buffer)
+
+    def _redact_window(self, buffer: str) -> Tuple[str, str]:
+        """处理一个窗口，返回 (可输出的清理结果, 需保留到下一窗口的原文)"""
+        limit = len(buffer) - self.overlap
+        parts = []
+        pos = 0
+        commit = limit
+        for start, end, replacement in self._regions(buffer):
+            if end > limit:
+                # 越过提交边界的区域可能随后续数据继续延伸或与之后的匹配合并，
+                # 从区域起点开始整体留到下一窗口重新匹配
+                commit = min(start, limit)
+                break
+            parts.append(buffer[pos:start])
+            parts.append(replacement)
+            pos = end
+        parts.append(buffer[pos:commit])
+        return "".join(parts), buffer[commit:]
+
+
 class PrivacyProtector:
     """隐私保护工具类"""
 
+    # 清理规则: (正则, 替换文本)
+    REDACTION_RULES = [
+        (r"sk_(live|test)_[a - zA-Z0 - 9]{24}", "***API_KEY_REDACTED***"),
+        (r"Bearer\s+[a - zA-Z0 - 9._-]{20,}", "***BEARER_TOKEN_REDACTED***"),
+        (r'password\s*=\s*[\'"][^\'"]+[\'"]', 'password = "***REDACTED***"'),
+        (r'api[_-]?key\s*=\s*[\'"][^\'"]+[\'"]', 'api_key = "***REDACTED***"'),
+        (r'secret\s*=\s*[\'"][^\'"]+[\'"]', 'secret = "***REDACTED***"'),
+        (r'token\s*=\s*[\'"][^\'"]+[\'"]', 'token = "***REDACTED***"'),
+    ]
+
+    _redactor: Optional[RedactionEngine] = None
+
+    @staticmethod
+    def redactor() -> RedactionEngine:
+        """进程内共享的清理引擎（首次使用时编译）"""
+        if PrivacyProtector._redactor is None:
+            PrivacyProtector._redactor = RedactionEngine(PrivacyProtector.REDACTION_RULES)
+        return PrivacyProtector._redactor
+
     @staticmethod
     def sanitize_content(content: str) -> str:
         """清理敏感内容"""
-        # 移除明显的API密钥
-        patterns = [
-            (r"sk_(live|test)_[a - zA-Z0 - 9]{24}", "***API_KEY_REDACTED***"),
-            (r"Bearer\s+[a - zA-Z0 - 9._-]{20,}", "***BEARER_TOKEN_REDACTED***"),
-            (r'password\s*=\s*[\'"][^\'"]+[\'"]', 'password = "***REDACTED***"'),
-            (r'api[_-]?key\s*=\s*[\'"][^\'"]+[\'"]', 'api_key = "***REDACTED***"'),
-            (r'secret\s*=\s*[\'"][^\'"]+[\'"]', 'secret = "***REDACTED***"'),
-            (r'token\s*=\s*[\'"][^\'"]+[\'"]', 'token = "***REDACTED***"'),
-        ]
+        return PrivacyProtector.redactor().redact(content)
 
-        sanitized = content
-        for pattern, replacement in patterns:
-            sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
+    @staticmethod
+    def sanitize_file(filepath: str, chunk_size: int = 1024 * 1024):
+        """分块读取并清理文件，逐块产出清理后的文本"""
+        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+            yield from PrivacyProtector.redactor().redact_stream(iter(lambda: f.read(chunk_size), ""))
 
-        return sanitized
+    @staticmethod
+    def secret_spans(content, hits: List[Tuple[int, List[Tuple[int, int]]]]) -> List[Tuple[int, int]]:
+        """安全规则命中中需要遮盖的区域：以引号结尾的命中只遮盖第一个引号之后的值，否则遮盖整个命中
+
+        返回按起点排序并合并重叠部分的 [(起点, 终点), ...]；content 可以是 str 或 bytes（如 mmap）。
+        """
+        quotes = ("'", '"') if isinstance(content, str) else (b"'", b'"')
+        regions = []
+        for _, rule_spans in hits:
+            for start, end in rule_spans:
+                text = content[start:end]
+                first = min((pos for pos in (text.find(quote) for quote in quotes) if pos != -1), default=-1)
+                if text[-1:] in quotes and 0 <= first < len(text) - 2:
+                    start, end = start + first + 1, end - 1
+                regions.append((start, end))
+
+        spans = []
+        for start, end in sorted(regions):
+            if spans and start <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+            else:
+                spans.append((start, end))
+        return spans
 
     @staticmethod
-    def create_file_hash(filepath: str) -> str:
-        """创建文件哈希（用于匿名化标识）"""
+    def create_file_hash(filepath: str, chunk_size: int = 1024 * 1024) -> str:
+        """创建文件哈希（用于匿名化标识）；分块读取，内存占用与文件大小无关"""
         try:
+            digest = hashlib.sha256()
             with open(filepath, "rb") as f:
-                content = f.read()
-            return hashlib.sha256(content).hexdigest()[:16]
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()[:16]
         except Exception:
             return hashlib.sha256(filepath.encode()).hexdigest()[:16]
 
@@ -475,6 +1703,446 @@ class PrivacyProtector:
         return None
 
 
+# ==================== 结果缓存 ====================
+class ResultCache:
+    """基于内容哈希的持久化结果缓存（SQLite存储，按总大小LRU淘汰）"""
+
+    DEFAULT_MAX_SIZE_MB = 256
+
+    def __init__(self, path: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._touched: Dict[str, float] = {}
+
+        cache_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used)")
+        self.total_size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    @staticmethod
+    def make_key(content_hash: str, rule_version: str, scan_mode: str, file_info: FileRecord) -> str:
+        """缓存键：内容哈希 + 规则集版本 + 扫描模式 + 影响结果的文件类型信息"""
+        return ":".join(
+            [
+                content_hash,
+                rule_version,
+                scan_mode,
+                file_info["type"],
+                "1" if file_info.get("security_scan", True) else "0",
+            ]
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        """读取缓存，命中时刷新访问时间"""
+        row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        old = self.conn.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        if old:
+            self.total_size -= old[0]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, data, size, time.time()),
+        )
+        self.total_size += size
+        if self.total_size > self.max_size:
+            self._evict()
+
+    def _evict(self):
+        """按LRU顺序淘汰，直到总大小回到上限的90%"""
+        self._flush_touched()
+        target = self.max_size * 0.9
+        rows = self.conn.execute("SELECT key, size FROM results ORDER BY last_used").fetchall()
+        evicted = []
+        for key, size in rows:
+            if self.total_size <= target:
+                break
+            evicted.append((key,))
+            self.total_size -= size
+        self.conn.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def _flush_touched(self):
+        """批量写回命中条目的访问时间"""
+        if self._touched:
+            self.conn.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def close(self):
+        """提交并关闭缓存"""
+        self._flush_touched()
+        self.conn.commit()
+        self.conn.close()
+
+
+# ==================== 增量扫描索引 ====================
+class ScanIndex:
+    """增量扫描索引：记录上次运行的文件状态签名 (大小, mtime_ns, inode) 及分析结果
+
+    同时记录遍历时读取文件头得到的二进制判定，签名未变化的文件下次遍历时无需再次打开。
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str, rule_version: str, scan_mode: str):
+        self.path = path
+        self.rule_version = rule_version
+        self.scan_mode = scan_mode
+        self.previous: Dict[str, Dict] = {}
+        self.current: Dict[str, Dict] = {}
+        # 相对路径 -> [大小, mtime_ns, inode, 是否二进制]
+        self.previous_verdicts: Dict[str, List] = {}
+        self.verdicts: Dict[str, List] = {}
+        self.reused = 0
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        # 二进制判定只取决于文件内容，规则集或扫描模式变化时仍然有效
+        if data.get("version") == self.VERSION:
+            self.previous_verdicts = data.get("verdicts", {})
+        # 规则集或扫描模式变化时历史结果全部失效
+        if (
+            data.get("version") == self.VERSION
+            and data.get("rule_version") == rule_version
+            and data.get("scan_mode") == scan_mode
+        ):
+            self.previous = data.get("files", {})
+
+    @staticmethod
+    def signature(file_info: FileRecord) -> Optional[List[int]]:
+        """获取文件状态签名（优先使用遍历时记录的状态），文件不可访问时返回 None"""
+        if file_info.get("mtime_ns") is not None:
+            return [file_info["size"], file_info["mtime_ns"], file_info["inode"]]
+        try:
+            st = os.stat(file_info["full_path"])
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def lookup(self, file_info: FileRecord, signature: Optional[List[int]]) -> Optional[Dict]:
+        """签名及文件类型均未变化时返回上次的分析结果"""
+        record = self.previous.get(file_info["path"])
+        if (
+            signature is None
+            or record is None
+            or record["sig"] != signature
+            or record["type"] != file_info["type"]
+            or record["security_scan"] != file_info.get("security_scan", True)
+        ):
+            return None
+        self.reused += 1
+        return record["entry"]
+
+    def record(self, file_info: FileRecord, signature: List[int], entry: Dict):
+        """记录本次运行的文件签名及结果"""
+        self.current[file_info["path"]] = {
+            "sig": signature,
+            "type": file_info["type"],
+            "security_scan": file_info.get("security_scan", True),
+            "entry": entry,
+        }
+
+    def binary_verdict(self, path: str, signature: List[int]) -> Optional[bool]:
+        """签名未变化时返回上次的二进制判定，否则返回 None"""
+        record = self.previous_verdicts.get(path)
+        if record is None or record[:3] != signature:
+            return None
+        return record[3]
+
+    def record_verdict(self, path: str, signature: List[int], is_binary: bool):
+        """记录本次遍历的二进制判定"""
+        self.verdicts[path] = signature + [is_binary]
+
+    def deleted_paths(self, current_paths) -> List[str]:
+        """上次存在、本次扫描中已不存在的文件"""
+        seen = set(current_paths)
+        return sorted(path for path in self.previous if path not in seen)
+
+    def save(self):
+        """原子写入索引文件"""
+        index_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(index_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "rule_version": self.rule_version,
+                    "scan_mode": self.scan_mode,
+                    "files": self.current,
+                    "verdicts": self.verdicts,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+
+
+# ==================== 结果输出 ====================
+class ResultSummary:
+    """结果汇总：以累加方式维护报告所需的统计，无需保留全部结果"""
+
+    def __init__(self):
+        self.total = 0
+        self.score_sum = 0
+        self.security_count = 0
+        self.quality_count = 0
+        self.binary_count = 0
+
+    def add(self, result: AuditResult):
+        """累加一条结果"""
+        self.total += 1
+        self.score_sum += result["score"]
+        self.security_count += result.warning_count
+        self.quality_count += len(result["issues"])
+        if result.get("binary_warning"):
+            self.binary_count += 1
+
+    @property
+    def avg_score(self) -> float:
+        """平均分"""
+        return self.score_sum / self.total if self.total else 0
+
+
+class JsonlResultSink:
+    """流式结果输出：每条结果产生后立即写入JSONL文件，rules 为渲染警告文本用的规则描述表"""
+
+    def __init__(self, path: str, rules: List[str]):
+        self.path = path
+        self.rules = rules
+        output_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(output_dir, exist_ok=True)
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, result: "AuditResult"):
+        """写入一条结果"""
+        self.file.write(json.dumps(result.to_dict(self.rules), ensure_ascii=False))
+        self.file.write("\n")
+
+    def close(self):
+        """关闭输出文件"""
+        self.file.close()
+
+    @staticmethod
+    def read(path: str):
+        """逐条读取JSONL结果"""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# ==================== HTTP传输层 ====================
+class HttpTransport:
+    """持久连接池 HTTP 传输层
+
+    按 (协议, 主机, 端口) 缓存空闲的 keep-alive 连接，避免每次请求重新建立 TCP/TLS 连接；
+    线程安全，可供多个线程同时使用。请求体超过 gzip_min_bytes 时可 gzip 压缩。
+    """
+
+    def __init__(self, max_idle: int = 16, gzip_min_bytes: int = 1024):
+        self.max_idle = max_idle
+        self.gzip_min_bytes = gzip_min_bytes
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """取出空闲连接（返回 (连接, 是否复用)），没有时新建"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self.connections_opened += 1
+
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, url: str, body: bytes = b"", headers: Optional[Dict] = None, timeout: float = 10):
+        """发送请求，返回 (状态码, 响应头, 响应体)；HTTP 错误状态抛出 urllib.error.HTTPError"""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # 复用的空闲连接可能已被服务器关闭，使用新连接重试一次
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            break
+
+        self.requests_sent += 1
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        if response.getheader("Content-Encoding", "").lower() == "gzip":
+            data = gzip.decompress(data)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+        return response.status, response.headers, data
+
+    def post_json(
+        self,
+        url: str,
+        payload,
+        headers: Optional[Dict] = None,
+        timeout: float = 10,
+        compress: bool = False,
+    ) -> Dict:
+        """发送 JSON POST 请求并解析响应，失败时抛出异常"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        request_headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip", **(headers or {})}
+        if compress and len(body) >= self.gzip_min_bytes:
+            body = gzip.compress(body, compresslevel=6)
+            request_headers["Content-Encoding"] = "gzip"
+        _, _, data = self.request("POST", url, body, request_headers, timeout)
+        return json.loads(data.decode("utf-8"))
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
+class RetryPolicy:
+    """带随机抖动的指数退避重试策略（full jitter）"""
+
+    BASE_DELAY = 0.2
+    MAX_DELAY = 5.0
+
+    def __init__(self, retry_times: int = 3, base_delay: float = BASE_DELAY, max_delay: float = MAX_DELAY):
+        self.retry_times = max(0, retry_times)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """第 attempt 次重试（从 0 开始）前的等待时间"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """网络错误、超时、429 及 5xx 响应可重试；其他 HTTP 错误及响应格式错误不重试"""
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code == 429 or error.code >= 500
+        return isinstance(error, (OSError, http.client.HTTPException, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """按端点的熔断器
+
+    连续失败（重试耗尽）达到阈值后断开，RESET_TIMEOUT 秒内的请求直接失败；
+    之后放行一个探测请求（半开），成功则恢复，失败则重新断开。
+    """
+
+    FAILURE_THRESHOLD = 5
+    RESET_TIMEOUT = 30.0
+
+    _registry: Dict[str, "CircuitBreaker"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_endpoint(cls, url: str) -> "CircuitBreaker":
+        """获取端点（协议 + 主机 + 端口）对应的共享熔断器"""
+        parts = urllib.parse.urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        with cls._registry_lock:
+            if key not in cls._registry:
+                cls._registry[key] = cls()
+            return cls._registry[key]
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """是否允许发出请求"""
+        with self._lock:
+            state = self.state
+            if state == "half_open":
+                self._probing = True
+                return True
+            return state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
 # ==================== 在线服务客户端 ====================
 class OnlineServiceClient:
     """在线服务客户端"""
@@ -482,11 +2150,30 @@ class OnlineServiceClient:
     @staticmethod
     def scan_with_vuln_db(file_content: str, file_type: str) -> Tuple[List[str], List[str]]:
         """使用在线漏洞库扫描（免费）"""
-        issues = []
-        warnings = []
-
         # 模拟在线扫描
         time.sleep(0.1)  # 模拟网络延迟
+        return OnlineServiceClient._vuln_db_findings(file_type)
+
+    @staticmethod
+    def scan_with_ai(file_content: str, file_type: str, api_key: Optional[str] = None) -> Tuple[List[str], List[str]]:
+        """使用AI分析扫描（隐私保护）"""
+        print(f"{Colors.CYAN}🤖 AI分析中...{Colors.ENDC}", end="")
+
+        # 隐私保护：清理敏感内容
+        sanitized_content = PrivacyProtector.sanitize_content(file_content)
+
+        # 模拟AI分析（实际应调用API）
+        time.sleep(0.2)
+        issues, warnings = OnlineServiceClient._ai_findings(sanitized_content)
+
+        print(f" {Colors.GREEN}完成{Colors.ENDC}")
+        return issues, warnings
+
+    @staticmethod
+    def _vuln_db_findings(file_type: str) -> Tuple[List[str], List[str]]:
+        """模拟在线漏洞库的扫描结果"""
+        issues = []
+        warnings = []
 
         # 检查常见漏洞
         for vuln in Config.ONLINE_VULN_DATABASE["common"]:
@@ -511,19 +2198,11 @@ class OnlineServiceClient:
         return issues, warnings
 
     @staticmethod
-    def scan_with_ai(file_content: str, file_type: str, api_key: Optional[str] = None) -> Tuple[List[str], List[str]]:
-        """使用AI分析扫描（隐私保护）"""
+    def _ai_findings(sanitized_content: str) -> Tuple[List[str], List[str]]:
+        """模拟AI分析结果（输入为已清理的内容）"""
         issues = []
         warnings = []
 
-        print(f"{Colors.CYAN}🤖 AI分析中...{Colors.ENDC}", end="")
-
-        # 隐私保护：清理敏感内容
-        sanitized_content = PrivacyProtector.sanitize_content(file_content)
-
-        # 模拟AI分析（实际应调用API）
-        time.sleep(0.2)
-
         # AI分析模拟结果
         ai_insights = [
             "AI分析: 代码结构良好，建议添加更多注释",
@@ -546,37 +2225,506 @@ class OnlineServiceClient:
         if random.random() < 0.3:
             issues.append(random.choice(ai_insights))
 
-        print(f" {Colors.GREEN}完成{Colors.ENDC}")
         return issues, warnings
 
     @staticmethod
-    def send_http_request(url: str, data: Dict, headers: Dict = None) -> Optional[Dict]:
-        """发送HTTP请求"""
+    def send_http_request(url: str, data: Dict, headers: Dict = None, retry_times: int = 3) -> Optional[Dict]:
+        """发送HTTP请求（复用共享连接池），失败时退避重试，端点熔断时直接返回 None"""
+        breaker = CircuitBreaker.for_endpoint(url)
+        policy = RetryPolicy(retry_times)
+        if not breaker.allow():
+            print(f"{Colors.YELLOW}⚠️  在线服务暂不可用（已熔断）: {url}{Colors.ENDC}")
+            return None
+
+        for attempt in range(policy.retry_times + 1):
+            try:
+                response = OnlineServiceClient.shared_transport().post_json(url, data, headers)
+                breaker.record_success()
+                return response
+
+            except Exception as e:
+                if not RetryPolicy.is_retryable(e):
+                    breaker.record_success()
+                    print(f"{Colors.RED}❌ 请求失败: {str(e)}{Colors.ENDC}")
+                    return None
+                if attempt == policy.retry_times:
+                    breaker.record_failure()
+                    reason = e.reason if isinstance(e, urllib.error.URLError) else e
+                    print(f"{Colors.RED}❌ 网络错误: {reason}{Colors.ENDC}")
+                    return None
+                time.sleep(policy.delay(attempt))
+        return None
+
+    _transport: Optional[HttpTransport] = None
+
+    @staticmethod
+    def shared_transport() -> HttpTransport:
+        """进程内共享的 HTTP 传输层"""
+        if OnlineServiceClient._transport is None:
+            OnlineServiceClient._transport = HttpTransport()
+        return OnlineServiceClient._transport
+
+
+# ==================== 性能剖析 ====================
+class PhaseProfiler:
+    """阶段性能剖析器
+
+    记录遍历、读取、分析、各安全规则、在线请求及报告生成的耗时区间，导出为 Chrome trace
+    （chrome://tracing / Perfetto 可直接打开）。每个进程把区间追加写入 trace_dir 下各自的分片文件，
+    子进程被终止时已完成文件的记录不会丢失；时间戳取自 time.perf_counter（系统单调时钟，跨进程可比）。
+    """
+
+    def __init__(self, trace_dir: str):
+        self.trace_dir = trace_dir
+        self.events: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # 传给子进程时只携带分片目录
+        return {"trace_dir": self.trace_dir}
+
+    def __setstate__(self, state):
+        self.__init__(state["trace_dir"])
+
+    def add(self, name: str, cat: str, start: float, end: float, **args):
+        """记录一个已完成的区间（start / end 为 time.perf_counter 秒数）"""
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = "phase", **args):
+        start = time.perf_counter()
         try:
-            req_data = json.dumps(data).encode("utf - 8")
+            yield args
+        finally:
+            self.add(name, cat, start, time.perf_counter(), **args)
+
+    def flush(self):
+        """将缓存的区间追加写入本进程的分片文件"""
+        with self._lock:
+            events, self.events = self.events, []
+        if not events:
+            return
+        with open(os.path.join(self.trace_dir, f"trace-{os.getpid()}.jsonl"), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+
+    def collect(self) -> List[Dict]:
+        """读取所有进程的分片，返回按时间排序的区间列表"""
+        self.flush()
+        events = []
+        for name in sorted(os.listdir(self.trace_dir)):
+            if not name.startswith("trace-"):
+                continue
+            with open(os.path.join(self.trace_dir, name), "r", encoding="utf-8") as f:
+                events.extend(json.loads(line) for line in f if line.strip())
+        events.sort(key=lambda event: (event["ts"], -event["dur"]))
+        return events
 
-            req = urllib.request.Request(
-                url,
-                data=req_data,
-                headers=headers or {"Content - Type": "application / json"},
+    @staticmethod
+    def export_chrome_trace(events: List[Dict], path: str):
+        """导出 Chrome trace JSON，主进程与各子进程分别命名"""
+        main_pid = os.getpid()
+        metadata = []
+        for pid in sorted({event["pid"] for event in events}):
+            label = "auditor" if pid == main_pid else f"worker-{pid}"
+            metadata.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": label}})
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    @staticmethod
+    def top_tables(events: List[Dict], top: int = 10) -> Dict[str, List[Dict]]:
+        """最慢文件及最慢规则（按累计确认耗时）排行"""
+        files = sorted((event for event in events if event["name"] == "file"), key=lambda event: -event["dur"])
+        slowest_files = [
+            {
+                "file": event["args"]["path"],
+                "ms": round(event["dur"] / 1000, 3),
+                "pid": event["pid"],
+            }
+            for event in files[:top]
+        ]
+
+        rules: Dict[str, Dict] = {}
+        for event in events:
+            if event["name"] != "security_scan":
+                continue
+            for rule, seconds in event["args"].get("rules", {}).items():
+                entry = rules.setdefault(rule, {"rule": rule, "ms": 0.0, "files": 0, "max_ms": 0.0, "max_file": ""})
+                ms = seconds * 1000
+                entry["ms"] += ms
+                entry["files"] += 1
+                if ms > entry["max_ms"]:
+                    entry["max_ms"], entry["max_file"] = ms, event["args"].get("path", "")
+        slowest_rules = sorted(rules.values(), key=lambda entry: -entry["ms"])[:top]
+        for entry in slowest_rules:
+            entry["ms"] = round(entry["ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+        return {"slowest_files": slowest_files, "slowest_rules": slowest_rules}
+
+    @staticmethod
+    def print_tables(tables: Dict[str, List[Dict]]):
+        """打印排行表"""
+        print(f"\n{Colors.HEADER}🐢 最慢文件{Colors.ENDC}")
+        for idx, entry in enumerate(tables["slowest_files"], 1):
+            print(f"  {idx:>2}. {entry['ms']:>10.3f} ms  {entry['file']}  (pid {entry['pid']})")
+        print(f"\n{Colors.HEADER}🐢 最慢规则（累计确认耗时）{Colors.ENDC}")
+        for idx, entry in enumerate(tables["slowest_rules"], 1):
+            print(
+                f"  {idx:>2}. {entry['ms']:>10.3f} ms  {entry['rule']}  "
+                f"({entry['files']} 个文件, 单文件最长 {entry['max_ms']:.3f} ms: {entry['max_file']})"
             )
 
-            with urllib.request.urlopen(req, timeout=10) as response:
-                return json.loads(response.read().decode())
 
-        except urllib.error.URLError as e:
-            print(f"{Colors.RED}❌ 网络错误: {e.reason}{Colors.ENDC}")
-            return None
-        except Exception as e:
-            print(f"{Colors.RED}❌ 请求失败: {str(e)}{Colors.ENDC}")
-            return None
+# ==================== 运行指标 ====================
+class AuditMetrics:
+    """Prometheus 运行指标（需要 prometheus-client）
+
+    指标均在主进程中根据合并后的结果记录，与是否并行分析无关；
+    使用独立的 registry，可通过 serve 在后台线程中提供 /metrics 端点。
+    rules 为规则编号 -> 描述（默认为 Config.SECURITY_PATTERNS），规则命中按编号直接累加到对应计数器。
+    """
+
+    LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, rules: Optional[List[str]] = None):
+        if prometheus_client is None:
+            raise RuntimeError("未安装 prometheus-client")
+        self.registry = prometheus_client.CollectorRegistry()
+        self.files = prometheus_client.Counter(
+            "code_auditor_files", "已分析的文件数", ["type", "status"], registry=self.registry
+        )
+        self.bytes = prometheus_client.Counter("code_auditor_bytes", "已分析文件的字节数", registry=self.registry)
+        self.phase_seconds = prometheus_client.Histogram(
+            "code_auditor_phase_seconds",
+            "各阶段耗时（read / analyze 为单个文件的耗时）",
+            ["phase"],
+            buckets=self.LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.rule_matches = prometheus_client.Counter(
+            "code_auditor_rule_matches", "安全规则命中次数", ["rule"], registry=self.registry
+        )
+        if rules is None:
+            rules = [description for _, description in Config.SECURITY_PATTERNS]
+        self.rule_counters = [self.rule_matches.labels(description) for description in rules]
+        self.cache_lookups = prometheus_client.Counter(
+            "code_auditor_cache_lookups", "结果缓存查询次数", ["result"], registry=self.registry
+        )
+        self.online_seconds = prometheus_client.Histogram(
+            "code_auditor_online_request_seconds",
+            "在线分析单次请求耗时",
+            buckets=self.LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.online_requests = prometheus_client.Counter(
+            "code_auditor_online_requests",
+            "在线分析请求数（outcome: ok / error / timeout / circuit_open）",
+            ["outcome"],
+            registry=self.registry,
+        )
+
+    def serve(self, port: int, addr: str = "0.0.0.0"):
+        """在后台线程中启动 /metrics HTTP 端点"""
+        prometheus_client.start_http_server(port, addr=addr, registry=self.registry)
+
+    def observe_phase(self, phase: str, seconds: float):
+        self.phase_seconds.labels(phase).observe(seconds)
+
+    def observe_cache(self, hit: bool):
+        self.cache_lookups.labels("hit" if hit else "miss").inc()
+
+    def observe_online(self, outcome: str, seconds: Optional[float] = None):
+        self.online_requests.labels(outcome).inc()
+        if seconds is not None:
+            self.online_seconds.observe(seconds)
+
+    @staticmethod
+    def peak_rss() -> Dict[str, int]:
+        """主进程及已结束子进程的峰值常驻内存（字节），平台不支持时返回空字典"""
+        if resource is None:
+            return {}
+        # Linux 下 ru_maxrss 单位为 KB，macOS 下为字节
+        scale = 1 if sys.platform == "darwin" else 1024
+        return {
+            "main": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            "workers": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+        }
+
+    @staticmethod
+    def write_textfile(path: str, summary: Dict):
+        """以 node_exporter textfile collector 格式原子写入本次运行的汇总指标
+
+        批处理任务往往在 Prometheus 采集前结束，由 node_exporter 读取该文件后持续暴露最近一次运行的结果。
+        """
+
+        def escape(value) -> str:
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        base_labels = {"target": summary["target"], "mode": summary["mode"]}
+        duration = summary["timings"]["total"]
+        cache = summary.get("cache") or {}
+        metrics = [
+            ("last_run_timestamp_seconds", "最近一次审计完成的时间", [({}, time.time())]),
+            ("last_run_duration_seconds", "最近一次审计总耗时", [({}, duration)]),
+            (
+                "last_run_phase_seconds",
+                "最近一次审计各阶段耗时",
+                [({"phase": k}, v) for k, v in summary["timings"].items() if k != "total"],
+            ),
+            ("last_run_files", "最近一次审计的文件数", [({}, summary["files"])]),
+            ("last_run_bytes", "最近一次审计实际分析的文件字节数", [({}, summary["bytes"])]),
+            ("last_run_files_per_second", "最近一次审计的文件吞吐量", [({}, summary["files"] / duration if duration else 0)]),
+            ("last_run_bytes_per_second", "最近一次审计的字节吞吐量", [({}, summary["bytes"] / duration if duration else 0)]),
+            (
+                "last_run_peak_rss_bytes",
+                "最近一次审计的峰值常驻内存",
+                [({"process": k}, v) for k, v in summary["peak_rss_bytes"].items()],
+            ),
+            ("last_run_cache_hits", "最近一次审计的结果缓存命中数", [({}, cache.get("hits", 0))]),
+            ("last_run_cache_misses", "最近一次审计的结果缓存未命中数", [({}, cache.get("misses", 0))]),
+            (
+                "last_run_findings",
+                "最近一次审计的发现数",
+                [({"kind": "security"}, summary["security_findings"]), ({"kind": "quality"}, summary["quality_findings"])],
+            ),
+        ]
+
+        lines = []
+        for name, help_text, samples in metrics:
+            lines.append(f"# HELP code_auditor_{name} {help_text}")
+            lines.append(f"# TYPE code_auditor_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{escape(v)}"' for k, v in dict(base_labels, **labels).items())
+                lines.append(f"code_auditor_{name}{{{label_text}}} {float(value)!r}")
+
+        # node_exporter 只读取 *.prom 文件，临时文件写完后原子替换
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def observe_result(self, file_info: FileRecord, result: AuditResult, timings: Dict[str, float], analyzed: bool = True):
+        """记录单个文件的结果及本次分析的阶段耗时；复用（缓存、增量索引、内容相同）的结果无耗时，也不计入分析字节数"""
+        self.files.labels(result["type"], result["status"]).inc()
+        if analyzed:
+            self.bytes.inc(file_info.get("size") or 0)
+        for phase, seconds in timings.items():
+            self.phase_seconds.labels(phase).observe(seconds)
+        for rule_id, count, _ in result.findings:
+            self.rule_counters[rule_id].inc(count)
+
+
+# ==================== 异步在线扫描 ====================
+class AsyncOnlineScanner:
+    """基于 asyncio 的并发在线扫描器
+
+    事件循环运行在后台线程中，主线程通过 submit 提交请求并立即返回 Future，
+    本地规则分析可在网络请求进行期间继续执行。
+    同时进行的请求数由信号量限制，每个请求单独计时，超时或失败记为问题而不中断扫描。
+    配置了 cloud_api.url 时将请求发送到该地址，否则使用本地模拟结果。
+    请求经由持久连接池发送；batch_max_bytes > 0 时多个小文件合并为一个批量请求，
+    批次在达到大小/数量上限或等待 BATCH_LINGER 秒后发出。
+    失败的请求按 RetryPolicy 退避重试，端点熔断期间直接失败；
+    最终失败的文件结果为 None，由调用方回退为仅使用离线规则的结果。
+    """
+
+    BATCH_LINGER = 0.01
+
+    def __init__(
+        self,
+        scan_mode: str,
+        api_key: Optional[str] = None,
+        url: str = "",
+        concurrency: int = 16,
+        timeout: float = 10,
+        batch_max_bytes: int = 0,
+        batch_max_files: int = 64,
+        compress: bool = True,
+        retry_times: int = 3,
+        metrics: Optional[AuditMetrics] = None,
+        profiler: Optional[PhaseProfiler] = None,
+    ):
+        self.scan_mode = scan_mode
+        self.metrics = metrics
+        self.profiler = profiler
+        self.api_key = api_key
+        self.url = url
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_max_files = max(1, batch_max_files)
+        self.compress = compress
+        self.transport = HttpTransport(max_idle=self.concurrency)
+        self.retry = RetryPolicy(retry_times)
+        self.breaker = CircuitBreaker.for_endpoint(url) if url else None
+        self._batch: List[Tuple[Dict, asyncio.Future]] = []
+        self._batch_bytes = 0
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        self.loop = asyncio.new_event_loop()
+        # 阻塞式 HTTP 请求在线程中执行，线程数与并发上限一致
+        self.loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="online-http"))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._thread = threading.Thread(target=self.loop.run_forever, name="online-scanner", daemon=True)
+        self._thread.start()
+
+    @property
+    def max_in_flight(self) -> int:
+        """调用方应保持的未完成文件数上限：足以填满所有并发请求（含批量）的四倍，为重试退避留出余量"""
+        per_request = self.batch_max_files if self.url and self.batch_max_bytes > 0 else 1
+        return self.concurrency * per_request * 4
+
+    def submit(self, sanitized_content: str, file_type: str):
+        """提交一个文件（已清理敏感信息的内容）的在线分析，返回 concurrent.futures.Future[(issues, warnings) 或 None]"""
+        return asyncio.run_coroutine_threadsafe(self._scan(sanitized_content, file_type), self.loop)
+
+    async def _scan(self, sanitized_content: str, file_type: str) -> Optional[Tuple[List[str], List[str]]]:
+        if not self.url:
+            async with self._semaphore:
+                # 模拟网络延迟
+                delay = 0.2 if self.scan_mode == "online_ai" else 0.1
+                await asyncio.sleep(delay)
+                self._observe("ok", delay)
+                if self.scan_mode == "online_ai":
+                    return OnlineServiceClient._ai_findings(sanitized_content)
+                return OnlineServiceClient._vuln_db_findings(file_type)
+
+        item = {"file_type": file_type, "content": sanitized_content}
+        if self.batch_max_bytes <= 0:
+            return (await self._send([item]))[0]
+
+        future = self.loop.create_future()
+        self._batch.append((item, future))
+        self._batch_bytes += len(sanitized_content)
+        if len(self._batch) >= self.batch_max_files or self._batch_bytes >= self.batch_max_bytes:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = self.loop.call_later(self.BATCH_LINGER, self._flush_batch)
+        return await future
+
+    def _flush_batch(self):
+        """将当前批次作为一个请求发出"""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch, self._batch, self._batch_bytes = self._batch, [], 0
+        if batch:
+            self.loop.create_task(self._send_batch(batch))
+
+    async def _send_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        results = await self._send([item for item, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _send(self, items: List[Dict]) -> List[Optional[Tuple[List[str], List[str]]]]:
+        """发送单个或批量请求，返回与 items 一一对应的 (issues, warnings)，最终失败时为 None"""
+        for attempt in range(self.retry.retry_times + 1):
+            try:
+                async with self._semaphore:
+                    # 取得并发名额后再检查熔断，排队期间端点已熔断的请求不再发出
+                    if attempt == 0 and not self.breaker.allow():
+                        self._observe("circuit_open")
+                        return [None] * len(items)
+                    request_start = time.perf_counter()
+                    try:
+                        results = await asyncio.wait_for(self._request(items), self.timeout)
+                    finally:
+                        elapsed = time.perf_counter() - request_start
+            except Exception as e:
+                outcome = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+                self._observe(outcome, elapsed)
+                self._record(request_start, elapsed, len(items), attempt, outcome)
+                if not RetryPolicy.is_retryable(e):
+                    self.breaker.record_success()
+                    break
+                if attempt < self.retry.retry_times:
+                    # 退避等待期间不占用并发名额
+                    await asyncio.sleep(self.retry.delay(attempt))
+                    continue
+                # 重试耗尽才计为一次端点失败，偶发错误不触发熔断
+                self.breaker.record_failure()
+                break
+            self._observe("ok", elapsed)
+            self._record(request_start, elapsed, len(items), attempt, "ok")
+            self.breaker.record_success()
+            return results
+        return [None] * len(items)
+
+    def _observe(self, outcome: str, seconds: Optional[float] = None):
+        if self.metrics is not None:
+            self.metrics.observe_online(outcome, seconds)
+
+    def _record(self, start: float, elapsed: float, files: int, attempt: int, outcome: str):
+        if self.profiler is not None:
+            self.profiler.add(
+                "online_request", "online", start, start + elapsed, files=files, attempt=attempt, outcome=outcome
+            )
+
+    async def _request(self, items: List[Dict]) -> List[Tuple[List[str], List[str]]]:
+        """执行一次 HTTP 请求：未启用批量时为单文件格式，否则为 batch 格式"""
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        if self.batch_max_bytes <= 0:
+            payload = {"mode": self.scan_mode, **items[0]}
+        else:
+            payload = {"mode": self.scan_mode, "batch": items}
+        response = await asyncio.to_thread(self.transport.post_json, self.url, payload, headers, self.timeout, self.compress)
+
+        responses = [response] if self.batch_max_bytes <= 0 else response.get("results", [])
+        if len(responses) != len(items):
+            raise ValueError(f"批量响应数量不匹配 ({len(responses)}/{len(items)})")
+        return [(list(r.get("issues", [])), list(r.get("warnings", []))) for r in responses]
+
+    def close(self):
+        """取消未完成的请求并停止事件循环"""
+        if self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    async def _shutdown(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.loop.shutdown_default_executor()
+        self.transport.close()
 
 
 # ==================== 主分析器类 ====================
 class ProfessionalCodeAuditor:
     """专业代码审计器"""
 
-    def __init__(self):
+    # 结果记录格式版本，变更时缓存与增量索引中的旧结果整体失效
+    RESULT_SCHEMA = 4
+
+    def __init__(
+        self,
+        workers: int = 1,
+        cache_path: Optional[str] = None,
+        cache_max_mb: float = ResultCache.DEFAULT_MAX_SIZE_MB,
+        index_path: Optional[str] = None,
+        results_path: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        settings: Optional[Dict] = None,
+        walk_threads: int = 1,
+        metrics: Optional[AuditMetrics] = None,
+        profiler: Optional[PhaseProfiler] = None,
+    ):
         self.target_dir = ""
         self.output_file = ""
         self.results = []
@@ -589,6 +2737,12 @@ class ProfessionalCodeAuditor:
             "document_files": 0,
             "binary_files": 0,
             "skipped_files": 0,
+            "large_files": 0,
+            "timed_out_files": 0,
+            "online_fallbacks": 0,
+            "duplicate_files": 0,
+            "identical_files": 0,
+            "ignored_entries": 0,
             "security_issues": 0,
             "quality_issues": 0,
             "ai_insights": 0,
@@ -597,6 +2751,38 @@ class ProfessionalCodeAuditor:
         self.ai_api_key = None
         self.start_time = None
         self.scan_duration = 0
+        self.rule_engine = SecurityRuleEngine()
+        # 并行进程数，小于等于0时使用全部CPU核心
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        # 结果缓存路径，为空时不启用缓存
+        self.cache_path = cache_path
+        self.cache_max_mb = cache_max_mb
+        self.cache_stats = {"hits": 0, "misses": 0}
+        # 增量扫描索引路径，为空时每次全量分析
+        self.index_path = index_path
+        self.deleted_files: List[str] = []
+        # 流式结果输出路径（JSONL），设置后结果不再保存在内存中
+        self.results_path = results_path
+        self.summary = ResultSummary()
+        # HTML报告输出目录，为空时使用当前目录
+        self.output_dir = output_dir
+        # 各阶段耗时（秒）；并行模式下读取与分析为各进程累计值
+        self.phase_times = {"walk": 0.0, "read": 0.0, "analyze": 0.0, "report": 0.0}
+        # config.yaml 中的 analysis 配置
+        self.settings = settings if settings is not None else Config.load_settings()
+        # 目录遍历线程数（网络文件系统上可显著加速）
+        self.walk_threads = walk_threads
+        # Prometheus 运行指标（可选）
+        self.metrics = metrics
+        # 本次运行实际分析的文件字节数（缓存、增量索引及内容相同而复用的结果不计入），与 code_auditor_bytes_total 一致
+        self.bytes_scanned = 0
+        # 阶段性能剖析（可选）
+        self.profiler = profiler
+
+    @property
+    def timeout_seconds(self) -> float:
+        """单文件分析时间预算（秒），0表示不限制"""
+        return float(self.settings.get("timeout_seconds") or 0)
 
     def show_banner(self):
         """显示程序横幅"""
@@ -718,73 +2904,83 @@ class ProfessionalCodeAuditor:
         else:
             print(f"{Colors.YELLOW}⚠️  使用基础AI分析功能{Colors.ENDC}")
 
-    def scan_directory(self):
-        """扫描目录"""
+    def scan_directory(self, index: Optional[ScanIndex] = None):
+        """扫描目录
+
+        文本类型及无扩展名的文件需读取文件头确认是否为二进制：提供增量索引时状态签名未变化的文件沿用上次的判定；
+        其余文件在 walk_threads 大于 1 时由线程池与遍历并行读取。
+        """
         print(f"\n{Colors.BLUE}🔍 正在扫描文件系统...{Colors.ENDC}")
 
         all_files = []
         self.file_stats = {k: 0 for k in self.file_stats.keys()}
+        own_name = os.path.basename(__file__)
+        ignore = IgnoreMatcher.from_globs(
+            self.settings.get("ignored_dirs"),
+            IgnoreMatcher.IGNORE_FILES if self.settings.get("use_ignore_files", True) else (),
+        )
+        walker = DirectoryWalker(
+            self.target_dir,
+            Config.SKIP_DIRECTORIES,
+            threads=self.walk_threads,
+            follow_symlinks=self.settings.get("follow_symlinks", False),
+            ignore=ignore,
+        )
 
-        for root, dirs, files in os.walk(self.target_dir):
-            dirs[:] = [d for d in dirs if d not in Config.SKIP_DIRECTORIES]
+        root = self.target_dir
+        # (遍历条目, 类型编号, 是否二进制或尚未完成的检测任务, 是否读取文件头判定)
+        candidates = []
+        with ThreadPoolExecutor(max_workers=self.walk_threads) if self.walk_threads > 1 else contextlib.nullcontext() as pool:
+            for entry in walker:
+                if entry.name == own_name:
+                    continue
 
-            for file in files:
-                if file == os.path.basename(__file__):
+                self.file_stats["total_files"] += 1
+
+                # 检查特殊文件名及扩展名
+                kind = FileRecord.CODES.get(entry.name)
+                if kind is None:
+                    kind = FileRecord.CODES.get(entry.ext)
+
+                # 文本类型文件需确认内容确为文本（改名的二进制文件按二进制处理）
+                is_binary = entry.ext in Config.BINARY_EXTENSIONS
+                sniffed = kind is not None or not entry.ext
+                if sniffed:
+                    verdict = None
+                    if index is not None:
+                        verdict = index.binary_verdict(entry.path, [entry.size, entry.mtime_ns, entry.inode])
+                    if verdict is not None:
+                        is_binary = verdict
+                    elif pool is not None:
+                        is_binary = pool.submit(BinaryDetector.is_binary, os.path.join(root, entry.path))
+                    else:
+                        is_binary = BinaryDetector.is_binary(os.path.join(root, entry.path))
+                elif not is_binary:
+                    self.file_stats["skipped_files"] += 1
                     continue
+                candidates.append((entry, kind, is_binary, sniffed))
 
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, self.target_dir)
-                _, ext = os.path.splitext(file)
-                ext = ext.lower()
+        for entry, kind, is_binary, sniffed in candidates:
+            if isinstance(is_binary, Future):
+                is_binary = is_binary.result()
+            if sniffed and index is not None:
+                index.record_verdict(entry.path, [entry.size, entry.mtime_ns, entry.inode], is_binary)
 
-                self.file_stats["total_files"] += 1
+            # 文件状态信息随描述一并保存，后续无需再次 stat
+            if kind is not None and not is_binary:
+                all_files.append(FileRecord(root, entry.path, kind, entry.size, entry.mtime_ns, entry.inode))
+                self._update_file_stats(FileRecord.KINDS[kind].type)
 
-                # 检查特殊文件名
-                if file in Config.FILE_TYPES:
-                    file_info = Config.FILE_TYPES[file].copy()
-                    file_info.update(
-                        {
-                            "path": rel_path,
-                            "full_path": file_path,
-                            "extension": ext,
-                            "filename": file,
-                        }
-                    )
-                    all_files.append(file_info)
-                    self._update_file_stats(file_info["type"])
-
-                # 检查扩展名
-                elif ext in Config.FILE_TYPES:
-                    file_info = Config.FILE_TYPES[ext].copy()
-                    file_info.update(
-                        {
-                            "path": rel_path,
-                            "full_path": file_path,
-                            "extension": ext,
-                            "filename": file,
-                        }
-                    )
-                    all_files.append(file_info)
-                    self._update_file_stats(file_info["type"])
-
-                # 二进制文件
-                elif ext in Config.BINARY_EXTENSIONS:
-                    file_info = {
-                        "type": "binary",
-                        "analyzer": "Binary",
-                        "color": "#FF6B6B",
-                        "path": rel_path,
-                        "full_path": file_path,
-                        "extension": ext,
-                        "filename": file,
-                        "is_binary": True,
-                    }
-                    all_files.append(file_info)
-                    self.file_stats["binary_files"] += 1
+            # 二进制文件
+            elif is_binary:
+                all_files.append(FileRecord(root, entry.path, FileRecord.BINARY, entry.size, entry.mtime_ns, entry.inode))
+                self.file_stats["binary_files"] += 1
 
-                else:
-                    self.file_stats["skipped_files"] += 1
+            else:
+                self.file_stats["skipped_files"] += 1
 
+        self.file_stats["duplicate_files"] = walker.duplicates
+        self.file_stats["ignored_entries"] = walker.ignored
         print(f"{Colors.GREEN}📊 扫描完成! 发现 {len(all_files)} 个可分析文件{Colors.ENDC}")
         return all_files
 
@@ -800,20 +2996,29 @@ class ProfessionalCodeAuditor:
         if file_type in stats_map:
             self.file_stats[stats_map[file_type]] += 1
 
-    def analyze_file(self, file_info: Dict, content: str) -> Tuple[List[str], List[str]]:
-        """分析单个文件"""
+    def analyze_file(self, file_info: FileRecord, content: str) -> Tuple[List[str], List[str], List[Tuple]]:
+        """分析单个文件，返回 (问题, 在线服务警告, 安全规则命中 [(规则编号, 命中次数, 位置), ...])"""
         issues = []
         warnings = []
+        findings = []
 
         # 基础安全检查
         if file_info.get("security_scan", True):
-            for pattern, description in Config.SECURITY_PATTERNS:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
-                    warnings.append(f"发现{description}: {len(matches)}处")
-                    self.file_stats["security_issues"] += len(matches)
+            if self.profiler is None:
+                hits = self.rule_engine.scan(content)
+            else:
+                scan_start = time.perf_counter()
+                rule_times = [0.0] * len(self.rule_engine.descriptions)
+                hits = self.rule_engine.scan(content, rule_times=rule_times)
+                self._record_rule_times(file_info, scan_start, rule_times)
+            if hits:
+                index = LineIndex(content, PrivacyProtector.secret_spans(content, hits))
+                findings = self._security_findings(hits, map(index.locate, self._hit_offsets(hits)))
+
+        # 根据模式进行额外分析（启用并发在线扫描时由 AsyncOnlineScanner 完成）
+        if self.async_online:
+            return issues, warnings, findings
 
-        # 根据模式进行额外分析
         if self.scan_mode == "online":
             # 在线漏洞库分析
             online_issues, online_warnings = OnlineServiceClient.scan_with_vuln_db(content, file_info["type"])
@@ -827,7 +3032,92 @@ class ProfessionalCodeAuditor:
             warnings.extend(ai_warnings)
             self.file_stats["ai_insights"] += len(ai_issues) + len(ai_warnings)
 
-        return issues, warnings
+        return issues, warnings, findings
+
+    @property
+    def async_online(self) -> bool:
+        """在线分析是否由异步扫描器在主进程中并发执行"""
+        return self.scan_mode in ("online", "online_ai") and self.settings["cloud_api"].get("concurrency", 0) > 0
+
+    @property
+    def analysis_version(self) -> str:
+        """分析版本：规则集版本及影响分析结果的配置，用于缓存与增量索引失效判断"""
+        relevant = [
+            self.RESULT_SCHEMA,
+            self.rule_engine.version,
+            self.settings["max_file_size_kb"],
+            self.settings.get("large_file_strategy", "mmap"),
+        ]
+        return hashlib.sha256(json.dumps(relevant).encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _hit_offsets(hits: List[Tuple[int, List[Tuple[int, int]]]]) -> List[int]:
+        """全部命中的起始偏移量（升序）"""
+        return sorted(start for _, spans in hits for start, _ in spans)
+
+    def _security_findings(self, hits: List[Tuple[int, List[Tuple[int, int]]]], positions) -> List[Tuple]:
+        """将规则命中与 _hit_offsets 顺序对应的 (行, 列, 片段) 组合为 (规则编号, 命中次数, 位置) 并计入统计
+
+        片段中各规则命中的敏感值已由 LineIndex 遮盖，再经 REDACTION_RULES 清理后保存，报告与结果文件中不出现密钥原文。
+        """
+        rule_at = sorted((start, rule_id) for rule_id, spans in hits for start, _ in spans)
+        redact = PrivacyProtector.redactor().redact
+        snippets: Dict[str, str] = {}
+        located: Dict[int, List[Tuple[int, int, str]]] = {rule_id: [] for rule_id, _ in hits}
+        for (_, rule_id), (line, column, snippet) in zip(rule_at, positions):
+            if snippet not in snippets:
+                snippets[snippet] = redact(snippet)
+            located[rule_id].append((line, column, snippets[snippet]))
+
+        findings = []
+        for rule_id, spans in hits:
+            findings.append((rule_id, len(spans), tuple(located[rule_id])))
+            self.file_stats["security_issues"] += len(spans)
+        return findings
+
+    def _record_rule_times(self, file_info: FileRecord, start: float, rule_times: List[float], **args):
+        """记录一次安全扫描区间，args 中附带各规则的确认耗时（秒）"""
+        rules = {self.rule_engine.descriptions[rule_id]: seconds for rule_id, seconds in enumerate(rule_times) if seconds > 0}
+        self.profiler.add("security_scan", "rules", start, time.perf_counter(), path=file_info["path"], rules=rules, **args)
+
+    def analyze_large_file(self, file_info: FileRecord, size: int) -> Tuple[List[str], List[str], List[Tuple]]:
+        """分析超过大小限制的文件：跳过并记录原因，或通过mmap分窗口执行本地规则扫描"""
+        issues = []
+        warnings = []
+        findings = []
+        limit_kb = self.settings["max_file_size_kb"]
+        self.file_stats["large_files"] += 1
+
+        if self.settings.get("large_file_strategy", "mmap") == "skip":
+            issues.append(f"文件过大已跳过分析 ({size // 1024}KB > {limit_kb}KB)")
+            return issues, warnings, findings
+
+        rule_times = None
+        if file_info.get("security_scan", True):
+            try:
+                with open(file_info["full_path"], "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        scan_start = time.perf_counter()
+                        rule_times = [0.0] * len(self.rule_engine.descriptions) if self.profiler is not None else None
+                        hits = self.rule_engine.scan_buffer(
+                            mm, Config.MMAP_WINDOW_SIZE, Config.MMAP_WINDOW_OVERLAP, rule_times
+                        )
+                        if hits:
+                            positions = LineIndex.locate_sorted(
+                                mm, self._hit_offsets(hits), Config.MMAP_WINDOW_SIZE, PrivacyProtector.secret_spans(mm, hits)
+                            )
+                            findings = self._security_findings(hits, positions)
+            except (OSError, ValueError):
+                # 遍历后被删除、无法读取或被截断为空（mmap 不能映射空文件）的文件只记录错误
+                issues.append("文件读取失败")
+                return issues, warnings, findings
+            if rule_times is not None:
+                self._record_rule_times(file_info, scan_start, rule_times, mmap=True)
+
+        # 大文件不发送到在线服务
+        if self.scan_mode in ("online", "online_ai"):
+            issues.append(f"文件过大，已跳过在线分析 ({size // 1024}KB > {limit_kb}KB)")
+        return issues, warnings, findings
 
     def calculate_file_score(
         self,
@@ -882,7 +3172,16 @@ class ProfessionalCodeAuditor:
             print(f"{Colors.GREEN}✅ 连接成功！{Colors.ENDC}")
 
         self.start_time = time.time()
-        files = self.scan_directory()
+        self.phase_times = {key: 0.0 for key in self.phase_times}
+        index = ScanIndex(self.index_path, self.analysis_version, self.scan_mode) if self.index_path else None
+        walk_start = time.perf_counter()
+        files = self.scan_directory(index)
+        self.phase_times["walk"] = time.perf_counter() - walk_start
+        if self.profiler is not None:
+            self.profiler.add("walk", "phase", walk_start, walk_start + self.phase_times["walk"], files=len(files))
+        self.bytes_scanned = 0
+        if self.metrics is not None:
+            self.metrics.observe_phase("walk", self.phase_times["walk"])
 
         if not files:
             print(f"{Colors.YELLOW}⚠️  未发现可分析的文件{Colors.ENDC}")
@@ -890,105 +3189,427 @@ class ProfessionalCodeAuditor:
 
         print(f"\n{Colors.BLUE}📋 开始分析 {len(files)} 个文件...{Colors.ENDC}")
 
-        for idx, file_info in enumerate(files):
-            rel_path = file_info["path"]
+        sink = JsonlResultSink(self.results_path, self.rule_engine.descriptions) if self.results_path else None
+        cache = ResultCache(self.cache_path, self.cache_max_mb) if self.cache_path else None
+        try:
+            for idx, result in enumerate(self._iter_results(files, cache, index)):
+                # 进度显示
+                progress = (idx + 1) / len(files) * 100
+                print(
+                    f"\r[{idx + 1}/{len(files)}] {progress:.1f}% - 已分析: {result['file'][:50]}...",
+                    end="",
+                )
+                self.summary.add(result)
+                if sink is not None:
+                    sink.write(result)
+                else:
+                    self.results.append(result)
+        finally:
+            if sink is not None:
+                sink.close()
+            if cache is not None:
+                self.cache_stats = {"hits": cache.hits, "misses": cache.misses}
+                cache.close()
 
-            # 进度显示
-            progress = (idx + 1) / len(files) * 100
+        self.scan_duration = time.time() - self.start_time
+        print(f"\n{Colors.GREEN}✅ 分析完成！耗时: {self.scan_duration:.2f}秒{Colors.ENDC}")
+        if cache is not None:
+            print(f"{Colors.CYAN}💾 缓存命中: {cache.hits}/{cache.hits + cache.misses}{Colors.ENDC}")
+        if index is not None:
+            self.deleted_files = index.deleted_paths(file_info["path"] for file_info in files)
+            index.save()
             print(
-                f"\r[{idx + 1}/{len(files)}] {progress:.1f}% - 分析中: {rel_path[:50]}...",
-                end="",
+                f"{Colors.CYAN}🔁 增量扫描: 复用 {index.reused} 个未变更文件, "
+                f"重新分析 {len(files) - index.reused} 个, 已删除 {len(self.deleted_files)} 个{Colors.ENDC}"
             )
 
-            # 二进制文件特殊处理
-            if file_info.get("is_binary", False):
-                issues = ["检测到二进制文件 - 建议检查是否应该包含在源码库中"]
-                warnings = []
-                score = 60
-                status = "warning"
-                output = "⚠️ 检测到二进制文件: " + ", ".join(issues)
-            else:
-                # 读取内容
+    def _iter_results(
+        self,
+        files: List[FileRecord],
+        cache: Optional[ResultCache] = None,
+        index: Optional[ScanIndex] = None,
+    ):
+        """按输入顺序产出结果
+
+        复用顺序：增量索引（仅比较文件状态签名，不读取内容） -> 内容哈希缓存 -> 重新分析。
+        需要重新分析的文件中内容相同者只分析（及在线上传）一份，结果复制到其余路径。
+        """
+        keys: List[Optional[str]] = [None] * len(files)
+        hashes: List[Optional[str]] = [None] * len(files)
+        signatures: List[Optional[List[int]]] = [None] * len(files)
+        entries: List[Optional[Dict]] = [None] * len(files)
+        pending = []
+
+        lookup_start = time.perf_counter()
+        for idx, file_info in enumerate(files):
+            if not file_info.get("is_binary", False):
+                if index is not None:
+                    signatures[idx] = ScanIndex.signature(file_info)
+                    entries[idx] = index.lookup(file_info, signatures[idx])
+                if entries[idx] is None and cache is not None:
+                    hashes[idx] = PrivacyProtector.create_file_hash(file_info["full_path"])
+                    keys[idx] = ResultCache.make_key(hashes[idx], self.analysis_version, self.scan_mode, file_info)
+                    entries[idx] = cache.get(keys[idx])
+                    if self.metrics is not None:
+                        self.metrics.observe_cache(entries[idx] is not None)
+            if entries[idx] is None:
+                pending.append(idx)
+        duplicate_of = self._identical_files(files, pending, hashes, self.settings["max_file_size_kb"] * 1024)
+        # 代表文件序号 -> 其 (结果, 统计增量)，分析完成后填入
+        shared: Dict[int, Optional[Tuple[AuditResult, Dict[str, int]]]] = dict.fromkeys(duplicate_of.values())
+        reused = len(files) - len(pending)
+        pending = [files[idx] for idx in pending if idx not in duplicate_of]
+        # 状态签名与内容哈希的计算计入读取阶段
+        lookup_end = time.perf_counter()
+        self.phase_times["read"] += lookup_end - lookup_start
+        if self.profiler is not None and (index is not None or cache is not None or duplicate_of):
+            self.profiler.add("lookup", "phase", lookup_start, lookup_end, reused=reused, identical=len(duplicate_of))
+
+        if self.timeout_seconds > 0 and pending and (self.workers > 1 or self.settings.get("strict_timeout")):
+            fresh = self._iter_watchdog_results(pending)
+        elif self.workers > 1 and len(pending) > 1:
+            fresh = self._iter_parallel_results(pending)
+        else:
+            fresh = (self._process_file_with_stats(file_info) for file_info in pending)
+        if self.async_online and pending:
+            fresh = self._iter_online_results(pending, fresh)
+
+        try:
+            for idx, file_info in enumerate(files):
+                entry = entries[idx]
+                if entry is not None:
+                    for key, value in entry["stats"].items():
+                        self.file_stats[key] += value
+                    result = self._make_result(
+                        file_info,
+                        entry["issues"],
+                        entry["warnings"],
+                        entry["score"],
+                        entry["status"],
+                        [(rule_id, count, tuple(map(tuple, positions))) for rule_id, count, positions in entry["findings"]],
+                    )
+                    if self.metrics is not None:
+                        self.metrics.observe_result(file_info, result, {}, analyzed=False)
+                else:
+                    if idx in duplicate_of:
+                        # 内容相同的文件复用代表文件的结果，统计增量同样计入
+                        source, stats = shared[duplicate_of[idx]]
+                        result = self._make_result(
+                            file_info, source.issues, source.warnings, source.score, source.status, source.findings
+                        )
+                        timings = {}
+                        for key, value in stats.items():
+                            self.file_stats[key] += value
+                        self.file_stats["identical_files"] += 1
+                    else:
+                        result, stats, timings = next(fresh)
+                        if idx in shared:
+                            shared[idx] = (result, stats)
+                    entry = {
+                        "issues": result["issues"],
+                        "warnings": result["warnings"],
+                        "score": result["score"],
+                        "status": result["status"],
+                        "findings": result["findings"],
+                        "stats": stats,
+                    }
+                    analyzed = idx not in duplicate_of
+                    if analyzed:
+                        self.bytes_scanned += file_info.get("size") or 0
+                    if self.metrics is not None:
+                        self.metrics.observe_result(file_info, result, timings, analyzed=analyzed)
+                    # 超时及在线分析回退的结果不缓存，下次运行重新尝试
+                    if result["status"] == "timeout" or stats.get("online_fallbacks"):
+                        yield result
+                        continue
+                    # 内容相同的文件缓存键与代表文件相同，已由代表文件写入
+                    if keys[idx] is not None and idx not in duplicate_of:
+                        cache.put(keys[idx], entry)
+
+                if signatures[idx] is not None:
+                    index.record(file_info, signatures[idx], entry)
+                yield result
+        finally:
+            fresh.close()
+
+    def _iter_online_results(self, files: List[FileRecord], local_results):
+        """为本地分析结果补充并发在线分析，按输入顺序产出 (结果, 统计增量, 阶段耗时)
+
+        本地分析结果产出后立即提交在线请求，未完成的文件数不超过 scanner.max_in_flight，
+        等待最早的请求期间后续文件的本地分析继续进行。
+        """
+        cloud_api = self.settings["cloud_api"]
+        scanner = AsyncOnlineScanner(
+            self.scan_mode,
+            self.ai_api_key,
+            url=cloud_api.get("url", ""),
+            concurrency=cloud_api.get("concurrency", 16),
+            timeout=cloud_api.get("timeout_seconds", 10),
+            batch_max_bytes=cloud_api.get("batch_max_kb", 0) * 1024,
+            batch_max_files=cloud_api.get("batch_max_files", 64),
+            compress=cloud_api.get("gzip", True),
+            retry_times=cloud_api.get("retry_times", 3),
+            metrics=self.metrics,
+            profiler=self.profiler,
+        )
+        limit = scanner.max_in_flight
+        in_flight = collections.deque()
+        try:
+            for file_info, (result, stats, timings) in zip(files, local_results):
+                future = None
+                if self._needs_online(file_info, result):
+                    # 隐私保护：发送到服务器的内容均经过清理；分块读取清理，不保留完整原文
+                    try:
+                        content = "".join(PrivacyProtector.sanitize_file(file_info["full_path"]))
+                    except OSError:
+                        content = None
+                    if content is not None:
+                        future = scanner.submit(content, file_info["type"])
+                in_flight.append((file_info, result, stats, timings, future))
+                while len(in_flight) >= limit:
+                    yield self._merge_online(*in_flight.popleft())
+            while in_flight:
+                yield self._merge_online(*in_flight.popleft())
+        finally:
+            for *_, future in in_flight:
+                if future is not None:
+                    future.cancel()
+            scanner.close()
+            local_results.close()
+
+    def _needs_online(self, file_info: FileRecord, result: AuditResult) -> bool:
+        """本地分析正常完成且未超过大小限制的文本文件才进行在线分析"""
+        if file_info.get("is_binary", False) or result["status"] in ("timeout", "skipped"):
+            return False
+        size = file_info.get("size")
+        return size is None or size <= self.settings["max_file_size_kb"] * 1024
+
+    def _merge_online(self, file_info: FileRecord, result: AuditResult, stats: Dict, timings: Dict, future):
+        """等待在线分析结果并合并到本地结果中，重新计算评分；在线分析失败时回退为本地结果"""
+        if future is None:
+            return result, stats, timings
+
+        wait_start = time.perf_counter()
+        online = future.result()
+        # 等待网络的时间计入分析阶段
+        waited = time.perf_counter() - wait_start
+        self.phase_times["analyze"] += waited
+        if self.profiler is not None:
+            self.profiler.add("online_wait", "online", wait_start, wait_start + waited, path=file_info["path"])
+        timings = dict(timings)
+        timings["analyze"] = timings.get("analyze", 0.0) + waited
+
+        # 在线服务不可用：保留仅含离线规则的结果
+        if online is None:
+            stats = dict(stats)
+            stats["online_fallbacks"] = stats.get("online_fallbacks", 0) + 1
+            self.file_stats["online_fallbacks"] += 1
+            return result, stats, timings
+
+        issues, warnings = online
+
+        if self.scan_mode == "online_ai" and (issues or warnings):
+            stats = dict(stats)
+            stats["ai_insights"] = stats.get("ai_insights", 0) + len(issues) + len(warnings)
+            self.file_stats["ai_insights"] += len(issues) + len(warnings)
+
+        all_issues = list(result["issues"]) + issues
+        all_warnings = list(result["warnings"]) + warnings
+        score = self.calculate_file_score(file_info["type"], len(all_issues), len(result["findings"]) + len(all_warnings))
+        status = "pass" if score >= 75 else "warning" if score >= 60 else "fail"
+        result = self._make_result(file_info, all_issues, all_warnings, score, status, result["findings"])
+        return result, stats, timings
+
+    def _process_file(self, file_info: FileRecord) -> AuditResult:
+        """读取并分析单个文件，返回结果记录"""
+        file_start = time.perf_counter()
+        # 二进制文件特殊处理
+        if file_info.get("is_binary", False):
+            issues = ["检测到二进制文件 - 建议检查是否应该包含在源码库中"]
+            warnings = []
+            findings = []
+            score = 60
+            status = "warning"
+        else:
+            # 读取内容
+            read_start = time.perf_counter()
+            size = file_info.get("size")
+            if size is None:
+                try:
+                    size = os.path.getsize(file_info["full_path"])
+                except OSError:
+                    size = 0
+            large_file = size > self.settings["max_file_size_kb"] * 1024
+            content = None
+            if not large_file:
                 try:
                     with open(file_info["full_path"], "r", encoding="utf - 8", errors="ignore") as f:
                         content = f.read()
                 except Exception:
-                    content = ""
-                    issues = ["文件读取失败"]
-                    warnings = []
-
-                # 分析文件
-                issues, warnings = self.analyze_file(file_info, content)
-                score = self.calculate_file_score(file_info["type"], len(issues), len(warnings))
-                status = "pass" if score >= 75 else "warning" if score >= 60 else "fail"
-                output = self._format_output(issues, warnings)
-
-            # 保存结果
-            result = {
-                "file": rel_path,
-                "type": file_info["type"],
-                "analyzer": file_info.get("analyzer", "Unknown"),
-                "status": status,
-                "score": score,
-                "issues": issues,
-                "warnings": warnings,
-                "mode": self.scan_mode,
-                "timestamp": datetime.datetime.now().isoformat(),
-                "output": output,
-                "binary_warning": file_info.get("is_binary", False),
-            }
-            self.results.append(result)
-
-            # 短暂延迟
-            time.sleep(0.01)
-
-        self.scan_duration = time.time() - self.start_time
-        print(f"\n{Colors.GREEN}✅ 分析完成！耗时: {self.scan_duration:.2f}秒{Colors.ENDC}")
-
-    def _format_output(self, issues: List[str], warnings: List[str]) -> str:
-        """格式化输出"""
-        parts = []
-
-        if warnings:
-            parts.append(f"🔐 安全警告: {', '.join(warnings)}")
-
-        if issues:
-            parts.append(f"📝 发现: {', '.join(issues[:2])}")
+                    pass
+            analyze_start = time.perf_counter()
+            self.phase_times["read"] += analyze_start - read_start
+
+            # 分析文件
+            if not large_file and content is None:
+                issues, warnings, findings = ["文件读取失败"], [], []
+            elif large_file:
+                issues, warnings, findings = self.analyze_large_file(file_info, size)
+            else:
+                issues, warnings, findings = self.analyze_file(file_info, content)
+            score = self.calculate_file_score(file_info["type"], len(issues), len(findings) + len(warnings))
+            status = "pass" if score >= 75 else "warning" if score >= 60 else "fail"
+            if large_file and self.settings.get("large_file_strategy", "mmap") == "skip":
+                status = "skipped"
+            analyze_end = time.perf_counter()
+            self.phase_times["analyze"] += analyze_end - analyze_start
+            if self.profiler is not None:
+                self.profiler.add("read", "phase", read_start, analyze_start, path=file_info["path"], size=size)
+                self.profiler.add("analyze", "phase", analyze_start, analyze_end, path=file_info["path"])
+
+        if self.profiler is not None:
+            self.profiler.add("file", "file", file_start, time.perf_counter(), path=file_info["path"], status=status)
+        return self._make_result(file_info, issues, warnings, score, status, findings)
+
+    def _process_file_with_stats(self, file_info: FileRecord) -> Tuple[AuditResult, Dict[str, int], Dict[str, float]]:
+        """分析单个文件，同时返回本次分析带来的统计增量及阶段耗时（均已计入自身统计）"""
+        before = dict(self.file_stats)
+        times_before = dict(self.phase_times)
+        result = self._process_file(file_info)
+        if self.profiler is not None:
+            # 逐文件落盘，子进程被终止时不丢失已完成文件的记录
+            self.profiler.flush()
+        stats = {key: value - before[key] for key, value in self.file_stats.items() if value != before[key]}
+        timings = {key: value - times_before[key] for key, value in self.phase_times.items() if value != times_before[key]}
+        return result, stats, timings
+
+    def _make_result(
+        self,
+        file_info: FileRecord,
+        issues: List[str],
+        warnings: List[str],
+        score: int,
+        status: str,
+        findings: Optional[List[Tuple]] = None,
+    ) -> AuditResult:
+        """组装结果记录；findings 为安全规则命中 [(规则编号, 命中次数, ((行, 列, 片段), ...)), ...]"""
+        return AuditResult(
+            file_info.path,
+            file_info.kind,
+            status,
+            score,
+            issues,
+            warnings,
+            findings or (),
+            self.scan_mode,
+            time.time(),
+        )
 
-        if not parts:
-            parts.append("✅ 检查通过，未发现问题")
+    def _worker_settings(self) -> Dict:
+        """子进程分析器所需的配置"""
+        return {
+            "scan_mode": self.scan_mode,
+            "ai_api_key": self.ai_api_key,
+            "settings": self.settings,
+            # 子进程使用新的剖析器实例，fork 时不会带上主进程尚未落盘的区间
+            "profiler": PhaseProfiler(self.profiler.trace_dir) if self.profiler is not None else None,
+        }
 
-        return " | ".join(parts)
+    @staticmethod
+    def _identical_files(
+        files: List[FileRecord], pending: List[int], hashes: List[Optional[str]], size_limit: Optional[int] = None
+    ) -> Dict[int, int]:
+        """找出待分析文件中内容相同者，返回 {文件序号: 代表文件序号}，代表为同组中的首个文件
+
+        先按 (大小, 类型, 是否安全扫描) 分组，组内多于一个文件时才计算内容哈希（已为缓存计算的直接复用）；
+        分组条件与缓存键一致，保证组内文件的分析结果相同。
+        超过 size_limit 字节的文件（按大文件分窗口扫描）不参与去重，避免为其额外读取一遍全部内容。
+        """
+        groups: Dict[Tuple, List[int]] = {}
+        for idx in pending:
+            file_info = files[idx]
+            size = file_info.get("size")
+            if file_info.get("is_binary", False) or size is None or (size_limit is not None and size > size_limit):
+                continue
+            groups.setdefault((file_info["size"], file_info["type"], file_info.get("security_scan", True)), []).append(idx)
+
+        duplicate_of: Dict[int, int] = {}
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            first: Dict[str, int] = {}
+            for idx in group:
+                if hashes[idx] is None:
+                    hashes[idx] = PrivacyProtector.create_file_hash(files[idx]["full_path"])
+                representative = first.setdefault(hashes[idx], idx)
+                if representative != idx:
+                    duplicate_of[idx] = representative
+        return duplicate_of
+
+    def _iter_parallel_results(self, files: List[FileRecord]):
+        """使用进程池并行分析，按输入顺序产出 (结果, 统计增量, 阶段耗时) 并合并统计"""
+        # 每个任务批量处理多个文件，减少进程间通信开销
+        chunksize = max(1, min(64, len(files) // (self.workers * 4)))
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._worker_settings(),),
+        ) as executor:
+            for result, stats, timings in executor.map(_analyze_in_worker, files, chunksize=chunksize):
+                for key, value in stats.items():
+                    self.file_stats[key] += value
+                for key, value in timings.items():
+                    self.phase_times[key] += value
+                yield result, stats, timings
+
+    def _iter_watchdog_results(self, files: List[FileRecord]):
+        """使用带单文件时间预算的进程池分析，超时文件记录为超时结果"""
+        pool = WatchdogPool(self.workers, self._worker_settings(), self.timeout_seconds)
+        for file_info, payload, failure, elapsed in pool.imap(files):
+            if payload is not None:
+                result, stats, timings = payload
+            else:
+                if failure == "timeout":
+                    issues = [f"分析超时 (>{self.timeout_seconds:g}秒)，已放弃该文件"]
+                else:
+                    issues = ["分析进程异常退出，已放弃该文件"]
+                score = self.calculate_file_score(file_info["type"], len(issues), 0)
+                result = self._make_result(file_info, issues, [], score, "timeout")
+                stats = {"timed_out_files": 1}
+                timings = {"analyze": elapsed}
+                if self.profiler is not None:
+                    # 被终止的子进程无法记录该文件，由主进程按已用时间补记
+                    end = time.perf_counter()
+                    self.profiler.add("file", "file", end - elapsed, end, path=file_info["path"], status=failure)
+            for key, value in stats.items():
+                self.file_stats[key] += value
+            for key, value in timings.items():
+                self.phase_times[key] += value
+            yield result, stats, timings
+
+    def iter_results(self):
+        """遍历分析结果（原结果字典格式）；内存中的结果在此时才渲染警告文本与发现位置，
+        流式输出模式下从JSONL文件读回"""
+        if self.results_path:
+            yield from JsonlResultSink.read(self.results_path)
+        else:
+            rules = self.rule_engine.descriptions
+            for result in self.results:
+                yield result.to_dict(rules)
 
     def generate_html_report(self):
         """生成HTML报告"""
-        if not self.results:
+        if not self.summary.total:
             print(f"{Colors.YELLOW}⚠️  没有分析结果{Colors.ENDC}")
             return
 
         # 计算统计
-        scores = [r["score"] for r in self.results]
-        avg_score = int(sum(scores) / len(scores)) if scores else 0
+        avg_score = int(self.summary.avg_score)
         project_rank, rank_description, rank_color = self.get_rank_info(avg_score)
 
-        security_count = sum(len(r["warnings"]) for r in self.results)
-        quality_count = sum(len(r["issues"]) for r in self.results)
-
-        # 生成表格行
-        rows = ""
-        for result in self.results:
-            rank, _, color = self.get_rank_info(result["score"])
-
-            rows += """
-            <tr class="{row_class}">
-                <td><span class="file - type" style="background:{type_color}20; color:{type_color}">
-                    {result['type'].upper()}</span></td>
-                <td align="center"><div class="score - badge" style="background:{color}">
-                    {rank} ({result['score']})</div></td>
-                <td><code>{html.escape(result['file'])}</code></td>
-                <td>{html.escape(result.get('output', ''))}</td>
-            </tr>
-            """
+        security_count = self.summary.security_count
+        quality_count = self.summary.quality_count
 
         # 模式描述
         mode_descriptions = {
@@ -997,32 +3618,75 @@ class ProfessionalCodeAuditor:
             "online_ai": "AI智能分析 + 隐私保护",
         }
 
-        # 生成HTML
+        report_start = time.perf_counter()
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        html_content = self._create_html_template(
-            timestamp,
-            avg_score,
-            project_rank,
-            rank_color,
-            rank_description,
-            security_count,
-            quality_count,
-            self.file_stats["ai_insights"],
-            mode_descriptions.get(self.scan_mode, self.scan_mode),
-            rows,
-        )
-
-        # 保存文件
         timestamp_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_file = os.path.join(os.getcwd(), f"Code_Audit_Report_{timestamp_str}.html")
+        self.output_file = os.path.join(self.output_dir or os.getcwd(), f"Code_Audit_Report_{timestamp_str}.html")
 
+        # 流式写入：页头 -> 逐行写入表格 -> 页脚，内存占用与结果数量无关
         with open(self.output_file, "w", encoding="utf - 8") as f:
-            f.write(html_content)
+            f.write(
+                self._html_header(
+                    timestamp,
+                    avg_score,
+                    project_rank,
+                    rank_color,
+                    rank_description,
+                    security_count,
+                    quality_count,
+                    self.file_stats["ai_insights"],
+                    mode_descriptions.get(self.scan_mode, self.scan_mode),
+                )
+            )
+            f.writelines(self._iter_html_rows())
+            f.write(self._html_footer(avg_score, security_count))
+        report_time = time.perf_counter() - report_start
+        self.phase_times["report"] += report_time
+        if self.profiler is not None:
+            self.profiler.add("report", "phase", report_start, report_start + report_time, rows=self.summary.total)
+        if self.metrics is not None:
+            self.metrics.observe_phase("report", report_time)
 
         print(f"\n{Colors.GREEN}📄 HTML报告已生成: {self.output_file}{Colors.ENDC}")
         return self.output_file
 
-    def _create_html_template(
+    # HTML报告中每个文件最多列出的发现位置数（完整列表见 JSONL 结果）
+    REPORT_MAX_LOCATIONS = 20
+
+    def _iter_html_rows(self):
+        """逐条生成表格行"""
+        rank_cache: Dict[int, Tuple[str, str, str]] = {}
+        escape = html.escape
+        max_locations = self.REPORT_MAX_LOCATIONS
+
+        for result in self.iter_results():
+            score = result["score"]
+            if score not in rank_cache:
+                rank_cache[score] = self.get_rank_info(score)
+            rank, _, color = rank_cache[score]
+            type_color = Config.REPORT_TYPE_COLORS.get(result["type"], "#7f8c8d")
+            row_class = "binary - row" if result.get("binary_warning") else ""
+            locations = result.get("locations") or []
+            details = "".join(
+                f'<div class="location">L{loc["line"]}:{loc["column"]} {escape(loc["rule"])} '
+                f'<code>{escape(loc["snippet"])}</code></div>'
+                for loc in locations[:max_locations]
+            )
+            if len(locations) > max_locations:
+                details += f'<div class="location">…另有 {len(locations) - max_locations} 处</div>'
+
+            yield f"""
+            <tr class="{row_class}">
+                <td><span class="file - type" style="background:{type_color}20; color:{type_color}">
+                    {result['type'].upper()}</span></td>
+                <td align="center"><div class="score - badge" style="background:{color}">
+                    {rank} ({score})</div></td>
+                <td><code>{escape(result['file'])}</code></td>
+                <td>{escape(result.get('output', ''))}{details}</td>
+            </tr>
+            """
+
+    def _html_header(
         self,
         timestamp,
         avg_score,
@@ -1033,10 +3697,9 @@ class ProfessionalCodeAuditor:
         quality_count,
         ai_insights,
         mode_description,
-        rows,
     ):
-        """创建HTML模板"""
-        return """<!DOCTYPE html>
+        """HTML报告页头（至表格主体开始）"""
+        return f"""<!DOCTYPE html>
 <html lang="zh - CN">
 <head>
     <meta charset="UTF - 8">
@@ -1142,6 +3805,12 @@ class ProfessionalCodeAuditor:
             text - align: center;
         }}
 
+        .location {{
+            font - size: 0.85em;
+            color: #7f8c8d;
+            margin - top: 4px;
+        }}
+
         .privacy - note {{
             background: #e8f4fc;
             padding: 15px;
@@ -1208,8 +3877,11 @@ class ProfessionalCodeAuditor:
                 </tr>
             </thead>
             <tbody>
-                {rows}
-            </tbody>
+"""
+
+    def _html_footer(self, avg_score, security_count):
+        """HTML报告页尾（表格主体结束之后）"""
+        return f"""            </tbody>
         </table>
 
         <div style="margin - top: 30px; padding: 15px; background: #f8f9fa; border - radius: 8px; font - size: 0.9em; color: #7f8c8d;">
@@ -1249,33 +3921,325 @@ class ProfessionalCodeAuditor:
 
     def show_summary(self):
         """显示总结"""
-        if not self.results:
+        if not self.summary.total:
             return
 
         print(f"\n{Colors.CYAN}{'=' * 60}{Colors.ENDC}")
         print(f"{Colors.BOLD}📊 分析总结{Colors.ENDC}")
         print(f"{Colors.CYAN}{'=' * 60}{Colors.ENDC}")
 
-        scores = [r["score"] for r in self.results]
-        avg_score = sum(scores) / len(scores) if scores else 0
-
-        print(f"📈 平均分数: {avg_score:.1f}")
-        print(f"📋 文件总数: {len(self.results)}")
+        print(f"📈 平均分数: {self.summary.avg_score:.1f}")
+        print(f"📋 文件总数: {self.summary.total}")
         print(f"🔐 安全问题: {self.file_stats['security_issues']}个")
         print(f"⚙️  质量建议: {self.file_stats['quality_issues']}个")
         if self.scan_mode == "online_ai":
             print(f"🤖 AI建议: {self.file_stats['ai_insights']}个")
         print(f"⏱️  分析耗时: {self.scan_duration:.2f}秒")
+        if self.deleted_files:
+            print(f"🗑️  自上次扫描后删除: {len(self.deleted_files)}个文件")
+        if self.file_stats["ignored_entries"]:
+            print(f"🙈 忽略规则排除: {self.file_stats['ignored_entries']}个文件/目录")
+        if self.file_stats["identical_files"]:
+            print(f"♻️  内容相同: {self.file_stats['identical_files']}个文件复用已分析的结果")
 
         # 二进制文件警告
-        binary_files = [r for r in self.results if r.get("binary_warning")]
-        if binary_files:
-            print(f"\n{Colors.RED}⚠️  发现 {len(binary_files)} 个二进制文件{Colors.ENDC}")
+        if self.file_stats["timed_out_files"]:
+            print(f"{Colors.RED}⏰ 分析超时: {self.file_stats['timed_out_files']}个文件{Colors.ENDC}")
+        if self.file_stats["online_fallbacks"]:
+            print(f"{Colors.YELLOW}🔌 在线服务不可用: {self.file_stats['online_fallbacks']}个文件仅使用离线规则{Colors.ENDC}")
+        if self.summary.binary_count:
+            print(f"\n{Colors.RED}⚠️  发现 {self.summary.binary_count} 个二进制文件{Colors.ENDC}")
+
+
+# ==================== 并行分析 ====================
+_worker_auditor: Optional[ProfessionalCodeAuditor] = None
+
+
+def _init_worker(settings: Dict):
+    """进程池初始化：每个子进程创建一个分析器实例"""
+    global _worker_auditor
+    _worker_auditor = ProfessionalCodeAuditor()
+    for key, value in settings.items():
+        setattr(_worker_auditor, key, value)
+
+
+def _analyze_in_worker(file_info: FileRecord) -> Tuple[AuditResult, Dict[str, int], Dict[str, float]]:
+    """在子进程中分析单个文件，返回结果、统计增量及阶段耗时"""
+    return _worker_auditor._process_file_with_stats(file_info)
+
+
+def _watchdog_worker(settings: Dict, conn):
+    """WatchdogPool 子进程：接收一批文件，每分析完一个立即回传结果"""
+    _init_worker(settings)
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            break
+        for idx, file_info in batch:
+            conn.send((idx, _analyze_in_worker(file_info)))
+
+
+class WatchdogPool:
+    """带单文件时间预算的进程池
+
+    正则匹配在C代码中执行，无法在进程内中断；超时的子进程会被直接终止并重建，
+    其余子进程不受影响。每个子进程使用独立管道，终止时不会破坏其他进程的通信。
+    文件按小批量分发以减少管道往返；子进程逐个回传结果，主进程据此计算当前文件的起始时间，
+    时间预算仍按单个文件计算。子进程被终止时，批次中尚未分析的文件重新排到队首。
+    """
+
+    # 单批最多分发的文件数
+    BATCH_MAX_FILES = 16
+
+    def __init__(self, workers: int, settings: Dict, timeout: float):
+        self.workers = max(1, workers)
+        self.settings = settings
+        self.timeout = timeout
+        self.ctx = multiprocessing.get_context()
+
+    def _spawn(self) -> Dict:
+        """启动一个子进程"""
+        parent_conn, child_conn = self.ctx.Pipe()
+        process = self.ctx.Process(target=_watchdog_worker, args=(self.settings, child_conn), daemon=True)
+        process.start()
+        child_conn.close()
+        return {"process": process, "conn": parent_conn, "batch": collections.deque(), "started": 0.0}
+
+    @staticmethod
+    def _kill(worker: Dict):
+        """终止子进程"""
+        worker["process"].terminate()
+        worker["process"].join(1)
+        if worker["process"].is_alive():
+            worker["process"].kill()
+            worker["process"].join()
+        worker["conn"].close()
+
+    def imap(self, files: List[FileRecord]):
+        """按输入顺序产出 (文件信息, 结果或None, 失败原因, 耗时)"""
+        queue = collections.deque(enumerate(files))
+        finished: Dict[int, Tuple] = {}
+        next_idx = 0
+        workers = [self._spawn() for _ in range(min(self.workers, len(files)))]
+        batch_size = max(1, min(self.BATCH_MAX_FILES, len(files) // (len(workers) * 4)))
+
+        def dispatch(worker: Dict):
+            if queue:
+                batch = [queue.popleft() for _ in range(min(batch_size, len(queue)))]
+                worker["conn"].send(batch)
+                worker["batch"].extend(batch)
+                worker["started"] = time.monotonic()
+
+        def replace(worker: Dict, failure: str):
+            idx, file_info = worker["batch"].popleft()
+            finished[idx] = (file_info, None, failure, time.monotonic() - worker["started"])
+            # 批次中其余文件按原顺序重新排到队首
+            queue.extendleft(reversed(worker["batch"]))
+            self._kill(worker)
+            workers[workers.index(worker)] = self._spawn()
+
+        try:
+            while next_idx < len(files):
+                for worker in workers:
+                    if not worker["batch"]:
+                        dispatch(worker)
+
+                while next_idx in finished:
+                    yield finished.pop(next_idx)
+                    next_idx += 1
+                if next_idx >= len(files):
+                    break
+
+                busy = [worker for worker in workers if worker["batch"]]
+                wait_time = None
+                if self.timeout > 0:
+                    deadline = min(worker["started"] for worker in busy) + self.timeout
+                    wait_time = max(0.0, deadline - time.monotonic())
+
+                ready = multiprocessing.connection.wait([worker["conn"] for worker in busy], wait_time)
+                for worker in busy:
+                    if worker["conn"] not in ready:
+                        continue
+                    try:
+                        # 取完管道中已到达的全部结果
+                        while worker["batch"] and worker["conn"].poll():
+                            idx, payload = worker["conn"].recv()
+                            _, file_info = worker["batch"].popleft()
+                            now = time.monotonic()
+                            finished[idx] = (file_info, payload, None, now - worker["started"])
+                            # 子进程随即开始分析批次中的下一个文件
+                            worker["started"] = now
+                    except (EOFError, OSError):
+                        # 子进程异常退出
+                        replace(worker, "crashed")
+
+                if self.timeout > 0:
+                    now = time.monotonic()
+                    for worker in list(workers):
+                        if worker["batch"] and now - worker["started"] > self.timeout:
+                            replace(worker, "timeout")
+        finally:
+            for worker in workers:
+                try:
+                    worker["conn"].send(None)
+                except OSError:
+                    pass
+            for worker in workers:
+                worker["process"].join(1)
+                if worker["process"].is_alive():
+                    self._kill(worker)
+
+
+# ==================== 命令行批处理 ====================
+def build_arg_parser() -> argparse.ArgumentParser:
+    """命令行参数定义"""
+    parser = argparse.ArgumentParser(
+        prog="codeauditor",
+        description="专业代码审计工具 v2.0 - 无交互批处理模式（不带参数运行时进入交互模式）",
+    )
+    parser.add_argument("target", help="要分析的目录")
+    parser.add_argument(
+        "--mode",
+        choices=["offline", "online", "online_ai"],
+        default="offline",
+        help="分析模式 (默认: offline)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="并行进程数，0表示使用全部CPU核心 (默认: 1)")
+    parser.add_argument("--timeout", type=float, help="单文件分析时间预算（秒），覆盖配置文件，单进程时同样在子进程中强制执行")
+    parser.add_argument("--walk-threads", type=int, default=1, help="目录遍历线程数 (默认: 1)")
+    parser.add_argument(
+        "--metrics-port", type=int, default=0, help="运行期间在该端口提供 Prometheus /metrics 端点（需要 prometheus-client）"
+    )
+    parser.add_argument("--metrics-addr", default="0.0.0.0", help="/metrics 端点监听地址 (默认: 0.0.0.0)")
+    parser.add_argument("--textfile", help="结束时以 node_exporter textfile 格式写入汇总指标的 .prom 文件路径")
+    parser.add_argument("--profile", help="记录各阶段耗时并导出 Chrome trace JSON（chrome://tracing / Perfetto）到该路径")
+    parser.add_argument("--profile-top", type=int, default=10, help="性能剖析排行显示的最慢文件/规则数 (默认: 10)")
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        action="append",
+        choices=["html", "jsonl"],
+        help="输出格式，可重复指定 (默认: html)",
+    )
+    parser.add_argument("--output-dir", default=".", help="报告输出目录 (默认: 当前目录)")
+    parser.add_argument("--cache", help="结果缓存文件路径（SQLite），不指定则不启用缓存")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=ResultCache.DEFAULT_MAX_SIZE_MB,
+        help=f"结果缓存容量上限 (默认: {ResultCache.DEFAULT_MAX_SIZE_MB}MB)",
+    )
+    parser.add_argument("--index", help="增量扫描索引文件路径，不指定则全量分析")
+    parser.add_argument("--config", help="配置文件路径 (默认: 当前目录或程序目录下的 config.yaml)")
+    parser.add_argument("--summary", default="-", help="JSON摘要输出路径，'-' 表示标准输出 (默认: -)")
+    parser.add_argument("--quiet", action="store_true", help="不输出进度信息")
+    return parser
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """无交互批处理：进度信息输出到标准错误，标准输出仅包含JSON摘要"""
+    if not os.path.isdir(args.target):
+        print(f"{Colors.RED}❌ 目录不存在: {args.target}{Colors.ENDC}", file=sys.stderr)
+        return 2
+
+    formats = args.formats or ["html"]
+    output_dir = os.path.abspath(args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_path = os.path.join(output_dir, f"Code_Audit_Results_{timestamp_str}.jsonl") if "jsonl" in formats else None
+
+    metrics = None
+    if args.metrics_port:
+        if prometheus_client is None:
+            print(f"{Colors.YELLOW}⚠️  未安装 prometheus-client，不提供 /metrics 端点{Colors.ENDC}", file=sys.stderr)
+        else:
+            metrics = AuditMetrics()
+            metrics.serve(args.metrics_port, args.metrics_addr)
+
+    profiler = PhaseProfiler(tempfile.mkdtemp(prefix="codeauditor-trace-")) if args.profile else None
+    settings = Config.load_settings(args.config)
+    if args.timeout is not None:
+        settings["timeout_seconds"] = args.timeout
+        settings["strict_timeout"] = True
+
+    auditor = ProfessionalCodeAuditor(
+        workers=args.workers,
+        cache_path=args.cache,
+        cache_max_mb=args.cache_max_mb,
+        index_path=args.index,
+        results_path=results_path,
+        output_dir=output_dir,
+        settings=settings,
+        walk_threads=args.walk_threads,
+        metrics=metrics,
+        profiler=profiler,
+    )
+    auditor.target_dir = os.path.abspath(args.target)
+    auditor.scan_mode = args.mode
+    if args.mode == "online_ai" and os.environ.get("AI_API_KEY"):
+        auditor.ai_api_key = PrivacyProtector.encrypt_api_key(os.environ["AI_API_KEY"])
+
+    progress_stream = open(os.devnull, "w") if args.quiet else sys.stderr
+    total_start = time.perf_counter()
+    report_file = None
+    profile = None
+    try:
+        with contextlib.redirect_stdout(progress_stream):
+            auditor.run_analysis()
+            if auditor.summary.total and "html" in formats:
+                report_file = auditor.generate_html_report()
+            if profiler is not None:
+                events = profiler.collect()
+                PhaseProfiler.export_chrome_trace(events, args.profile)
+                profile = dict(trace=os.path.abspath(args.profile), **PhaseProfiler.top_tables(events, args.profile_top))
+                PhaseProfiler.print_tables(profile)
+                print(f"\n{Colors.GREEN}⏱️  性能剖析时间线已导出: {profile['trace']}{Colors.ENDC}")
+    finally:
+        if args.quiet:
+            progress_stream.close()
+        if profiler is not None:
+            shutil.rmtree(profiler.trace_dir, ignore_errors=True)
+
+    summary = {
+        "target": auditor.target_dir,
+        "mode": auditor.scan_mode,
+        "workers": auditor.workers,
+        "files": auditor.summary.total,
+        "bytes": auditor.bytes_scanned,
+        "file_stats": auditor.file_stats,
+        "avg_score": round(auditor.summary.avg_score, 2),
+        "security_findings": auditor.summary.security_count,
+        "quality_findings": auditor.summary.quality_count,
+        "deleted_files": len(auditor.deleted_files),
+        "cache": auditor.cache_stats,
+        "timings": dict(
+            {key: round(value, 6) for key, value in auditor.phase_times.items()},
+            total=round(time.perf_counter() - total_start, 6),
+        ),
+        "peak_rss_bytes": AuditMetrics.peak_rss(),
+        "outputs": {"html": report_file, "jsonl": results_path},
+    }
+    if profile is not None:
+        summary["profile"] = profile
+    if args.textfile:
+        AuditMetrics.write_textfile(args.textfile, summary)
+
+    summary_json = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.summary == "-":
+        print(summary_json)
+    else:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(summary_json + "\n")
+    return 0
 
 
 # ==================== 主程序 ====================
-def main():
-    """主程序"""
+def main(argv: Optional[List[str]] = None):
+    """主程序：带参数时进入批处理模式，否则进入交互模式"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run_batch(build_arg_parser().parse_args(argv)))
+
     auditor = ProfessionalCodeAuditor()
 
     try:
@@ -1287,7 +4251,7 @@ def main():
 
         auditor.run_analysis()
 
-        if auditor.results:
+        if auditor.summary.total:
             report_file = auditor.generate_html_report()
             auditor.show_summary()
 
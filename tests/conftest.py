@@ -0,0 +1,129 @@
+"""测试公共夹具：以仓库根目录导入主程序，并提供在临时目录中运行审计的辅助函数"""
+
+import io
+import os
+import sys
+import copy
+import gzip
+import json
+import threading
+import contextlib
+import http.server
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from professional_code_auditor_v2 import Config, ProfessionalCodeAuditor  # noqa: E402
+
+
+def write_tree(root, files):
+    """按 {相对路径: 内容} 写入文件，内容为 bytes 时按二进制写入"""
+    for rel_path, content in files.items():
+        path = os.path.join(str(root), rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(content)
+    return root
+
+
+@pytest.fixture
+def settings():
+    """不读取 config.yaml 的默认配置；默认不启用超时看门狗"""
+    settings = copy.deepcopy(Config.ANALYSIS_DEFAULTS)
+    settings["timeout_seconds"] = 0
+    return settings
+
+
+@pytest.fixture
+def run_audit(settings):
+    """在目标目录上运行一次完整分析，返回审计器"""
+
+    def run(target, scan_mode="offline", **kwargs):
+        kwargs.setdefault("settings", settings)
+        auditor = ProfessionalCodeAuditor(**kwargs)
+        auditor.target_dir = str(target)
+        auditor.scan_mode = scan_mode
+        with contextlib.redirect_stdout(io.StringIO()):
+            auditor.run_analysis()
+        return auditor
+
+    return run
+
+
+def rendered(auditor):
+    """按文件路径排序的结果字典（去掉时间戳）"""
+    rows = [{key: value for key, value in row.items() if key != "timestamp"} for row in auditor.iter_results()]
+    return sorted(rows, key=lambda row: row["file"])
+
+
+class StandInService:
+    """本地替身在线服务：记录收到的请求，按 respond(请求体) 返回 (状态码, 响应JSON)"""
+
+    def __init__(self):
+        self.requests = []
+        self.connections = set()
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0.0
+        self.respond = self.echo
+        self._lock = threading.Lock()
+        service = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                payload = json.loads(body.decode("utf-8"))
+                with service._lock:
+                    service.requests.append({"headers": dict(self.headers), "payload": payload})
+                    service.connections.add(self.client_address)
+                    service.active += 1
+                    service.max_active = max(service.max_active, service.active)
+                try:
+                    threading.Event().wait(service.delay)
+                    status, response = service.respond(payload)
+                finally:
+                    with service._lock:
+                        service.active -= 1
+                data = json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/scan"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def result_for(item):
+        return {"issues": [f"在线: {item['file_type']}"], "warnings": []}
+
+    def echo(self, payload):
+        """单文件请求返回一条问题；批量请求按顺序逐个返回"""
+        if "batch" in payload:
+            return 200, {"results": [self.result_for(item) for item in payload["batch"]]}
+        return 200, self.result_for(payload)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in_service():
+    service = StandInService()
+    yield service
+    service.close()
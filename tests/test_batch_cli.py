@@ -0,0 +1,61 @@
+"""无交互批处理命令行：标准输出只包含 JSON 摘要，输出文件与退出码符合约定"""
+
+import os
+import sys
+import json
+import subprocess
+
+import professional_code_auditor_v2 as auditor_module
+from conftest import write_tree
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "professional_code_auditor_v2.py")
+
+
+def run_cli(*args, cwd):
+    return subprocess.run([sys.executable, SCRIPT, *args], cwd=cwd, capture_output=True, text=True, timeout=120)
+
+
+def test_batch_cli_prints_json_summary(tmp_path):
+    repo = write_tree(tmp_path / "repo", {"a.py": 'password = "hunter2"\n', "b.py": "x = 1\n"})
+    out_dir = tmp_path / "out"
+    proc = run_cli(str(repo), "--quiet", "--format", "jsonl", "--format", "html", "--output-dir", str(out_dir), cwd=tmp_path)
+
+    assert proc.returncode == 0, proc.stderr
+    summary = json.loads(proc.stdout)
+    assert summary["files"] == 2
+    assert summary["security_findings"] == 1
+    assert set(summary["timings"]) >= {"walk", "read", "analyze", "report", "total"}
+    assert os.path.isfile(summary["outputs"]["html"])
+    with open(summary["outputs"]["jsonl"], "r", encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+
+def test_batch_cli_writes_summary_file(tmp_path):
+    repo = write_tree(tmp_path / "repo", {"a.py": "x = 1\n"})
+    summary_path = tmp_path / "summary.json"
+    proc = run_cli(str(repo), "--format", "jsonl", "--output-dir", str(tmp_path), "--summary", str(summary_path), cwd=tmp_path)
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout == ""
+    assert json.loads(summary_path.read_text(encoding="utf-8"))["files"] == 1
+
+
+def test_batch_cli_rejects_missing_target(tmp_path):
+    proc = run_cli(str(tmp_path / "missing"), "--quiet", cwd=tmp_path)
+    assert proc.returncode == 2
+    assert proc.stdout == ""
+
+
+def test_batch_summary_is_valid_json_without_pyyaml(tmp_path, monkeypatch, capsys):
+    """未安装 pyyaml 时忽略配置文件的提示不能混入标准输出的JSON摘要"""
+    repo = write_tree(tmp_path / "repo", {"a.py": "x = 1\n"})
+    config = write_tree(tmp_path, {"config.yaml": "analysis:\n  timeout_seconds: 0\n"}) / "config.yaml"
+    monkeypatch.setattr(auditor_module, "yaml", None)
+    args = auditor_module.build_arg_parser().parse_args(
+        [str(repo), "--quiet", "--format", "jsonl", "--output-dir", str(tmp_path), "--config", str(config)]
+    )
+
+    assert auditor_module.run_batch(args) == 0
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["files"] == 1
+    assert "pyyaml" in captured.err
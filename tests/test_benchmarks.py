@@ -0,0 +1,62 @@
+"""基准测试工具：合成仓库生成结果确定，compare 按阈值标记回退"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+import bench_suite  # noqa: E402
+import synthetic_repo  # noqa: E402
+
+
+def tree_digest(root):
+    digest = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                digest[os.path.relpath(path, root)] = hashlib.sha256(f.read()).hexdigest()
+    return digest
+
+
+def test_generator_is_deterministic(tmp_path):
+    options = dict(files=120, median_kb=1.0, secret_density=0.05, binary_ratio=0.1, files_per_dir=10)
+    first = synthetic_repo.generate_repo(str(tmp_path / "a"), seed=7, **options)
+    second = synthetic_repo.generate_repo(str(tmp_path / "b"), seed=7, **options)
+    synthetic_repo.generate_repo(str(tmp_path / "c"), seed=8, **options)
+
+    assert first == second
+    assert tree_digest(tmp_path / "a") == tree_digest(tmp_path / "b")
+    assert tree_digest(tmp_path / "a") != tree_digest(tmp_path / "c")
+    assert first["files"] == len(tree_digest(tmp_path / "a")) == 120
+    assert first["binary"] + sum(first["by_type"].values()) == 120
+    assert first["bytes"] == sum(os.path.getsize(os.path.join(d, n)) for d, _, ns in os.walk(tmp_path / "a") for n in ns)
+
+
+def test_mix_selects_file_kinds(tmp_path):
+    manifest = synthetic_repo.generate_repo(
+        str(tmp_path / "repo"),
+        files=40,
+        mix=synthetic_repo.parse_mix("source=0,config=0,script=0,document=0,docker=0,.py=1"),
+        binary_ratio=0,
+    )
+    assert manifest["by_type"] == {"source": 40}
+    assert all(name.endswith(".py") for name in tree_digest(tmp_path / "repo"))
+
+
+def test_compare_flags_regressions(tmp_path, capsys):
+    def write(name, results):
+        path = tmp_path / name
+        path.write_text(json.dumps({"meta": {"repo": {"files": 10}}, "results": results}), encoding="utf-8")
+        return str(path)
+
+    baseline = write("baseline.json", {"walk": {"best_seconds": 1.0}, "report": {"best_seconds": 2.0}})
+    faster = write("faster.json", {"walk": {"best_seconds": 0.8}, "report": {"best_seconds": 2.1}})
+    slower = write("slower.json", {"walk": {"best_seconds": 1.5}, "report": {"best_seconds": 2.0}})
+
+    assert bench_suite.compare(argparse.Namespace(baseline=baseline, current=faster, threshold=0.10)) == 0
+    assert bench_suite.compare(argparse.Namespace(baseline=baseline, current=slower, threshold=0.10)) == 1
+    assert "walk" in capsys.readouterr().out.splitlines()[-1]
@@ -0,0 +1,74 @@
+"""基于文件头的二进制检测：魔数、NUL字节与非文本字符比例，改名及无扩展名的二进制文件按二进制处理"""
+
+import random
+import builtins
+
+import pytest
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import BinaryDetector
+
+
+def test_sample_classification():
+    rng = random.Random(1)
+    assert BinaryDetector.is_binary_sample(b"\x7fELF\x02\x01\x01" + b"\x00" * 32)
+    assert BinaryDetector.is_binary_sample(b"\x89PNG\r\n\x1a\n" + b"IHDR")
+    assert BinaryDetector.is_binary_sample(b"plain text\x00with a NUL")
+    assert BinaryDetector.is_binary_sample(bytes(rng.randrange(1, 256) for _ in range(4096)))
+
+    assert not BinaryDetector.is_binary_sample(b"")
+    assert not BinaryDetector.is_binary_sample("password = '密码'\n".encode("utf-8") * 100)
+    assert not BinaryDetector.is_binary_sample("x = 1\n".encode("utf-16"))
+    # 样本末尾截断的多字节字符不计为非法序列
+    assert not BinaryDetector.is_binary_sample("中文注释".encode("utf-8")[:-1])
+
+
+def sample_repo(root):
+    return write_tree(
+        root,
+        {
+            "tool": b"\x7fELF\x02\x01\x01" + b"\x00" * 512 + b'password = "hunter2"',
+            "blob.py": b"PK\x03\x04" + bytes(range(256)) * 4,
+            "real.py": 'password = "hunter2"\n',
+            "notes": "just some text\n",
+        },
+    )
+
+
+@pytest.mark.parametrize("walk_threads", [1, 4])
+def test_renamed_and_extensionless_binaries_are_not_analyzed(tmp_path, run_audit, walk_threads):
+    repo = sample_repo(tmp_path / "repo")
+    auditor = run_audit(repo, walk_threads=walk_threads)
+    kinds = {row["file"]: row["type"] for row in rendered(auditor)}
+
+    assert kinds == {"tool": "binary", "blob.py": "binary", "real.py": "source"}
+    assert auditor.file_stats["binary_files"] == 2
+    assert auditor.file_stats["skipped_files"] == 1
+    assert auditor.file_stats["security_issues"] == 1
+
+
+def test_unchanged_files_are_not_reopened_on_incremental_runs(tmp_path, run_audit, monkeypatch):
+    repo = sample_repo(tmp_path / "repo")
+    index_path = str(tmp_path / "index.json")
+    first = run_audit(repo, index_path=index_path)
+
+    opened = []
+    original = builtins.open
+
+    def recording_open(file, *args, **kwargs):
+        if str(file).startswith(str(repo)):
+            opened.append(str(file))
+        return original(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", recording_open)
+    second = run_audit(repo, index_path=index_path)
+    assert opened == []
+    assert rendered(second) == rendered(first)
+    assert second.file_stats == first.file_stats
+
+    # 内容变化（状态签名变化）的文件重新判定
+    write_tree(repo, {"notes": b"\x7fELF\x02\x01\x01" + b"\x00" * 64})
+    opened.clear()
+    third = run_audit(repo, index_path=index_path)
+    assert [path[len(str(repo)) + 1 :] for path in opened] == ["notes"]
+    assert {row["file"]: row["type"] for row in rendered(third)}["notes"] == "binary"
@@ -0,0 +1,42 @@
+"""内容哈希结果缓存：命中时结果与重新分析一致，内容变化时失效，超出容量时淘汰"""
+
+import sqlite3
+
+from conftest import rendered, write_tree
+
+
+def test_cache_hits_reproduce_results(tmp_path, run_audit):
+    repo = write_tree(
+        tmp_path / "repo",
+        {"a.py": 'password = "hunter2"\n', "b.js": "let x = 1;\n", "conf/c.yml": "token = 'abc'\n"},
+    )
+    cache_path = str(tmp_path / "cache.sqlite")
+    fresh = run_audit(repo)
+    first = run_audit(repo, cache_path=cache_path)
+    second = run_audit(repo, cache_path=cache_path)
+
+    assert first.cache_stats == {"hits": 0, "misses": 3}
+    assert second.cache_stats == {"hits": 3, "misses": 0}
+    assert rendered(first) == rendered(second) == rendered(fresh)
+    assert second.file_stats["security_issues"] == fresh.file_stats["security_issues"] == 2
+
+
+def test_cache_misses_after_content_change(tmp_path, run_audit):
+    repo = write_tree(tmp_path / "repo", {"a.py": "x = 1\n", "b.py": "y = 2\n"})
+    cache_path = str(tmp_path / "cache.sqlite")
+    run_audit(repo, cache_path=cache_path)
+    write_tree(repo, {"a.py": 'password = "changed"\n'})
+    auditor = run_audit(repo, cache_path=cache_path)
+
+    assert auditor.cache_stats == {"hits": 1, "misses": 1}
+    assert auditor.file_stats["security_issues"] == 1
+
+
+def test_cache_evicts_to_size_limit(tmp_path, run_audit):
+    repo = write_tree(tmp_path / "repo", {f"m{idx}.py": f"value = {idx}\n" for idx in range(40)})
+    cache_path = str(tmp_path / "small.sqlite")
+    run_audit(repo, cache_path=cache_path, cache_max_mb=0.002)
+
+    count, size = sqlite3.connect(cache_path).execute("SELECT COUNT(*), SUM(size) FROM results").fetchone()
+    assert 0 < count < 40
+    assert size <= 0.002 * 1024 * 1024
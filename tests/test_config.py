@@ -0,0 +1,27 @@
+"""配置加载：cloud_api.url 中的环境变量在加载时展开，未设置的变量视为未配置在线服务"""
+
+import pytest
+
+from professional_code_auditor_v2 import Config
+
+pytest.importorskip("yaml")
+
+
+def write_config(tmp_path, url):
+    path = tmp_path / "config.yaml"
+    path.write_text(f"analysis:\n  cloud_api:\n    url: {url}\n", encoding="utf-8")
+    return str(path)
+
+
+def test_api_url_is_expanded(tmp_path, monkeypatch):
+    monkeypatch.setenv("API_URL", "http://127.0.0.1:9/scan")
+    settings = Config.load_settings(write_config(tmp_path, "${API_URL}"))
+    assert settings["cloud_api"]["url"] == "http://127.0.0.1:9/scan"
+
+
+def test_unresolved_api_url_is_treated_as_unset(tmp_path, monkeypatch):
+    monkeypatch.delenv("API_URL", raising=False)
+    settings = Config.load_settings(write_config(tmp_path, "${API_URL}"))
+    assert settings["cloud_api"]["url"] == ""
+    # 默认配置同样引用 ${API_URL}
+    assert Config.load_settings()["cloud_api"]["url"] == ""
@@ -0,0 +1,78 @@
+"""内容相同文件去重：每组只分析一个代表文件，结果复制到其余路径；大文件不参与去重，内容哈希分块计算"""
+
+import os
+import hashlib
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import PrivacyProtector, ProfessionalCodeAuditor
+
+VENDORED = 'import os\npassword = "hunter2"\n\ndef f():\n    return os.sep\n'
+
+
+def without_file(rows):
+    return [{key: value for key, value in row.items() if key != "file"} for row in rows]
+
+
+def test_identical_copies_share_one_analysis(tmp_path, run_audit, monkeypatch):
+    repo = write_tree(
+        tmp_path / "repo",
+        {
+            "vendor_a/lib.py": VENDORED,
+            "vendor_b/lib.py": VENDORED,
+            "vendor_c/lib.py": VENDORED,
+            # 大小相同但内容不同
+            "other.py": VENDORED.replace("hunter2", "hunter3"),
+            # 内容相同但类型不同，分析结果可能不同，不合并
+            "copy.sh": VENDORED,
+        },
+    )
+    analyzed = []
+    original = ProfessionalCodeAuditor.analyze_file
+
+    def counting(self, file_info, content):
+        analyzed.append(file_info.path)
+        return original(self, file_info, content)
+
+    monkeypatch.setattr(ProfessionalCodeAuditor, "analyze_file", counting)
+    auditor = run_audit(repo)
+
+    assert auditor.file_stats["identical_files"] == 2
+    assert sorted(analyzed) == ["copy.sh", "other.py", "vendor_a/lib.py"]
+    rows = {row["file"]: row for row in rendered(auditor)}
+    copies = [rows[f"vendor_{name}/lib.py"] for name in "abc"]
+    assert without_file(copies[1:]) == without_file(copies[:1]) * 2
+    assert copies[0]["warnings"] == ["发现硬编码密码: 1处"]
+    # 复用的结果同样计入统计
+    assert auditor.file_stats["security_issues"] == 5
+
+
+def test_large_files_are_not_deduplicated(tmp_path, run_audit, settings, monkeypatch):
+    large = "value = 1\n" * 300
+    repo = write_tree(
+        tmp_path / "repo", {"a/big.py": large, "b/big.py": large, "a/small.py": "x = 1\n", "b/small.py": "x = 1\n"}
+    )
+    hashed = []
+    original = PrivacyProtector.create_file_hash
+
+    def recording(filepath, *args, **kwargs):
+        hashed.append(filepath)
+        return original(filepath, *args, **kwargs)
+
+    monkeypatch.setattr(PrivacyProtector, "create_file_hash", staticmethod(recording))
+    settings["max_file_size_kb"] = 1
+    auditor = run_audit(repo)
+
+    assert auditor.file_stats["identical_files"] == 1
+    assert auditor.file_stats["large_files"] == 2
+    assert sorted(os.path.relpath(path, repo) for path in hashed) == ["a/small.py", "b/small.py"]
+
+
+def test_chunked_hash_matches_full_digest(tmp_path):
+    data = bytes(range(256)) * 5000
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    expected = hashlib.sha256(data).hexdigest()[:16]
+    assert PrivacyProtector.create_file_hash(str(path)) == expected
+    assert PrivacyProtector.create_file_hash(str(path), chunk_size=7) == expected
+    missing = str(tmp_path / "missing")
+    assert PrivacyProtector.create_file_hash(missing) == hashlib.sha256(missing.encode()).hexdigest()[:16]
@@ -0,0 +1,56 @@
+"""安全发现以 (规则编号, 命中次数, 位置) 保存，文本只在输出时渲染，跨文件汇总为整数运算"""
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import Config
+
+PASSWORD = next(idx for idx, (_, description) in enumerate(Config.SECURITY_PATTERNS) if description == "硬编码密码")
+TOKEN = next(idx for idx, (pattern, _) in enumerate(Config.SECURITY_PATTERNS) if pattern.startswith("token"))
+
+
+def sample_repo(root):
+    return write_tree(
+        root,
+        {
+            "a.py": 'x = 1\npassword = "one"\npassword = "two"\n',
+            "b.py": "token = 'abc'\npassword = \"three\"\n",
+            "c.py": "y = 2\n",
+        },
+    )
+
+
+def test_findings_are_rule_codes_with_counts(tmp_path, run_audit):
+    auditor = run_audit(sample_repo(tmp_path / "repo"))
+    results = {result.file: result for result in auditor.results}
+
+    rule_id, count, positions = results["a.py"].findings[0]
+    assert (rule_id, count) == (PASSWORD, 2)
+    assert [(line, column) for line, column, _ in positions] == [(2, 1), (3, 1)]
+    assert all(isinstance(snippet, str) for _, _, snippet in positions)
+    assert sorted(rule for rule, _, _ in results["b.py"].findings) == sorted([PASSWORD, TOKEN])
+    assert results["c.py"].findings == ()
+    # 结果中不保存格式化后的警告文本与输出摘要
+    assert results["a.py"].warnings == () and not hasattr(results["a.py"], "output")
+
+
+def test_text_is_rendered_at_output(tmp_path, run_audit):
+    auditor = run_audit(sample_repo(tmp_path / "repo"))
+    rules = auditor.rule_engine.descriptions
+    result = next(result for result in auditor.results if result.file == "a.py")
+    assert result.warning_texts(rules) == ["发现硬编码密码: 2处"]
+    assert [(entry["rule"], entry["line"]) for entry in result.locations(rules)] == [("硬编码密码", 2), ("硬编码密码", 3)]
+
+    row = rendered(auditor)[0]
+    assert row["warnings"] == ["发现硬编码密码: 2处"]
+    assert row["output"].startswith("🔐 安全警告: 发现硬编码密码: 2处")
+
+
+def test_aggregation_counts_rules_per_file(tmp_path, run_audit):
+    auditor = run_audit(sample_repo(tmp_path / "repo"))
+    totals = {}
+    for result in auditor.results:
+        for rule_id, count, _ in result.findings:
+            totals[rule_id] = totals.get(rule_id, 0) + count
+    assert totals == {PASSWORD: 3, TOKEN: 1}
+    # 汇总中的安全警告数为各文件命中的规则数，文件统计中的安全问题数为命中总次数
+    assert auditor.summary.security_count == 3
+    assert auditor.file_stats["security_issues"] == sum(totals.values())
@@ -0,0 +1,34 @@
+"""流式 HTML 报告：每个结果一行，文件名经过转义，发现位置受条数上限约束"""
+
+import io
+import contextlib
+
+from conftest import write_tree
+
+
+def generate(auditor, output_dir):
+    auditor.output_dir = str(output_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = auditor.generate_html_report()
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_report_has_one_row_per_result(tmp_path, run_audit):
+    repo = write_tree(tmp_path / "repo", {f"m{idx}.py": f"value = {idx}\n" for idx in range(30)})
+    report = generate(run_audit(repo), tmp_path)
+    assert report.count("<tr class=") == 30
+    assert report.rstrip().endswith("</html>")
+
+
+def test_report_escapes_paths_and_limits_locations(tmp_path, run_audit):
+    many = "".join(f'password = "p{idx}"\n' for idx in range(25))
+    repo = write_tree(tmp_path / "repo", {"<b>evil</b>.py": many})
+    auditor = run_audit(repo)
+    report = generate(auditor, tmp_path)
+
+    assert "&lt;b&gt;evil&lt;/b&gt;.py" in report
+    assert "<b>evil</b>" not in report
+    limit = auditor.REPORT_MAX_LOCATIONS
+    assert report.count('<div class="location">L') == limit
+    assert f"…另有 {25 - limit} 处" in report
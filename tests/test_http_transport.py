@@ -0,0 +1,62 @@
+"""持久连接池 HTTP 传输层：连接复用、gzip 请求体、小文件合并为批量请求"""
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import AsyncOnlineScanner, HttpTransport
+
+
+def test_connections_are_reused(stand_in_service):
+    transport = HttpTransport()
+    try:
+        for idx in range(5):
+            response = transport.post_json(stand_in_service.url, {"file_type": "source", "content": str(idx)})
+            assert response == {"issues": ["在线: source"], "warnings": []}
+    finally:
+        transport.close()
+
+    assert transport.requests_sent == 5
+    assert transport.connections_opened == 1
+    assert len(stand_in_service.connections) == 1
+
+
+def test_large_bodies_are_gzipped(stand_in_service):
+    transport = HttpTransport(gzip_min_bytes=1024)
+    try:
+        transport.post_json(stand_in_service.url, {"file_type": "source", "content": "x"}, compress=True)
+        transport.post_json(stand_in_service.url, {"file_type": "source", "content": "x = 1\n" * 1000}, compress=True)
+    finally:
+        transport.close()
+
+    small, large = stand_in_service.requests
+    assert "Content-Encoding" not in small["headers"]
+    assert large["headers"]["Content-Encoding"] == "gzip"
+    assert int(large["headers"]["Content-Length"]) < 1024
+    assert large["payload"]["content"] == "x = 1\n" * 1000
+
+
+def test_small_files_are_batched(stand_in_service):
+    scanner = AsyncOnlineScanner("online", url=stand_in_service.url, batch_max_bytes=1024, batch_max_files=4)
+    try:
+        futures = [scanner.submit(f"value = {idx}\n", "source" if idx % 2 else "config") for idx in range(10)]
+        results = [future.result(10) for future in futures]
+    finally:
+        scanner.close()
+
+    assert results == [(["在线: source" if idx % 2 else "在线: config"], []) for idx in range(10)]
+    sizes = [len(request["payload"]["batch"]) for request in stand_in_service.requests]
+    assert sum(sizes) == 10
+    assert max(sizes) <= 4
+    assert len(sizes) < 10
+
+
+def test_batched_scan_matches_single_requests(tmp_path, run_audit, settings, stand_in_service):
+    repo = write_tree(tmp_path / "repo", {f"m{idx}.py": f"value = {idx}\n" for idx in range(12)})
+    settings["cloud_api"].update(url=stand_in_service.url, batch_max_kb=0)
+    single = rendered(run_audit(repo, scan_mode="online", settings=settings))
+    requests = len(stand_in_service.requests)
+
+    settings["cloud_api"].update(batch_max_kb=64, batch_max_files=64)
+    batched = rendered(run_audit(repo, scan_mode="online", settings=settings))
+
+    assert batched == single
+    assert requests == 12
+    assert len(stand_in_service.requests) - requests < 12
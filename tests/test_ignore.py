@@ -0,0 +1,82 @@
+"""忽略规则：.gitignore / .auditignore / 配置模式的分层匹配与剪枝，无法读取的目录不中断遍历"""
+
+import os
+
+import pytest
+
+import professional_code_auditor_v2 as auditor_module
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import DirectoryWalker, IgnoreMatcher
+
+
+def walked(root, threads=1, **kwargs):
+    walker = DirectoryWalker(str(root), threads=threads, **kwargs)
+    return sorted(entry.path.replace(os.sep, "/") for entry in walker), walker
+
+
+def test_nested_ignore_files_and_config_globs(tmp_path, run_audit, settings):
+    repo = write_tree(
+        tmp_path / "repo",
+        {
+            ".gitignore": "artifacts/\n*.log\n!keep.log\n",
+            "artifacts/gen.py": "x = 1\n",
+            "src/app.py": "x = 1\n",
+            "src/debug.log": "x\n",
+            "src/keep.log": "x\n",
+            "src/.auditignore": "generated/\n/local.py\n",
+            "src/generated/stub.py": "x = 1\n",
+            "src/local.py": "x = 1\n",
+            "src/pkg/local.py": "x = 1\n",
+            "third_party/lib.py": "x = 1\n",
+        },
+    )
+    settings["ignored_dirs"] = ["third_party"]
+    auditor = run_audit(repo, settings=settings)
+
+    assert [row["file"] for row in rendered(auditor)] == ["src/app.py", "src/pkg/local.py"]
+    paths, _ = walked(repo, ignore=IgnoreMatcher.from_globs(["third_party"]))
+    assert "src/keep.log" in paths and "src/debug.log" not in paths
+    # artifacts/、third_party/、debug.log、generated/、/local.py 各计一次
+    assert auditor.file_stats["ignored_entries"] == 5
+
+
+def test_ignore_files_can_be_disabled(tmp_path, run_audit, settings):
+    repo = write_tree(tmp_path / "repo", {".gitignore": "*.py\n", "a.py": "x = 1\n"})
+    settings["use_ignore_files"] = False
+    assert [row["file"] for row in rendered(run_audit(repo, settings=settings))] == ["a.py"]
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+@pytest.mark.parametrize("follow_symlinks", [False, True])
+def test_missing_root_yields_nothing(tmp_path, threads, follow_symlinks):
+    paths, walker = walked(tmp_path / "missing", threads, follow_symlinks=follow_symlinks, ignore=IgnoreMatcher())
+    assert paths == []
+    assert walker.ignored == 0
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+def test_unreadable_subdirectory_is_skipped(tmp_path, threads, monkeypatch):
+    root = write_tree(tmp_path / "repo", {"a.py": "x = 1\n", "locked/secret.py": "x = 1\n", "z/b.py": "x = 1\n"})
+    locked = str(root / "locked")
+    scandir = os.scandir
+
+    def guarded(path):
+        # 以 root 运行时 chmod 000 不生效，直接模拟权限错误
+        if str(path) == locked:
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(auditor_module.os, "scandir", guarded)
+    paths, _ = walked(root, threads, ignore=IgnoreMatcher.from_globs(["*.tmp"]))
+    assert paths == ["a.py", "z/b.py"]
+
+
+@pytest.mark.skipif(hasattr(os, "geteuid") and os.geteuid() == 0, reason="root 用户不受目录权限限制")
+def test_unreadable_subdirectory_chmod(tmp_path):
+    root = write_tree(tmp_path / "repo", {"a.py": "x = 1\n", "locked/secret.py": "x = 1\n"})
+    os.chmod(root / "locked", 0)
+    try:
+        paths, _ = walked(root)
+    finally:
+        os.chmod(root / "locked", 0o755)
+    assert paths == ["a.py"]
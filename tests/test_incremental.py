@@ -0,0 +1,44 @@
+"""增量扫描索引：未变更文件按状态签名复用，变更文件重新分析，删除文件被报告"""
+
+import os
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import ScanIndex
+
+
+def test_index_reuses_unchanged_files(tmp_path, run_audit):
+    repo = write_tree(
+        tmp_path / "repo",
+        {"a.py": 'password = "hunter2"\n', "b.py": "x = 1\n", "c.py": "y = 2\n"},
+    )
+    index_path = str(tmp_path / "index.json")
+    first = run_audit(repo, index_path=index_path)
+    second = run_audit(repo, index_path=index_path)
+
+    assert rendered(second) == rendered(first)
+    assert second.file_stats["security_issues"] == first.file_stats["security_issues"] == 1
+    assert second.deleted_files == []
+
+
+def test_index_detects_changed_and_deleted_files(tmp_path, run_audit):
+    repo = write_tree(tmp_path / "repo", {"a.py": "x = 1\n", "b.py": "y = 2\n", "c.py": "z = 3\n"})
+    index_path = str(tmp_path / "index.json")
+    run_audit(repo, index_path=index_path)
+
+    write_tree(repo, {"a.py": 'token = "abcdef"\n'})
+    os.remove(repo / "c.py")
+    auditor = run_audit(repo, index_path=index_path)
+
+    assert auditor.deleted_files == ["c.py"]
+    warnings = {row["file"]: row["warnings"] for row in rendered(auditor)}
+    assert warnings == {"a.py": ["发现令牌泄露: 1处"], "b.py": []}
+
+
+def test_index_invalidated_by_rule_version_and_scan_mode(tmp_path, run_audit):
+    repo = write_tree(tmp_path / "repo", {"a.py": "x = 1\n"})
+    index_path = str(tmp_path / "index.json")
+    auditor = run_audit(repo, index_path=index_path)
+
+    assert list(ScanIndex(index_path, auditor.analysis_version, "offline").previous) == ["a.py"]
+    assert ScanIndex(index_path, "other-version", "offline").previous == {}
+    assert ScanIndex(index_path, auditor.analysis_version, "online").previous == {}
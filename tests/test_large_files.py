@@ -0,0 +1,64 @@
+"""超过 max_file_size_kb 的文件：mmap 分窗口扫描与整体读取的命中一致，skip 策略只记录原因"""
+
+import professional_code_auditor_v2 as auditor_module
+from conftest import rendered, write_tree
+
+
+def large_content():
+    # 约 40KB，敏感信息分布在各窗口边界附近
+    lines = []
+    for idx in range(800):
+        lines.append(f'password = "hunter{idx}"' if idx % 37 == 0 else f"value_{idx} = compute({idx})")
+    return "\n".join(lines) + "\n"
+
+
+def test_mmap_scan_matches_in_memory_scan(tmp_path, run_audit, settings, monkeypatch):
+    repo = write_tree(tmp_path / "repo", {"big.py": large_content()})
+    in_memory = rendered(run_audit(repo))[0]
+
+    monkeypatch.setattr(auditor_module.Config, "MMAP_WINDOW_SIZE", 4096)
+    monkeypatch.setattr(auditor_module.Config, "MMAP_WINDOW_OVERLAP", 256)
+    settings["max_file_size_kb"] = 8
+    auditor = run_audit(repo, settings=settings)
+    windowed = rendered(auditor)[0]
+
+    assert auditor.file_stats["large_files"] == 1
+    assert windowed["warnings"] == in_memory["warnings"] == ["发现硬编码密码: 22处"]
+    assert windowed["locations"] == in_memory["locations"]
+
+
+def test_skip_strategy_records_reason(tmp_path, run_audit, settings):
+    repo = write_tree(tmp_path / "repo", {"big.py": large_content(), "small.py": "x = 1\n"})
+    settings["max_file_size_kb"] = 8
+    settings["large_file_strategy"] = "skip"
+    rows = {row["file"]: row for row in rendered(run_audit(repo, settings=settings))}
+
+    assert rows["big.py"]["status"] == "skipped"
+    assert rows["big.py"]["warnings"] == []
+    assert rows["big.py"]["issues"][0].startswith("文件过大已跳过分析")
+    assert rows["small.py"]["status"] == "pass"
+
+
+def test_files_gone_after_the_walk_record_a_read_error(tmp_path, run_audit, settings, monkeypatch):
+    repo = write_tree(
+        tmp_path / "repo",
+        {"gone_big.py": large_content(), "empty_big.py": large_content(), "gone.py": "x = 1\n", "kept.py": "y = 2\n"},
+    )
+    scan_directory = auditor_module.ProfessionalCodeAuditor.scan_directory
+
+    def scan_then_change(self, *args):
+        files = scan_directory(self, *args)
+        # 遍历与分析之间文件被删除或截断
+        (repo / "gone_big.py").unlink()
+        (repo / "gone.py").unlink()
+        (repo / "empty_big.py").write_bytes(b"")
+        return files
+
+    monkeypatch.setattr(auditor_module.ProfessionalCodeAuditor, "scan_directory", scan_then_change)
+    settings["max_file_size_kb"] = 8
+    rows = {row["file"]: row for row in rendered(run_audit(repo, settings=settings))}
+
+    for name in ("gone_big.py", "empty_big.py", "gone.py"):
+        assert rows[name]["issues"] == ["文件读取失败"], name
+        assert rows[name]["warnings"] == []
+    assert rows["kept.py"]["issues"] == [] and rows["kept.py"]["status"] == "pass"
@@ -0,0 +1,40 @@
+"""Prometheus 运行指标：文件、字节、规则命中及缓存查询按合并后的结果记录，复用的结果不计入分析字节数"""
+
+import pytest
+
+from conftest import write_tree
+
+pytest.importorskip("prometheus_client")
+
+from professional_code_auditor_v2 import AuditMetrics  # noqa: E402
+
+
+def sample(metrics, name, **labels):
+    return metrics.registry.get_sample_value(name, labels) or 0
+
+
+def test_counters_follow_results(tmp_path, run_audit):
+    files = {"a.py": 'password = "hunter2"\ntoken = "abcdef"\n', "b.py": "x = 1\n", "copy.py": "x = 1\n"}
+    repo = write_tree(tmp_path / "repo", files)
+    metrics = AuditMetrics()
+    run_audit(repo, metrics=metrics, workers=2)
+
+    assert sum(sample(metrics, "code_auditor_files_total", type="source", status=s) for s in ("pass", "warning", "fail")) == 3
+    # 内容相同的 copy.py 复用 b.py 的结果，不计入分析字节数
+    assert sample(metrics, "code_auditor_bytes_total") == len(files["a.py"]) + len(files["b.py"])
+    assert sample(metrics, "code_auditor_rule_matches_total", rule="硬编码密码") == 1
+    assert sample(metrics, "code_auditor_rule_matches_total", rule="令牌泄露") == 1
+    assert sample(metrics, "code_auditor_phase_seconds_count", phase="analyze") == 2
+
+
+def test_cache_hits_do_not_count_as_scanned_bytes(tmp_path, run_audit):
+    repo = write_tree(tmp_path / "repo", {"a.py": 'password = "hunter2"\n', "b.py": "y = 2\n"})
+    cache_path = str(tmp_path / "cache.sqlite")
+    run_audit(repo, cache_path=cache_path)
+
+    metrics = AuditMetrics()
+    run_audit(repo, cache_path=cache_path, metrics=metrics)
+    assert sample(metrics, "code_auditor_cache_lookups_total", result="hit") == 2
+    assert sample(metrics, "code_auditor_bytes_total") == 0
+    assert sample(metrics, "code_auditor_rule_matches_total", rule="硬编码密码") == 1
+    assert sum(sample(metrics, "code_auditor_files_total", type="source", status=s) for s in ("pass", "warning", "fail")) == 2
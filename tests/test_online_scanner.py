@@ -0,0 +1,43 @@
+"""并发在线扫描：请求并发受限、结果按文件顺序合并、发送内容经过清理"""
+
+from conftest import rendered, write_tree
+
+
+def online_settings(settings, url, concurrency=4):
+    settings["cloud_api"].update(url=url, concurrency=concurrency, batch_max_kb=0, retry_times=0, timeout_seconds=5)
+    return settings
+
+
+def test_online_results_are_merged_in_order(tmp_path, run_audit, settings, stand_in_service):
+    files = {f"m{idx:02d}.py": f"value = {idx}\n" for idx in range(16)}
+    files["secret.py"] = 'password = "hunter2"\n'
+    repo = write_tree(tmp_path / "repo", files)
+    stand_in_service.delay = 0.2
+
+    auditor = run_audit(repo, scan_mode="online", settings=online_settings(settings, stand_in_service.url))
+
+    rows = rendered(auditor)
+    assert [row["file"] for row in rows] == sorted(files)
+    assert all(row["issues"] == ["在线: source"] for row in rows)
+    assert rows[-1]["warnings"] == ["发现硬编码密码: 1处"]
+    # 每个请求阻塞 0.2 秒，同时进行的请求数应达到且不超过并发上限（不依赖运行耗时）
+    assert stand_in_service.max_active == 4
+    assert auditor.file_stats["online_fallbacks"] == 0
+
+    sent = [request["payload"] for request in stand_in_service.requests]
+    assert len(sent) == 17
+    assert all(payload["mode"] == "online" for payload in sent)
+    assert not any("hunter2" in payload["content"] for payload in sent)
+
+
+def test_request_timeout_falls_back_to_offline_result(tmp_path, run_audit, settings, stand_in_service):
+    repo = write_tree(tmp_path / "repo", {"a.py": 'password = "hunter2"\n'})
+    stand_in_service.delay = 1.0
+    settings = online_settings(settings, stand_in_service.url)
+    settings["cloud_api"]["timeout_seconds"] = 0.2
+    auditor = run_audit(repo, scan_mode="online", settings=settings)
+
+    row = rendered(auditor)[0]
+    assert row["issues"] == []
+    assert row["warnings"] == ["发现硬编码密码: 1处"]
+    assert auditor.file_stats["online_fallbacks"] == 1
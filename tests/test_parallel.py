@@ -0,0 +1,23 @@
+"""进程池并行分析：结果与统计与串行分析一致"""
+
+from conftest import rendered, write_tree
+
+
+def sample_tree(root, count=24):
+    files = {}
+    for idx in range(count):
+        body = f"def f{idx}():\n    return {idx}\n"
+        if idx % 5 == 0:
+            body += f'password = "hunter{idx}"\n'
+        files[f"pkg{idx % 3}/module_{idx}.py"] = body
+    files["config/app.yml"] = "api_key: 'x'\ntoken = 'abc'\n"
+    return write_tree(root, files)
+
+
+def test_parallel_matches_serial(tmp_path, run_audit):
+    sample_tree(tmp_path)
+    serial = run_audit(tmp_path, workers=1)
+    parallel = run_audit(tmp_path, workers=3)
+    assert rendered(parallel) == rendered(serial)
+    assert parallel.file_stats == serial.file_stats
+    assert serial.file_stats["security_issues"] == 6
@@ -0,0 +1,69 @@
+"""关键词预过滤：必需字面量缺失的规则不执行正则，启用与关闭预过滤的扫描结果一致"""
+
+import random
+
+from professional_code_auditor_v2 import Config, SecurityRuleEngine
+
+
+def unfiltered(engine):
+    """关闭预过滤的同规则引擎，作为参考"""
+    reference = SecurityRuleEngine(engine.patterns, engine.flags)
+    reference.prefilter = False
+    return reference
+
+
+def test_default_rules_use_prefilter():
+    engine = SecurityRuleEngine()
+    assert engine.prefilter
+    assert [head for head, _ in engine.anchors if not head] == []
+
+
+def test_required_literals():
+    assert SecurityRuleEngine._required_literals(r'password\s*=\s*[\'"][^\'"]+[\'"]') == ["password"]
+    assert SecurityRuleEngine._required_literals(r"aws_secret_key\s*=") == ["aws_secret_key"]
+    assert SecurityRuleEngine._required_literals(r"api[_-]?key\s*=") == ["api", "key"]
+    assert SecurityRuleEngine._required_literals(r"colou?r") == ["colo", "r"]
+    assert SecurityRuleEngine._required_literals(r"(?:db|sql)_password") == ["_password"]
+    assert SecurityRuleEngine._required_literals(r"foo|bar") == []
+
+
+def test_files_without_anchors_skip_regex_work():
+    engine = SecurityRuleEngine()
+    rule_times = [0.0] * len(engine.rules)
+    content = "def handler(request):\n    return render(request, value=1)\n" * 200
+    assert engine.scan(content, rule_times=rule_times) == []
+    assert rule_times == [0.0] * len(engine.rules)
+
+    engine.scan('x = 1\npassword = "hunter2"\n', rule_times=rule_times)
+    touched = [Config.SECURITY_PATTERNS[rule_id][1] for rule_id, seconds in enumerate(rule_times) if seconds]
+    assert touched and set(touched) <= {"硬编码密码"}
+
+
+def test_prefilter_matches_full_scan():
+    engine = SecurityRuleEngine()
+    reference = unfiltered(engine)
+    rng = random.Random(21)
+    fragments = [
+        'password = "hunter2"',
+        "PASSWD='x'",
+        "Token = 'abc'",
+        "api-key = 'k'",
+        "Bearer abcdefghijklmnopqrstuvwxyz",
+        'aws_secret_key = "AKIA"',
+        "private_key = 'p'",
+        "passwordless",
+        "tok",
+        "en = 'x'",
+        "K",
+        "İ",
+        "ünï",
+        "\n",
+        " ",
+    ]
+    for _ in range(500):
+        content = "".join(rng.choice(fragments) for _ in range(rng.randint(1, 10)))
+        assert engine.scan(content) == reference.scan(content)
+        if content.isascii():
+            data = content.encode("ascii")
+            assert engine.scan(data) == reference.scan(content)
+            assert engine.scan_buffer(data, window=16, overlap=64) == reference.scan(content)
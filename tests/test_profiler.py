@@ -0,0 +1,54 @@
+"""阶段性能剖析：各进程的区间写入分片并合并，导出 Chrome trace 及最慢文件/规则排行"""
+
+import io
+import json
+import contextlib
+
+from conftest import write_tree
+from professional_code_auditor_v2 import PhaseProfiler
+
+
+def sample_tree(root):
+    files = {f"m{idx}.py": f"value = {idx}\n" for idx in range(6)}
+    files["secret.py"] = 'password = "hunter2"\n' * 50
+    return write_tree(root, files)
+
+
+def profiled_run(tmp_path, run_audit, **kwargs):
+    trace_dir = tmp_path / "trace"
+    trace_dir.mkdir()
+    profiler = PhaseProfiler(str(trace_dir))
+    auditor = run_audit(sample_tree(tmp_path / "repo"), profiler=profiler, output_dir=str(tmp_path), **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        auditor.generate_html_report()
+    return profiler.collect()
+
+
+def test_spans_cover_phases_files_and_rules(tmp_path, run_audit):
+    events = profiled_run(tmp_path, run_audit)
+    names = {event["name"] for event in events}
+    assert {"walk", "read", "analyze", "file", "security_scan", "report"} <= names
+    assert sorted(event["args"]["path"] for event in events if event["name"] == "file") == sorted(
+        ["secret.py"] + [f"m{idx}.py" for idx in range(6)]
+    )
+    assert [event["ts"] for event in events] == sorted(event["ts"] for event in events)
+
+    tables = PhaseProfiler.top_tables(events, top=3)
+    assert len(tables["slowest_files"]) == 3
+    assert tables["slowest_files"][0]["ms"] >= tables["slowest_files"][-1]["ms"]
+    assert tables["slowest_rules"] and all(entry["files"] >= 1 for entry in tables["slowest_rules"])
+
+
+def test_worker_spans_are_merged_and_exported(tmp_path, run_audit):
+    events = profiled_run(tmp_path, run_audit, workers=2)
+    file_pids = {event["pid"] for event in events if event["name"] == "file"}
+    assert len({event["args"]["path"] for event in events if event["name"] == "file"}) == 7
+    assert len(file_pids) >= 1 and all(event["pid"] in file_pids for event in events if event["name"] == "analyze")
+
+    path = tmp_path / "trace.json"
+    PhaseProfiler.export_chrome_trace(events, str(path))
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    metadata = [event for event in trace["traceEvents"] if event["ph"] == "M"]
+    assert {event["pid"] for event in metadata} == {event["pid"] for event in events}
+    assert all(event["args"]["name"].startswith("worker-") for event in metadata if event["pid"] in file_pids)
+    assert len(trace["traceEvents"]) == len(events) + len(metadata)
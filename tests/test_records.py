@@ -0,0 +1,72 @@
+"""紧凑记录类型：FileRecord / AuditResult 使用 __slots__，类型编号共享，可序列化并兼容原字典访问"""
+
+import io
+import pickle
+import datetime
+import contextlib
+
+import pytest
+
+from conftest import write_tree
+from professional_code_auditor_v2 import AuditResult, FileRecord, ProfessionalCodeAuditor
+
+
+def scanned(tmp_path, settings):
+    repo = write_tree(tmp_path / "repo", {"src/app.py": "x = 1\n", "lib/util.py": "y = 2\n", "Dockerfile": "FROM x\n"})
+    auditor = ProfessionalCodeAuditor(settings=settings)
+    auditor.target_dir = str(repo)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return str(repo), sorted(auditor.scan_directory(), key=lambda record: record.path)
+
+
+def test_file_records_share_root_and_kinds(tmp_path, settings):
+    root, records = scanned(tmp_path, settings)
+    assert [record.path for record in records] == ["Dockerfile", "lib/util.py", "src/app.py"]
+    assert all(record.root is records[0].root for record in records)
+    assert records[1].kind == records[2].kind == FileRecord.CODES[".py"]
+    assert FileRecord.KINDS[records[1].kind] is FileRecord.KINDS[records[2].kind]
+
+    record = records[2]
+    assert not hasattr(record, "__dict__")
+    assert record.full_path == f"{root}/src/app.py"
+    assert (record.filename, record.extension, record.type) == ("app.py", ".py", "source")
+    assert record["type"] == "source" and record.get("size") == len("x = 1\n")
+    assert record.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_records_round_trip_through_pickle(tmp_path, settings):
+    _, records = scanned(tmp_path, settings)
+    for record in records:
+        copy = pickle.loads(pickle.dumps(record))
+        assert [copy[name] for name in FileRecord.__slots__] == [record[name] for name in FileRecord.__slots__]
+
+    result = AuditResult(
+        "src/app.py", FileRecord.CODES[".py"], "success", 90, ["问题"], ["警告"], [(0, 1, ((2, 3, "片段"),))], "offline", 1.5
+    )
+    copy = pickle.loads(pickle.dumps(result))
+    assert [copy[name] for name in AuditResult.__slots__] == [result[name] for name in AuditResult.__slots__]
+    assert copy.issues == ("问题",) and copy.findings == ((0, 1, ((2, 3, "片段"),)),)
+
+
+def test_result_timestamp_is_numeric_and_rendered_on_output(tmp_path, run_audit):
+    repo = write_tree(tmp_path / "repo", {"app.py": "x = 1\n"})
+    auditor = run_audit(repo)
+    result = auditor.results[0]
+    assert not hasattr(result, "__dict__")
+    assert isinstance(result.timestamp, float)
+    assert result.issues == () and result.findings == ()
+
+    row = result.to_dict(auditor.rule_engine.descriptions)
+    assert datetime.datetime.fromisoformat(row["timestamp"]).timestamp() == pytest.approx(result.timestamp, abs=1e-3)
+    assert {key: row[key] for key in ("file", "type", "analyzer", "mode", "binary_warning")} == {
+        "file": "app.py",
+        "type": "source",
+        "analyzer": result.analyzer,
+        "mode": "offline",
+        "binary_warning": False,
+    }
+    assert row["output"] == "✅ 检查通过，未发现问题"
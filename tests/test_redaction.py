@@ -0,0 +1,58 @@
+"""敏感信息清理：单次扫描的清理结果与逐条替换一致，分块流式清理与整体清理一致"""
+
+import random
+
+import pytest
+
+from professional_code_auditor_v2 import PrivacyProtector, RedactionEngine
+
+
+def chunked(text, size):
+    return [text[pos : pos + size] for pos in range(0, len(text), size)]
+
+
+def random_content(rng, lines=400):
+    pieces = [
+        'password = "{}"',
+        "api_key='{}'",
+        "token = '{}'",
+        'SECRET = "{}"',
+        "Authorization: Bearer {}",
+        "value = compute({})",
+        "# note {}",
+    ]
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789"
+    out = []
+    for _ in range(lines):
+        word = "".join(rng.choice(alphabet) for _ in range(rng.randrange(4, 40)))
+        out.append(rng.choice(pieces).format(word))
+    return "\n".join(out) + "\n"
+
+
+def test_long_region_does_not_truncate_overlapping_match():
+    # 长区域越过提交边界，与其重叠的较短匹配延伸到当前窗口之外
+    engine = RedactionEngine([(r"a{5,}", "<A>"), (r"ab{3}c", "<B>")], overlap=8)
+    content = "x" * 10 + "a" * 30 + "bbbc" + "y" * 10
+    expected = engine.redact(content)
+    assert expected == "x" * 10 + "<A>" + "y" * 10
+
+    for size in range(1, 40):
+        assert "".join(engine.redact_stream(chunked(content, size))) == expected, size
+
+
+@pytest.mark.parametrize("overlap", [64, 256])
+@pytest.mark.parametrize("size", [1, 7, 50, 333, 4096])
+def test_stream_matches_redact(overlap, size):
+    engine = RedactionEngine(PrivacyProtector.REDACTION_RULES, overlap=overlap)
+    content = random_content(random.Random(size * overlap))
+    assert "".join(engine.redact_stream(chunked(content, size))) == engine.redact(content)
+
+
+def test_sanitize_file_matches_sanitize_content(tmp_path):
+    content = random_content(random.Random(7), lines=3000)
+    path = tmp_path / "sample.py"
+    path.write_text(content, encoding="utf-8")
+
+    streamed = "".join(PrivacyProtector.sanitize_file(str(path), chunk_size=1000))
+    assert streamed == PrivacyProtector.sanitize_content(content)
+    assert 'password = "***REDACTED***"' in streamed
@@ -0,0 +1,22 @@
+"""JSONL 结果流：结果不再保留在内存中，读回的结果与汇总统计与内存模式一致"""
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import JsonlResultSink
+
+
+def test_jsonl_sink_matches_in_memory_results(tmp_path, run_audit):
+    repo = write_tree(
+        tmp_path / "repo",
+        {"a.py": 'password = "hunter2"\n', "b.sh": "echo hi\n", "data.json": b"\x00\x01\x02binary\x00" * 64},
+    )
+    results_path = str(tmp_path / "out" / "results.jsonl")
+    in_memory = run_audit(repo)
+    streamed = run_audit(repo, results_path=results_path)
+
+    assert streamed.results == []
+    assert rendered(streamed) == rendered(in_memory)
+    assert len(list(JsonlResultSink.read(results_path))) == 3
+    for attr in ("total", "score_sum", "security_count", "quality_count", "binary_count"):
+        assert getattr(streamed.summary, attr) == getattr(in_memory.summary, attr)
+    assert streamed.summary.binary_count == 1
+    assert streamed.summary.security_count == 1
@@ -0,0 +1,88 @@
+"""在线请求重试与熔断：可重试错误退避重试，重试耗尽计为端点失败，熔断期间直接回退为离线结果"""
+
+import urllib.error
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import AsyncOnlineScanner, CircuitBreaker, OnlineServiceClient, RetryPolicy
+
+
+def flaky(service, failures, status=503):
+    """前 failures 个请求返回错误状态，之后正常响应"""
+    calls = []
+
+    def respond(payload):
+        calls.append(payload)
+        if len(calls) <= failures:
+            return status, {"error": "unavailable"}
+        return service.echo(payload)
+
+    service.respond = respond
+    return calls
+
+
+def test_retry_policy():
+    policy = RetryPolicy(3, base_delay=0.1, max_delay=0.3)
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(0.3, 0.1 * 2**attempt)
+    assert RetryPolicy(-1).retry_times == 0
+
+    def http_error(code):
+        return urllib.error.HTTPError("http://x", code, "", {}, None)
+
+    assert RetryPolicy.is_retryable(http_error(503))
+    assert RetryPolicy.is_retryable(http_error(429))
+    assert not RetryPolicy.is_retryable(http_error(404))
+    assert RetryPolicy.is_retryable(ConnectionRefusedError())
+    assert not RetryPolicy.is_retryable(ValueError("bad response"))
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    breaker.opened_at -= 1
+    # 半开状态只放行一个探测请求
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.opened_at -= 1
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_transient_errors_are_retried(stand_in_service):
+    calls = flaky(stand_in_service, 2)
+    scanner = AsyncOnlineScanner("online", url=stand_in_service.url, retry_times=2)
+    scanner.retry = RetryPolicy(2, base_delay=0.01)
+    try:
+        assert scanner.submit("x = 1\n", "source").result(10) == (["在线: source"], [])
+    finally:
+        scanner.close()
+    assert len(calls) == 3
+    assert scanner.breaker.failures == 0
+
+
+def test_client_errors_are_not_retried(stand_in_service):
+    calls = flaky(stand_in_service, 10, status=400)
+    assert OnlineServiceClient.send_http_request(stand_in_service.url, {"content": "x"}, retry_times=3) is None
+    assert len(calls) == 1
+
+
+def test_open_circuit_falls_back_to_offline_rules(tmp_path, run_audit, settings, stand_in_service):
+    calls = flaky(stand_in_service, 1000, status=500)
+    repo = write_tree(tmp_path / "repo", {f"m{idx}.py": f'password = "p{idx}"\n' for idx in range(8)})
+    settings["cloud_api"].update(url=stand_in_service.url, batch_max_kb=0, retry_times=0, concurrency=1)
+    auditor = run_audit(repo, scan_mode="online", settings=settings)
+
+    rows = rendered(auditor)
+    assert all(row["issues"] == [] and row["warnings"] == ["发现硬编码密码: 1处"] for row in rows)
+    assert auditor.file_stats["online_fallbacks"] == 8
+    # 连续失败达到阈值后熔断，其余文件不再发出请求
+    assert len(calls) == CircuitBreaker.FAILURE_THRESHOLD
+    assert CircuitBreaker.for_endpoint(stand_in_service.url).state == "open"
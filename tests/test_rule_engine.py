@@ -0,0 +1,64 @@
+"""SecurityRuleEngine：单次扫描结果与逐条 re.finditer 一致"""
+
+import re
+import random
+
+from professional_code_auditor_v2 import Config, SecurityRuleEngine
+
+SAMPLES = [
+    'password = "hunter2"',
+    "API_KEY='abc123'",
+    'secret_key = "s3cr3t"',
+    'aws_secret_key = "AKIAEXAMPLE"',
+    "headers = {'Authorization': 'Bearer abc.def'}",
+    'passwd="x" token = "t" access_token = "a"',
+    'private_key = "-----BEGIN"',
+    'mongodb_password = "m" redis-password = "r" sql_password = "s"',
+    "def handler(request):\n    return render(request)",
+    "PASSWORD = 'ünïcödé' # K",
+]
+
+
+def expected_hits(content, patterns=Config.SECURITY_PATTERNS):
+    """逐条规则执行 re.finditer 的参考结果"""
+    hits = []
+    for rule_id, (pattern, _) in enumerate(patterns):
+        spans = [match.span() for match in re.finditer(pattern, content, re.IGNORECASE)]
+        if spans:
+            hits.append((rule_id, spans))
+    return hits
+
+
+def test_scan_matches_per_rule_finditer():
+    engine = SecurityRuleEngine()
+    for content in SAMPLES + ["\n".join(SAMPLES)]:
+        assert engine.scan(content) == expected_hits(content)
+
+
+def test_scan_bytes_matches_str():
+    engine = SecurityRuleEngine()
+    content = "\n".join(SAMPLES[:-1])
+    assert engine.scan(content.encode("ascii")) == engine.scan(content)
+
+
+def test_scan_random_mixtures():
+    rng = random.Random(7)
+    engine = SecurityRuleEngine()
+    fragments = SAMPLES + ["x = 1", "  ", "\n", "password", "= '", "Token", "İ", "key ="]
+    for _ in range(300):
+        content = "".join(rng.choice(fragments) for _ in range(rng.randint(1, 12)))
+        assert engine.scan(content) == expected_hits(content)
+
+
+def test_scan_buffer_finds_matches_across_windows():
+    engine = SecurityRuleEngine()
+    content = ("x" * 90 + 'password = "hunter2"\n') * 50
+    data = content.encode("ascii")
+    assert engine.scan_buffer(data, window=64, overlap=32) == expected_hits(content)
+
+
+def test_custom_patterns_without_literal_head():
+    patterns = [(r"[a-z]+_secret\s*=\s*\d+", "数字密钥"), (r"token\s*=\s*'[^']+'", "令牌")]
+    engine = SecurityRuleEngine(patterns)
+    content = "app_secret = 42\ntoken = 'abc' other_secret=7"
+    assert engine.scan(content) == expected_hits(content, patterns)
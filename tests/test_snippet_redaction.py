@@ -0,0 +1,106 @@
+"""安全发现的代码片段：每条安全规则命中的敏感值都被遮盖，结果文件与 HTML 报告中不出现原文"""
+
+import io
+import contextlib
+
+import pytest
+
+import professional_code_auditor_v2 as auditor_module
+from conftest import write_tree
+from professional_code_auditor_v2 import Config, LineIndex, SecurityRuleEngine
+
+# 与 Config.SECURITY_PATTERNS 一一对应的样本，{} 替换为唯一的原文值
+RULE_SAMPLES = [
+    'password = "{}"',
+    "passwd='{}'",
+    'API_KEY = "{}"',
+    'SECRET_KEY = "{}"',
+    "token = '{}'",
+    'access_token = "{}"',
+    'secret = "{}"',
+    "private_key = '{}'",
+    'database_password = "{}"',
+    'aws_secret_key = "{}"',
+    'Authorization: "Bearer {}"',
+    'sql_password = "{}"',
+    'redis-password = "{}"',
+    'mongodb_password = "{}"',
+]
+
+
+def raw_value(rule_id):
+    return f"Rv{rule_id:02d}q7Zx"
+
+
+def outputs(tmp_path, run_audit, repo, settings=None):
+    """运行审计并返回 (JSONL 结果文本, HTML 报告文本)"""
+    results_path = tmp_path / "out" / "results.jsonl"
+    kwargs = {"settings": settings} if settings is not None else {}
+    auditor = run_audit(repo, results_path=str(results_path), output_dir=str(tmp_path / "out"), **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = auditor.generate_html_report()
+    with open(report, "r", encoding="utf-8") as f:
+        html = f.read()
+    return results_path.read_text(encoding="utf-8"), html, auditor
+
+
+def test_samples_cover_every_security_rule():
+    engine = SecurityRuleEngine()
+    assert len(RULE_SAMPLES) == len(Config.SECURITY_PATTERNS)
+    for rule_id, sample in enumerate(RULE_SAMPLES):
+        assert rule_id in dict(engine.scan(sample.format(raw_value(rule_id)))), sample
+
+
+@pytest.mark.parametrize("rule_id", range(len(RULE_SAMPLES)))
+def test_each_rule_hit_is_masked(tmp_path, run_audit, rule_id):
+    value = raw_value(rule_id)
+    repo = write_tree(tmp_path / "repo", {"app.py": f"x = 1\n{RULE_SAMPLES[rule_id].format(value)}\n"})
+    jsonl, html, auditor = outputs(tmp_path, run_audit, repo)
+
+    assert auditor.file_stats["security_issues"] >= 1
+    assert value not in jsonl
+    assert value not in html
+    assert "***REDACTED***" in jsonl
+
+
+def test_long_lines_and_large_files_are_masked(tmp_path, run_audit, settings, monkeypatch):
+    values = [raw_value(rule_id) for rule_id in range(len(RULE_SAMPLES))]
+    # 压缩代码：所有命中在同一行；另有一个长于片段窗口的值
+    minified = ";".join(sample.format(value) for sample, value in zip(RULE_SAMPLES, values))
+    long_value = "L0ngS3cret" * 30
+    content = f"{minified}\npassword = '{long_value}'\n" + "filler = 1\n" * 200
+    repo = write_tree(tmp_path / "repo", {"min.py": content})
+
+    jsonl, html, _ = outputs(tmp_path, run_audit, repo)
+    for text in (jsonl, html):
+        assert not any(value in text for value in values)
+        assert "L0ngS3cret" not in text
+
+    # 超过大小限制的文件通过 mmap 分窗口扫描，片段同样遮盖
+    monkeypatch.setattr(auditor_module.Config, "MMAP_WINDOW_SIZE", 1024)
+    monkeypatch.setattr(auditor_module.Config, "MMAP_WINDOW_OVERLAP", 512)
+    settings["max_file_size_kb"] = 1
+    jsonl, html, auditor = outputs(tmp_path, run_audit, repo, settings)
+    assert auditor.file_stats["large_files"] == 1
+    for text in (jsonl, html):
+        assert not any(value in text for value in values)
+        assert "L0ngS3cret" not in text
+
+
+def test_line_index_matches_naive_positions(monkeypatch):
+    bisect_right = auditor_module.bisect.bisect_right
+
+    def bisect_without_key(a, x, lo=0, hi=None, **kwargs):
+        # Python 3.10 之前的 bisect 不支持 key 参数
+        assert not kwargs
+        return bisect_right(a, x, lo, len(a) if hi is None else hi)
+
+    monkeypatch.setattr(auditor_module.bisect, "bisect_right", bisect_without_key)
+    content = "first\n\nthird line\n    fourth = 4\nlast"
+    for data in (content, content.encode("ascii")):
+        index = LineIndex(data)
+        newline = "\n" if isinstance(data, str) else b"\n"
+        for offset in range(len(data)):
+            line = data.count(newline, 0, offset) + 1
+            column = offset - data.rfind(newline, 0, offset)
+            assert index.locate(offset)[:2] == (line, column), offset
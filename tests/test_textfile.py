@@ -0,0 +1,104 @@
+"""node_exporter textfile 输出：批处理结束时原子写入汇总指标"""
+
+import os
+import re
+
+import professional_code_auditor_v2 as auditor_module
+from conftest import write_tree
+
+SAMPLE = re.compile(r"^(code_auditor_\w+)\{([^}]*)\} (\S+)$")
+
+
+def parse(path):
+    """返回 {(指标名, 排序后的标签): 值}，并检查每个指标都带 HELP / TYPE 注释"""
+    samples = {}
+    declared = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f.read().splitlines():
+            if line.startswith("# TYPE "):
+                name, kind = line.split()[2:4]
+                assert kind == "gauge"
+                declared.add(name)
+            elif not line.startswith("# HELP "):
+                name, labels, value = SAMPLE.match(line).groups()
+                assert name in declared
+                samples[(name, tuple(sorted(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', labels))))] = float(value)
+    return samples
+
+
+def run_batch(tmp_path, repo, textfile, *extra):
+    args = auditor_module.build_arg_parser().parse_args(
+        [
+            str(repo),
+            "--quiet",
+            "--format",
+            "jsonl",
+            "--output-dir",
+            str(tmp_path),
+            "--textfile",
+            str(textfile),
+            "--summary",
+            str(tmp_path / "summary.json"),
+            *extra,
+        ]
+    )
+    assert auditor_module.run_batch(args) == 0
+
+
+def test_batch_run_writes_textfile(tmp_path):
+    repo = write_tree(tmp_path / "repo", {"a.py": 'password = "hunter2"\n', "b.py": "x = 1\n"})
+    textfile = tmp_path / "textfile" / "code_auditor.prom"
+    run_batch(tmp_path, repo, textfile)
+
+    assert os.listdir(textfile.parent) == ["code_auditor.prom"]
+    samples = parse(textfile)
+    base = (("mode", "offline"), ("target", str(repo)))
+    assert samples[("code_auditor_last_run_files", base)] == 2
+    assert samples[("code_auditor_last_run_bytes", base)] == len('password = "hunter2"\n') + len("x = 1\n")
+    assert samples[("code_auditor_last_run_duration_seconds", base)] > 0
+    assert samples[("code_auditor_last_run_files_per_second", base)] > 0
+    findings = tuple(sorted(base + (("kind", "security"),)))
+    assert samples[("code_auditor_last_run_findings", findings)] == 1
+    phases = {dict(labels)["phase"] for name, labels in samples if name == "code_auditor_last_run_phase_seconds"}
+    assert phases == {"walk", "read", "analyze", "report"}
+
+
+def test_bytes_count_only_analyzed_files(tmp_path):
+    repo = write_tree(tmp_path / "repo", {"a.py": "x = 1\n", "b.py": "y = 22\n", "c/a.py": "x = 1\n"})
+    textfile = tmp_path / "code_auditor.prom"
+    index = str(tmp_path / "index.json")
+    base = (("mode", "offline"), ("target", str(repo)))
+
+    # 内容相同的 c/a.py 复用 a.py 的结果
+    run_batch(tmp_path, repo, textfile, "--index", index)
+    samples = parse(textfile)
+    assert samples[("code_auditor_last_run_files", base)] == 3
+    assert samples[("code_auditor_last_run_bytes", base)] == len("x = 1\n") + len("y = 22\n")
+
+    # 增量运行：只有变更的文件计入字节数
+    write_tree(repo, {"b.py": "y = 333\n"})
+    run_batch(tmp_path, repo, textfile, "--index", index)
+    samples = parse(textfile)
+    assert samples[("code_auditor_last_run_files", base)] == 3
+    assert samples[("code_auditor_last_run_bytes", base)] == len("y = 333\n")
+
+
+def test_label_values_are_escaped(tmp_path):
+    path = tmp_path / "out.prom"
+    summary = {
+        "target": 'C:\\repo "x"\nnext',
+        "mode": "offline",
+        "files": 0,
+        "bytes": 0,
+        "timings": {"total": 0.0},
+        "peak_rss_bytes": {},
+        "cache": {},
+        "security_findings": 0,
+        "quality_findings": 0,
+    }
+    auditor_module.AuditMetrics.write_textfile(str(path), summary)
+
+    samples = parse(path)
+    target = dict(next(labels for name, labels in samples if name == "code_auditor_last_run_files"))["target"]
+    assert target == 'C:\\\\repo \\"x\\"\\nnext'
+    assert samples[("code_auditor_last_run_files_per_second", (("mode", "offline"), ("target", target)))] == 0
@@ -0,0 +1,97 @@
+"""基于 os.scandir 的目录遍历：顺序与 os.walk 一致且与线程数无关，硬链接、符号链接文件与符号链接循环去重"""
+
+import os
+
+import pytest
+
+from conftest import rendered, write_tree
+from professional_code_auditor_v2 import DirectoryWalker
+
+
+def walk_paths(root, skip_dirs=frozenset()):
+    """os.walk(topdown=True) 的文件顺序（目录内按 scandir 顺序）"""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in skip_dirs]
+        rel = os.path.relpath(dirpath, root)
+        paths.extend(os.path.normpath(os.path.join(rel, name)) for name in filenames)
+    return paths
+
+
+def sample_tree(root):
+    files = {}
+    for a in range(4):
+        for b in range(3):
+            for c in range(5):
+                files[f"d{a}/s{b}/f{c}.py"] = f"x = {a}{b}{c}\n"
+        files[f"d{a}/top.txt"] = "t\n"
+    files["node_modules/pkg/index.js"] = "x\n"
+    files["README.md"] = "# readme\n"
+    return write_tree(root, files)
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_order_matches_os_walk(tmp_path, threads):
+    root = sample_tree(tmp_path / "repo")
+    entries = list(DirectoryWalker(str(root), {"node_modules"}, threads=threads))
+
+    assert [entry.path for entry in entries] == walk_paths(root, {"node_modules"})
+    entry = next(entry for entry in entries if entry.name == "README.md")
+    st = os.stat(root / "README.md")
+    assert (entry.ext, entry.size, entry.mtime_ns, entry.inode) == (".md", st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def test_hardlinks_and_symlink_loops_are_deduplicated(tmp_path):
+    root = write_tree(tmp_path / "repo", {"a/original.py": "x = 1\n", "b/other.py": "y = 2\n"})
+    os.link(root / "a" / "original.py", root / "b" / "hardlink.py")
+    os.symlink(root, root / "a" / "loop")
+
+    walker = DirectoryWalker(str(root), follow_symlinks=True, threads=2)
+    paths = sorted(entry.path for entry in walker)
+
+    # 硬链接的两个路径只保留遍历时先遇到的一个，符号链接循环不重复进入
+    assert len(paths) == 2
+    assert os.path.join("b", "other.py") in paths
+    assert {os.path.join("a", "original.py"), os.path.join("b", "hardlink.py")} & set(paths)
+    assert walker.duplicates == 1
+
+
+def test_split_ext():
+    assert DirectoryWalker.split_ext("Main.PY") == ".py"
+    assert DirectoryWalker.split_ext(".env") == ""
+    assert DirectoryWalker.split_ext("..hidden") == ""
+    assert DirectoryWalker.split_ext("archive.tar.gz") == ".gz"
+    assert DirectoryWalker.split_ext("Dockerfile") == ""
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+def test_symlink_to_single_link_file_is_walked_once(tmp_path, threads):
+    root = write_tree(
+        tmp_path / "repo",
+        {"src/d.py": "x = 1\n", "src/build_out/gen.py": "y = 2\n", "other.py": "z = 3\n"},
+    )
+    outside = write_tree(tmp_path / "outside", {"ext.py": "w = 4\n"})
+    os.symlink(root / "src" / "d.py", root / "e.py")
+    os.symlink(root / "src" / "d.py", root / "src" / "z_alias.py")
+    os.symlink(root / "src" / "build_out" / "gen.py", root / "gen_link.py")
+    os.symlink(outside / "ext.py", root / "ext_link.py")
+    os.symlink(outside / "ext.py", root / "ext_link2.py")
+
+    walker = DirectoryWalker(str(root), skip_dirs={"build_out"}, threads=threads)
+    paths = sorted(entry.path for entry in walker)
+
+    # 仓库内目标只保留真实路径；目标被跳过时保留链接；仓库外的同一目标只保留一个链接
+    external = [path for path in paths if path.startswith("ext_link")]
+    assert len(external) == 1
+    assert [path for path in paths if path not in external] == ["gen_link.py", "other.py", os.path.join("src", "d.py")]
+    assert walker.duplicates == 3
+
+
+def test_symlinked_files_are_analyzed_once(tmp_path, run_audit, settings):
+    root = write_tree(tmp_path / "repo", {"d.py": 'password = "hunter2"\n'})
+    os.symlink(root / "d.py", root / "e.py")
+    for follow in (False, True):
+        settings["follow_symlinks"] = follow
+        auditor = run_audit(root, settings=settings)
+        assert [row["file"] for row in rendered(auditor)] in (["d.py"], ["e.py"])
+        assert auditor.file_stats["duplicate_files"] == 1
@@ -0,0 +1,75 @@
+"""单文件时间预算：超时文件被放弃并记录，同批其余文件重新排队分析；单进程同样强制执行，可通过 strict_timeout 关闭"""
+
+import os
+import time
+
+import pytest
+
+import professional_code_auditor_v2 as auditor_module
+from conftest import rendered, write_tree
+
+
+@pytest.fixture
+def slow_file(monkeypatch):
+    """文件名含 slow 的文件分析时阻塞（子进程 fork 时继承该替换）"""
+    original = auditor_module.ProfessionalCodeAuditor._process_file_with_stats
+
+    def process(self, file_info):
+        if "slow" in file_info["path"]:
+            time.sleep(60)
+        return original(self, file_info)
+
+    monkeypatch.setattr(auditor_module.ProfessionalCodeAuditor, "_process_file_with_stats", process)
+
+
+def sample_tree(root):
+    files = {f"m{idx:02d}.py": f'password = "p{idx}"\n' if idx % 4 == 0 else f"x = {idx}\n" for idx in range(40)}
+    files["m05_slow.py"] = "y = 1\n"
+    return write_tree(root, files)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_timed_out_file_does_not_block_others(tmp_path, run_audit, settings, slow_file, workers):
+    repo = sample_tree(tmp_path / "repo")
+    settings["timeout_seconds"] = 0.5
+    start = time.monotonic()
+    auditor = run_audit(repo, settings=settings, workers=workers)
+    assert time.monotonic() - start < 30
+
+    rows = rendered(auditor)
+    timed_out = [row["file"] for row in rows if row["status"] == "timeout"]
+    assert timed_out == ["m05_slow.py"]
+    assert auditor.file_stats["timed_out_files"] == 1
+    assert len(rows) == 41
+
+    os.remove(repo / "m05_slow.py")
+    expected = rendered(run_audit(repo, workers=1))
+    assert [row for row in rows if row["file"] != "m05_slow.py"] == expected
+
+
+def test_watchdog_matches_serial(tmp_path, run_audit, settings):
+    repo = sample_tree(tmp_path / "repo")
+    serial = run_audit(repo, workers=1)
+    settings["timeout_seconds"] = 30
+    watched = run_audit(repo, settings=settings, workers=3)
+    assert rendered(watched) == rendered(serial)
+    assert watched.file_stats == serial.file_stats
+
+
+def test_single_worker_runs_in_process_only_when_opted_out(tmp_path, run_audit, settings, monkeypatch):
+    repo = sample_tree(tmp_path / "repo")
+    used = []
+    original = auditor_module.ProfessionalCodeAuditor._iter_watchdog_results
+
+    def watchdog(self, files):
+        used.append(len(files))
+        return original(self, files)
+
+    monkeypatch.setattr(auditor_module.ProfessionalCodeAuditor, "_iter_watchdog_results", watchdog)
+    settings["timeout_seconds"] = 30
+    run_audit(repo, settings=settings, workers=1)
+    assert used == [41]
+
+    settings["strict_timeout"] = False
+    run_audit(repo, settings=settings, workers=1)
+    assert used == [41]